@@ -7,20 +7,16 @@ import logging
 import re
 import yt_dlp
 import asyncio
-import os
-import sys
-import json
-import traceback
-import tempfile
-import logging
-import re
-import yt_dlp
-import asyncio
 import time
 import base64
-from typing import Optional, List, Dict, Any, Union
+import hashlib
+import threading
+import contextvars
+from typing import Optional, List, Dict, Any, Tuple, Union
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from fastapi import FastAPI, File, Form, UploadFile, Request, Response, HTTPException, Query, Depends, Body
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydub import AudioSegment
 from io import StringIO, BytesIO
@@ -36,14 +32,34 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import (
     download_audio,
+    fetch_video_metadata,
+    expand_playlist,
     audio_to_text,
-    summarize_text,
-    translate_text,
+    canonicalize_audio,
+    cleanup_temp_files,
+    AUDIO_EXT,
+    AUDIO_CONTENT_TYPE,
+    stream_audio_to_text,
+    STREAMING_ENABLED,
+    summarize_with_plan,
+    translate_text_multi,
     sentiment_pipeline,
     language_code_map,
-    supabase,
-    bucket_name
+    summarizer_config,
+    get_asr_backend,
+    ASR_BACKEND_NAME,
+    CHUNKING_MODE,
+    translation_memory,
+    model_registry,
+    sentiment_batcher,
+    translation_batcher,
+    summarizer_batchers,
+    storage_uploader
 )
+from cache import artifact_cache, metadata_cache, hash_file, hash_text, hash_config
+from jobs import Job, JobError, job_manager, JOB_COMPLETED, JOB_FAILED, TERMINAL_STATUSES
+from metrics import Gauge, metrics_registry, stage_duration
+from log_store import LOG_CAPACITY, format_entry, log_store
 
 # Set up logging
 logging.basicConfig(
@@ -67,32 +83,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Set up logging with a custom handler that stores recent logs
-class MemoryLogHandler(logging.Handler):
-    def __init__(self, capacity=200):  # Increased capacity
-        super().__init__()
-        self.capacity = capacity
-        self.logs = []
-        self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    
-    def emit(self, record):
-        log_entry = self.formatter.format(record)
-        self.logs.append(log_entry)
-        # Keep only the most recent logs
-        if len(self.logs) > self.capacity:
-            self.logs.pop(0)
-
-# Create memory handler
-memory_handler = MemoryLogHandler()
-memory_handler.setLevel(logging.INFO)
-
-# Add it to the root logger
-logging.getLogger().addHandler(memory_handler)
+# Uploads are copied to disk in fixed-size blocks and rejected past the size limit
+UPLOAD_MAX_BYTES = int(os.getenv("GLIMPSE_UPLOAD_MAX_BYTES", str(500 * 1024 * 1024)))
+UPLOAD_BLOCK_BYTES = 1024 * 1024
+# Room for multipart boundaries and form fields when checking Content-Length
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+JSON_BODY_MAX_BYTES = 64 * 1024
+
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    # Reject oversized requests from their Content-Length before any of the body is read
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > UPLOAD_MAX_BYTES + UPLOAD_FORM_OVERHEAD_BYTES:
+        logger.warning(f"Rejected request of {content_length} bytes to {request.url.path}")
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Request is larger than the {UPLOAD_MAX_BYTES // (1024 * 1024)} MB upload limit"}
+        )
+    return await call_next(request)
 
-# Add it to our logger
-logger.addHandler(memory_handler)
+# Stop the idle eviction thread and free the loaded models when the server stops
+@app.on_event("shutdown")
+def release_models():
+    model_registry.shutdown()
 
-# Now all log messages will be stored in memory_handler.logs
+# Keep recent log records in memory for /api/logs. The store is attached to the
+# root logger only, since records from every other logger propagate there.
+log_store.setLevel(logging.INFO)
+logging.getLogger().addHandler(log_store)
 
 # Validate YouTube URL and extract ID
 def validate_youtube_url(url: str) -> str:
@@ -116,763 +134,673 @@ def validate_youtube_url(url: str) -> str:
     logger.error(f"Invalid YouTube URL format: {url}")
     raise ValueError(f"Invalid YouTube URL format. Please provide a standard YouTube URL like https://www.youtube.com/watch?v=xxxx or https://youtu.be/xxxx")
 
+# Cached wrappers around the pipeline stages. Each stage output is cached
+# separately so that e.g. a language switch only reruns translation.
+def transcript_cache_key(audio_hash: str) -> str:
+    # Transcripts differ between ASR engines, their models or languages, and chunking modes
+    return f"{audio_hash}:{get_asr_backend().cache_id}:{CHUNKING_MODE}"
+
+def cached_download_audio(url: str, video_id: str) -> Dict[str, Any]:
+    record = artifact_cache.get("audio", video_id)
+    if record:
+        cached_path = artifact_cache.get_file("audio", video_id, AUDIO_EXT)
+        # The audio file is only needed if the transcript is no longer cached
+        if cached_path or artifact_cache.get("transcript", transcript_cache_key(record["audio_hash"])) is not None:
+            logger.info(f"Using cached audio for YouTube ID: {video_id}")
+            return {
+                "local_path": cached_path,
+                "video_id": video_id,
+                "audio_hash": record["audio_hash"]
+            }
+
+    with stage_duration.time(stage="download"):
+        audio_info = download_audio(url)
+    metadata_cache.put(video_id, audio_info.get("metadata"))
+    audio_hash = hash_file(audio_info["local_path"])
+    artifact_cache.put_file("audio", video_id, audio_info["local_path"])
+    artifact_cache.put("audio", video_id, {"audio_hash": audio_hash})
+    audio_info["audio_hash"] = audio_hash
+    return audio_info
+
+def cached_audio_to_text(audio_info: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
+    audio_hash = audio_info.get("audio_hash") or hash_file(audio_info["local_path"])
+    key = transcript_cache_key(audio_hash)
+    transcription_result = artifact_cache.get("transcript", key)
+    if transcription_result is not None:
+        logger.info(f"Using cached transcript for audio {audio_hash[:12]}")
+        return transcription_result
+
+    with stage_duration.time(stage="transcription"):
+        transcription_result = audio_to_text(audio_info, progress_callback=progress_callback)
+    artifact_cache.put("transcript", key, transcription_result)
+    return transcription_result
+
+def cached_stream_audio_to_text(url: str, video_id: str, progress_callback=None) -> Dict[str, Any]:
+    # A transcript from an earlier streamed or downloaded run is reused through the audio record
+    record = artifact_cache.get("audio", video_id)
+    if record:
+        transcription_result = artifact_cache.get("transcript", transcript_cache_key(record["audio_hash"]))
+        if transcription_result is not None:
+            logger.info(f"Using cached transcript for YouTube ID: {video_id}")
+            return transcription_result
+
+    with stage_duration.time(stage="transcription"):
+        transcription_result, audio_hash = stream_audio_to_text(
+            url,
+            progress_callback=progress_callback,
+            metadata_callback=lambda metadata: metadata_cache.put(video_id, metadata)
+        )
+    artifact_cache.put("transcript", transcript_cache_key(audio_hash), transcription_result)
+    artifact_cache.put("audio", video_id, {"audio_hash": audio_hash})
+    return transcription_result
+
+# Metadata lookups run beside transcription instead of after it
+metadata_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="metadata")
+
+def cached_video_metadata(url: str, video_id: str) -> Dict[str, Any]:
+    metadata = metadata_cache.get(video_id)
+    if metadata is not None:
+        return metadata
+
+    with stage_duration.time(stage="metadata"):
+        metadata = fetch_video_metadata(url)
+    metadata_cache.put(video_id, metadata)
+    return metadata
+
+def cached_summarize_text(text: str) -> str:
+    key = f"{hash_text(text)}:{hash_config(summarizer_config)}"
+    summary = artifact_cache.get("summary", key)
+    if summary is not None:
+        logger.info("Using cached summary")
+        return summary
+
+    with stage_duration.time(stage="summarization"):
+        plan = summarize_with_plan(text)
+    summary = plan["summary"]
+    # Results cut short by the latency budget are not cached, so a later request can do better
+    if summary and summary.strip() and not plan["degraded"]:
+        artifact_cache.put("summary", key, summary)
+    return summary
+
+def cached_translate_many(text: str, target_language_codes: List[str]) -> Dict[str, str]:
+    text_hash = hash_text(text)
+    translations = {}
+    for code in target_language_codes:
+        translation = artifact_cache.get("translation", f"{text_hash}:{code}")
+        if translation is not None:
+            logger.info(f"Using cached translation ({code})")
+            translations[code] = translation
+
+    # All uncached languages are translated together so they share encoder passes
+    missing = [code for code in target_language_codes if code not in translations]
+    if missing:
+        with stage_duration.time(stage="translation"):
+            translated = translate_text_multi(text, missing)
+        for code, translation in translated.items():
+            artifact_cache.put("translation", f"{text_hash}:{code}", translation)
+            translations[code] = translation
+    return translations
+
+def cached_sentiment(text: str) -> List[Dict[str, Any]]:
+    key = hash_text(text)
+    sentiment_result = artifact_cache.get("sentiment", key)
+    if sentiment_result is not None:
+        return sentiment_result
+
+    with stage_duration.time(stage="sentiment"):
+        raw_result = sentiment_pipeline(text)
+    sentiment_result = [
+        {"label": r["label"], "score": float(r["score"])} for r in raw_result
+    ]
+    artifact_cache.put("sentiment", key, sentiment_result)
+    return sentiment_result
+
 @app.get("/")
 async def root():
     logger.info("Health check endpoint called")
     return {"message": "GlimpseGPT API is running"}
 
-@app.post("/api/summarize")
-async def summarize(
-    request: Request,
-    file: Optional[UploadFile] = File(None),
-    language: Optional[str] = Form(None)
-):
-    # Get the raw request body for debugging
-    body_bytes = await request.body()
-    logger.info(f"Raw request body: {body_bytes}")
-    
-    # Try to parse as JSON if content-type is application/json
-    url = None
-    json_body = None
-    
-    try:
-        if request.headers.get('content-type') == 'application/json':
-            try:
-                json_body = json.loads(body_bytes)
-                logger.info(f"Parsed JSON body: {json_body}")
-                url = json_body.get('url')
-                if language is None:
-                    language = json_body.get('language', 'English')
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON body: {e}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": f"Invalid JSON body: {str(e)}"}
-                )
-        
-        # Default language if not provided
-        if language is None:
-            language = "English"
-        
-        logger.info(f"Processing request with URL: {url}, File: {file.filename if file else None}, Language: {language}")
-        
-        if not url and not file:
-            logger.warning("Request missing both URL and file")
-            return JSONResponse(
-                status_code=400,
-                content={"detail": "Either URL or file must be provided"}
-            )
-        
-        # Validate language
-        if language not in language_code_map:
-            logger.warning(f"Unsupported language: {language}")
-            return JSONResponse(
-                status_code=400,
-                content={"detail": f"Unsupported language: {language}. Supported languages are {', '.join(language_code_map.keys())}"}
-            )
-        
-        # Process YouTube URL
-        audio_info = None
-        if url:
-            logger.info(f"Processing request with URL: {url}, Language: {language}")
-            
-            try:
-                # Validate the YouTube URL and extract the video ID
-                logger.info(f"Validating YouTube URL: {url}")
-                video_id = validate_youtube_url(url)
-                logger.info(f"Extracted YouTube video ID: {video_id}")
-                
-                try:
-                    # Download the audio for the YouTube video (now returns a dict with paths)
-                    logger.info(f"Downloading audio from YouTube ID: {video_id}")
-                    logger.info("Progress update: Downloading audio content")
-                    audio_info = download_audio(url)
-                    logger.info(f"Downloaded audio info: {audio_info}")
-                    logger.info("Progress update: Audio download complete")
-                except Exception as e:
-                    logger.error(f"Failed to download audio: {str(e)}")
-                    return JSONResponse(
-                        status_code=500,
-                        content={"detail": f"Failed to download audio from YouTube: {str(e)}"}
-                    )
-            except ValueError as ve:
-                logger.error(f"Invalid YouTube URL: {str(ve)}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": f"Invalid YouTube URL: {str(ve)}"}
-                )
-            except Exception as e:
-                logger.error(f"Failed to download audio: {str(e)}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": f"Failed to download from URL: {str(e)}"}
-                )
-            
-            try:
-                # Transcribe the audio file (now accepts a dict with path info)
-                logger.info(f"Transcribing audio from info: {audio_info}")
-                logger.info("Progress update: Transcribing audio to text")
-                
-                # Add interim progress updates
-                for milestone in [25, 50, 75]:
-                    await asyncio.sleep(0.5)  # Small delay to space out logs
-                    logger.info(f"Progress update: Transcription {milestone}% complete")
-                
-                transcription_result = audio_to_text(audio_info)
-                original_text = transcription_result["full_text"]
-                transcript_segments = transcription_result["segments"]
-                
-                logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
-                logger.info("Progress update: Transcription complete")
-                
-                # If we got no transcribed text, return an error
-                if not original_text.strip():
-                    logger.error("No speech detected in the audio")
-                    return JSONResponse(
-                        status_code=400,
-                        content={"detail": "No speech detected in the audio"}
-                    )
-            except Exception as e:
-                logger.error(f"Failed to transcribe audio: {str(e)}")
-                return JSONResponse(
-                    status_code=500,
-                    content={"detail": f"Failed to transcribe audio: {str(e)}"}
-                )
-        
-        # Process uploaded file
-        elif file:
-            logger.info(f"Processing uploaded file: {file.filename}")
-            temp_path = None
-            try:
-                # Save uploaded file to a temporary file
-                content = await file.read()
-                if len(content) == 0:
-                    logger.error("Uploaded file is empty")
-                    return JSONResponse(
-                        status_code=400,
-                        content={"detail": "Uploaded file is empty"}
-                    )
-                
-                # If Supabase is configured, upload to Supabase
-                if supabase:
-                    try:
-                        # Generate a unique file name
-                        file_id = str(uuid.uuid4())
-                        file_ext = os.path.splitext(file.filename)[1] if file.filename else ".mp3"
-                        supabase_path = f"{file_id}{file_ext}"
-                        
-                        # Upload to Supabase storage
-                        result = supabase.storage.from_(bucket_name).upload(
-                            path=supabase_path,
-                            file=content,
-                            file_options={"content-type": "audio/mpeg"},
-                            is_upsert=True
-                        )
-                        
-                        # Get the public URL
-                        public_url = supabase.storage.from_(bucket_name).get_public_url(supabase_path)
-                        logger.info(f"Uploaded file to Supabase: {public_url}")
-                        
-                        # Also save to temp file for processing
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-                            temp_file.write(content)
-                            temp_path = temp_file.name
-                        
-                        # Create audio info dictionary
-                        audio_info = {
-                            "local_path": temp_path,
-                            "supabase_path": supabase_path,
-                            "public_url": public_url,
-                            "file_id": file_id
-                        }
-                    except Exception as e:
-                        logger.error(f"Failed to upload to Supabase: {str(e)}")
-                        # Fall back to local temp file
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-                            temp_file.write(content)
-                            temp_path = temp_file.name
-                        audio_info = {"local_path": temp_path}
-                else:
-                    # If Supabase is not configured, just use a local temp file
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-                        temp_file.write(content)
-                        temp_path = temp_file.name
-                    audio_info = {"local_path": temp_path}
-                
-                logger.info(f"Saved uploaded file info: {audio_info}")
-                try:
-                    transcription_result = audio_to_text(audio_info)
-                    
-                    # Extract full text and segments
-                    original_text = transcription_result["full_text"]
-                    transcript_segments = transcription_result["segments"]
-                    
-                    logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
-                except Exception as e:
-                    logger.error(f"Failed to transcribe audio: {str(e)}")
-                    return JSONResponse(
-                        status_code=500,
-                        content={"detail": f"Failed to transcribe audio: {str(e)}"}
-                    )
-                
-                # If we got no transcribed text, return an error
-                if not original_text.strip():
-                    logger.error("No speech detected in the uploaded audio")
-                    return JSONResponse(
-                        status_code=400,
-                        content={"detail": "No speech detected in the uploaded audio"}
-                    )
-            except Exception as e:
-                logger.error(f"Failed to process uploaded file: {str(e)}")
-                return JSONResponse(
-                    status_code=500,
-                    content={"detail": f"Failed to process file: {str(e)}"}
-                )
-            finally:
-                # Clean up temp file at the end of processing
-                if temp_path and os.path.exists(temp_path) and not (audio_info and audio_info.get("keep_local", False)):
-                    try:
-                        os.remove(temp_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to remove temp file: {str(e)}")
-        
-        # Generate summary in English
-        logger.info("Generating summary")
-        logger.info("Progress update: Generating summary of content")
+# Share of the overall job progress covered by each pipeline stage
+STAGE_PROGRESS = {
+    "download": (0, 20),
+    "transcription": (20, 70),
+    "summary": (70, 88),
+    "translation": (88, 94),
+    "sentiment": (94, 98),
+    "finalizing": (98, 100),
+}
+
+def report_progress(job: Job, stage: str, fraction: float, message: str, log: bool = True):
+    """
+    Publish a progress event for the job, scaled into the stage's share of the total
+    """
+    start, end = STAGE_PROGRESS[stage]
+    job.report(stage, start + (end - start) * fraction, message)
+    if log:
+        logger.info(f"Progress update: {message}")
+
+def transcription_progress(job: Job):
+    # Chunk-level updates go to the job's event stream only, not the shared log
+    def callback(completed: int, total: int):
+        report_progress(job, "transcription", completed / total,
+                        f"Transcribed {completed}/{total} chunks", log=False)
+    return callback
+
+# Stage concurrency for the videos of a batch. Each video runs on its own
+# thread but has to take a slot per stage, so one video downloads while another
+# runs ASR and a third is summarized, without oversubscribing any stage.
+BATCH_STAGE_SLOTS = {
+    "download": threading.BoundedSemaphore(int(os.getenv("GLIMPSE_BATCH_DOWNLOAD_SLOTS", "2"))),
+    # Local Whisper already uses every core for one video; remote ASR is mostly waiting on the network
+    "transcription": threading.BoundedSemaphore(int(os.getenv(
+        "GLIMPSE_BATCH_TRANSCRIPTION_SLOTS", "1" if ASR_BACKEND_NAME == "local" else "2"
+    ))),
+    "summary": threading.BoundedSemaphore(int(os.getenv("GLIMPSE_BATCH_SUMMARY_SLOTS", "1"))),
+}
+stage_slots: contextvars.ContextVar[Optional[Dict[str, threading.BoundedSemaphore]]] = contextvars.ContextVar(
+    "stage_slots", default=None
+)
+
+@contextmanager
+def stage_slot(stage: str):
+    """
+    Hold the stage's slot while the block runs, if the current job is rate-limited per stage
+    """
+    slots = stage_slots.get()
+    if not slots or stage not in slots:
+        yield
+        return
+    with slots[stage]:
+        yield
+
+# Full summarization pipeline for a YouTube URL or an uploaded file. Runs on the
+# job executor, so the blocking download, ASR and model calls stay off the event loop.
+def process_summarize_job(
+    job: Job,
+    url: Optional[str] = None,
+    video_id: Optional[str] = None,
+    upload: Optional[Dict[str, Any]] = None,
+    language: str = "English",
+    languages: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    audio_info = None
+    metadata_future = None
+
+    # Stream a YouTube URL straight into transcription
+    if url and STREAMING_ENABLED:
         try:
-            # Add interim progress updates for summarization
-            await asyncio.sleep(0.3)
-            logger.info("Progress update: Analyzing transcript content")
-            await asyncio.sleep(0.3)
-            logger.info("Progress update: Identifying key points")
-            
-            summary_en = summarize_text(original_text)
-            
-            logger.info(f"Summary generated, length: {len(summary_en)} characters")
-            logger.info("Progress update: Summary generation complete")
-            
-            # Validate summary content
-            if not summary_en or len(summary_en.strip()) == 0:
-                logger.error("Generated summary is empty")
-                return JSONResponse(
-                    status_code=500,
-                    content={"detail": "Failed to generate a meaningful summary from the content"}
-                )
-                
-            # Log summary for debugging (only in development)
-            logger.info(f"Summary content preview: {summary_en[:100]}...")
+            logger.info(f"Streaming audio from YouTube ID: {video_id}")
+            report_progress(job, "download", 0, "Streaming audio into transcription")
+            with stage_slot("transcription"):
+                transcription_result = cached_stream_audio_to_text(url, video_id, transcription_progress(job))
+            original_text = transcription_result["full_text"]
+            transcript_segments = transcription_result["segments"]
+
+            logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
+            report_progress(job, "transcription", 1, "Transcription complete")
         except Exception as e:
-            logger.error(f"Failed to summarize text: {str(e)}")
-            return JSONResponse(
-                status_code=500,
-                content={"detail": f"Failed to generate summary: {str(e)}"}
-            )
-        
-        # Translate summary if needed
-        target_language_code = language_code_map.get(language, "en")
-        if language != "English":
-            logger.info(f"Translating to {language} ({target_language_code})")
-            logger.info("Progress update: Translating summary")
-            try:
-                await asyncio.sleep(0.3)
-                logger.info("Progress update: Processing translation")
-                
-                summary_translated = translate_text(summary_en, target_language_code)
-                logger.info(f"Translation complete, length: {len(summary_translated)} characters")
-                logger.info("Progress update: Translation complete")
-            except Exception as e:
-                logger.error(f"Failed to translate summary: {str(e)}")
-                # Fall back to English summary if translation fails
-                summary_translated = summary_en
-                logger.info("Falling back to English summary")
-        else:
-            summary_translated = summary_en
-        
-        # Analyze sentiment
-        logger.info("Analyzing sentiment")
-        logger.info("Progress update: Performing sentiment analysis")
+            logger.error(f"Failed to stream and transcribe audio: {str(e)}")
+            raise JobError(f"Failed to transcribe audio from YouTube: {str(e)}", 500)
+
+        # Usually already cached from the resolved stream
+        metadata_future = metadata_executor.submit(contextvars.copy_context().run, cached_video_metadata, url, video_id)
+
+        # If we got no transcribed text, return an error
+        if not original_text.strip():
+            logger.error("No speech detected in the audio")
+            raise JobError("No speech detected in the audio", 400)
+
+    # Process YouTube URL
+    elif url:
         try:
-            await asyncio.sleep(0.3)
-            logger.info("Progress update: Evaluating sentiment patterns")
-            
-            sentiment_result = sentiment_pipeline(summary_en)
-            sentiment_label = sentiment_result[0]["label"]
-            sentiment_score = sentiment_result[0]["score"]
-            logger.info(f"Sentiment analysis complete: {sentiment_label} ({sentiment_score})")
-            logger.info("Progress update: Sentiment analysis complete")
+            # Download the audio for the YouTube video (now returns a dict with paths)
+            logger.info(f"Downloading audio from YouTube ID: {video_id}")
+            report_progress(job, "download", 0, "Downloading audio content")
+            with stage_slot("download"):
+                audio_info = cached_download_audio(url, video_id)
+            logger.info(f"Downloaded audio to {audio_info.get('local_path')}")
+            report_progress(job, "download", 1, "Audio download complete")
         except Exception as e:
-            logger.error(f"Failed to analyze sentiment: {str(e)}")
-            # Provide default sentiment values if analysis fails
-            sentiment_label = "neutral"
-            sentiment_score = 0.5
-            logger.info("Using default sentiment values")
-        
-        logger.info("Progress update: Finalizing results")
-        response_data = {
-            "original_text": original_text,
-            "summary_en": summary_en,
-            "summary_translated": summary_translated,
-            "language": language,
-            "sentiment": {
-                "label": sentiment_label,
-                "score": sentiment_score
-            },
-            "transcript_segments": transcript_segments
-        }
-        
-        # Log response structure (without full content) for debugging
-        logger.info(f"Response structure: keys={list(response_data.keys())}")
-        logger.info(f"Summary length: original={len(summary_en)}, translated={len(summary_translated)}")
-        
-        # Additional metadata if available from YouTube
-        if url:
-            try:
-                # Try to extract thumbnail and title
-                with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
-                    video_info = ydl.extract_info(url, download=False)
-                    
-                    if video_info:
-                        # Get best thumbnail
-                        thumbnails = video_info.get('thumbnails', [])
-                        thumbnails.sort(key=lambda x: x.get('height', 0) * x.get('width', 0), reverse=True)
-                        
-                        if thumbnails:
-                            response_data["thumbnail_url"] = thumbnails[0]['url']
-                        
-                        # Get title
-                        if 'title' in video_info:
-                            response_data["title"] = video_info['title']
-            except Exception as e:
-                logger.warning(f"Could not extract additional metadata: {str(e)}")
-        
-        logger.info("Successfully processed request, returning response")
-        logger.info("Progress update: Processing complete")
-        return JSONResponse(content=response_data)
-    
-    except Exception as e:
-        logger.error(f"Unhandled exception in summarize endpoint: {str(e)}")
-        logger.error(traceback.format_exc())
-        logger.info("Progress update: Processing failed with error")
-        return JSONResponse(
-            status_code=500,
-            content={"detail": f"An error occurred while processing the request: {str(e)}"}
-        )
+            logger.error(f"Failed to download audio: {str(e)}")
+            raise JobError(f"Failed to download audio from YouTube: {str(e)}", 500)
 
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    logger.error(f"Unhandled exception: {str(exc)}")
-    logger.error(traceback.format_exc())
-    return JSONResponse(
-        status_code=500,
-        content={"detail": f"Server error: {str(exc)}"},
-    )
+        # A fresh download has already cached the metadata; otherwise it is fetched during transcription
+        metadata_future = metadata_executor.submit(contextvars.copy_context().run, cached_video_metadata, url, video_id)
 
-@app.get("/api/logs")
-async def get_logs():
-    """
-    Return the most recent logs from the application.
-    """
-    try:
-        recent_logs = memory_handler.logs
-        progress_updates = [log for log in recent_logs if "Progress update" in log]
-        return {
-            "logs": recent_logs,
-            "progress": progress_updates[-5:] if progress_updates else [],
-            "count": len(recent_logs),
-            "last_updated": datetime.now().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Error retrieving logs: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve logs: {str(e)}")
+        try:
+            # Transcribe the audio file (now accepts a dict with path info)
+            logger.info(f"Transcribing audio for YouTube ID: {video_id}")
+            report_progress(job, "transcription", 0, "Transcribing audio to text")
 
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True) 
-import time
-import base64
-from typing import Optional, List, Dict, Any, Union
-from fastapi import FastAPI, File, Form, UploadFile, Request, Response, HTTPException, Query, Depends, Body
-from fastapi.responses import JSONResponse, RedirectResponse
-from fastapi.middleware.cors import CORSMiddleware
-from pydub import AudioSegment
-from io import StringIO, BytesIO
-from datetime import datetime
+            with stage_slot("transcription"):
+                transcription_result = cached_audio_to_text(audio_info, transcription_progress(job))
+            original_text = transcription_result["full_text"]
+            transcript_segments = transcription_result["segments"]
 
-# Set the TOKENIZERS_PARALLELISM environment variable to avoid warnings
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
+            logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
+            report_progress(job, "transcription", 1, "Transcription complete")
+        except Exception as e:
+            logger.error(f"Failed to transcribe audio: {str(e)}")
+            raise JobError(f"Failed to transcribe audio: {str(e)}", 500)
+
+        # If we got no transcribed text, return an error
+        if not original_text.strip():
+            logger.error("No speech detected in the audio")
+            raise JobError("No speech detected in the audio", 400)
+
+    # Process uploaded file
+    else:
+        temp_path = upload["temp_path"]
+        logger.info(f"Processing uploaded file: {upload['filename']}")
+        report_progress(job, "download", 1, "Uploaded file received")
+        try:
+            # Transcripts are keyed by the uploaded content, so a re-upload skips conversion entirely
+            transcription_result = artifact_cache.get("transcript", transcript_cache_key(upload["audio_hash"]))
+            if transcription_result is not None:
+                logger.info(f"Using cached transcript for uploaded file {upload['filename']}")
+            else:
+                # Convert once to the canonical 16 kHz mono format used for storage and ASR
+                original_path = temp_path
+                temp_path = canonicalize_audio(original_path)
+                cleanup_temp_files(original_path)
+                audio_info = {"local_path": temp_path, "audio_hash": upload["audio_hash"]}
+
+                # Keep a copy in storage; the upload runs in the background and transcription does not wait for it
+                if storage_uploader:
+                    file_id = str(uuid.uuid4())
+                    storage_path = f"{file_id}{AUDIO_EXT}"
+                    storage_uploader.submit(temp_path, storage_path, AUDIO_CONTENT_TYPE)
+                    audio_info.update({"storage_path": storage_path, "file_id": file_id})
+
+                logger.info(f"Saved uploaded file to {temp_path}")
+                try:
+                    report_progress(job, "transcription", 0, "Transcribing audio to text")
+                    transcription_result = cached_audio_to_text(audio_info, transcription_progress(job))
+                except Exception as e:
+                    logger.error(f"Failed to transcribe audio: {str(e)}")
+                    raise JobError(f"Failed to transcribe audio: {str(e)}", 500)
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            # Extract full text and segments
+            original_text = transcription_result["full_text"]
+            transcript_segments = transcription_result["segments"]
 
-from main import (
-    download_audio,
-    audio_to_text,
-    summarize_text,
-    translate_text,
-    sentiment_pipeline,
-    language_code_map
-)
+            logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
+            report_progress(job, "transcription", 1, "Transcription complete")
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+            # If we got no transcribed text, return an error
+            if not original_text.strip():
+                logger.error("No speech detected in the uploaded audio")
+                raise JobError("No speech detected in the uploaded audio", 400)
+        except JobError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to process uploaded file: {str(e)}")
+            raise JobError(f"Failed to process file: {str(e)}", 500)
+        finally:
+            # Clean up temp file at the end of processing
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except Exception as e:
+                    logger.warning(f"Failed to remove temp file: {str(e)}")
 
-app = FastAPI(
-    title="GlimpseGPT API",
-    description="API for GlimpseGPT audio summarization",
-    version="1.0.0"
-)
+    # Generate summary in English
+    logger.info("Generating summary")
+    report_progress(job, "summary", 0, "Generating summary of content")
+    try:
+        with stage_slot("summary"):
+            summary_en = cached_summarize_text(original_text)
 
-# Add CORS middleware with more permissive settings
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins in development
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+        logger.info(f"Summary generated, length: {len(summary_en)} characters")
+        report_progress(job, "summary", 1, "Summary generation complete")
+    except Exception as e:
+        logger.error(f"Failed to summarize text: {str(e)}")
+        raise JobError(f"Failed to generate summary: {str(e)}", 500)
+
+    # Validate summary content
+    if not summary_en or len(summary_en.strip()) == 0:
+        logger.error("Generated summary is empty")
+        raise JobError("Failed to generate a meaningful summary from the content", 500)
+
+    # Log summary for debugging (only in development)
+    logger.info(f"Summary content preview: {summary_en[:100]}...")
+
+    # Translate summary into every requested language if needed
+    translations = {target: summary_en for target in (languages or [language])}
+    target_languages = [target for target in translations if target != "English"]
+    if target_languages:
+        target_language_codes = [language_code_map.get(target, "en") for target in target_languages]
+        logger.info(f"Translating to {', '.join(target_languages)} ({', '.join(target_language_codes)})")
+        report_progress(job, "translation", 0, "Translating summary")
+        try:
+            translated = cached_translate_many(summary_en, target_language_codes)
+            for target, code in zip(target_languages, target_language_codes):
+                translations[target] = translated[code]
+            logger.info(f"Translation complete, lengths: {[len(translations[target]) for target in target_languages]} characters")
+            report_progress(job, "translation", 1, "Translation complete")
+        except Exception as e:
+            logger.error(f"Failed to translate summary: {str(e)}")
+            # Fall back to English summary if translation fails
+            logger.info("Falling back to English summary")
+    summary_translated = translations[language]
+
+    # Analyze sentiment
+    logger.info("Analyzing sentiment")
+    report_progress(job, "sentiment", 0, "Performing sentiment analysis")
+    try:
+        sentiment_result = cached_sentiment(summary_en)
+        sentiment_label = sentiment_result[0]["label"]
+        sentiment_score = sentiment_result[0]["score"]
+        logger.info(f"Sentiment analysis complete: {sentiment_label} ({sentiment_score})")
+        report_progress(job, "sentiment", 1, "Sentiment analysis complete")
+    except Exception as e:
+        logger.error(f"Failed to analyze sentiment: {str(e)}")
+        # Provide default sentiment values if analysis fails
+        sentiment_label = "neutral"
+        sentiment_score = 0.5
+        logger.info("Using default sentiment values")
+
+    report_progress(job, "finalizing", 0, "Finalizing results")
+    response_data = {
+        "original_text": original_text,
+        "summary_en": summary_en,
+        "summary_translated": summary_translated,
+        "language": language,
+        "sentiment": {
+            "label": sentiment_label,
+            "score": sentiment_score
+        },
+        "transcript_segments": transcript_segments
+    }
+    if languages:
+        response_data["translations"] = translations
+
+    # Log response structure (without full content) for debugging
+    logger.info(f"Response structure: keys={list(response_data.keys())}")
+    logger.info(f"Summary length: original={len(summary_en)}, translated={len(summary_translated)}")
+
+    # Additional metadata if available from YouTube
+    if metadata_future:
+        try:
+            metadata = metadata_future.result()
+            if "thumbnail_url" in metadata:
+                response_data["thumbnail_url"] = metadata["thumbnail_url"]
+            if "title" in metadata:
+                response_data["title"] = metadata["title"]
+        except Exception as e:
+            logger.warning(f"Could not extract additional metadata: {str(e)}")
 
-# Set up logging with a custom handler that stores recent logs
-class MemoryLogHandler(logging.Handler):
-    def __init__(self, capacity=200):  # Increased capacity
-        super().__init__()
-        self.capacity = capacity
-        self.logs = []
-        self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    
-    def emit(self, record):
-        log_entry = self.formatter.format(record)
-        self.logs.append(log_entry)
-        # Keep only the most recent logs
-        if len(self.logs) > self.capacity:
-            self.logs.pop(0)
+    logger.info("Successfully processed request")
+    report_progress(job, "finalizing", 1, "Processing complete")
+    return response_data
 
-# Create memory handler
-memory_handler = MemoryLogHandler()
-memory_handler.setLevel(logging.INFO)
+# Batch summarization. Every video is a summarize job of its own on a dedicated
+# executor, so a batch never takes up the workers that serve single requests.
+BATCH_MAX_VIDEOS = int(os.getenv("GLIMPSE_BATCH_MAX_VIDEOS", "50"))
+BATCH_VIDEO_WORKERS = int(os.getenv("GLIMPSE_BATCH_VIDEO_WORKERS", "4"))
+batch_video_executor = ThreadPoolExecutor(max_workers=BATCH_VIDEO_WORKERS, thread_name_prefix="glimpse-batch-video")
+# Batch jobs only expand playlists and wait for their videos
+batch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="glimpse-batch")
 
-# Add it to the root logger
-logging.getLogger().addHandler(memory_handler)
+PLAYLIST_PATTERN = re.compile(r'^(https?://)?(www\.|m\.)?youtube\.com/\S*[?&]list=([a-zA-Z0-9_-]+)')
 
-# Add it to our logger
-logger.addHandler(memory_handler)
+def process_batch_video(job: Job, **job_kwargs) -> Dict[str, Any]:
+    token = stage_slots.set(BATCH_STAGE_SLOTS)
+    try:
+        return process_summarize_job(job, **job_kwargs)
+    finally:
+        stage_slots.reset(token)
+
+def process_batch_job(
+    job: Job,
+    urls: Optional[List[str]] = None,
+    playlist_url: Optional[str] = None,
+    language: str = "English",
+    languages: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    urls = list(urls or [])
+    title = None
+    if playlist_url:
+        job.report("playlist", 0, "Expanding playlist")
+        try:
+            playlist = expand_playlist(playlist_url, BATCH_MAX_VIDEOS)
+        except Exception as e:
+            logger.error(f"Failed to expand playlist: {str(e)}")
+            raise JobError(f"Failed to expand playlist: {str(e)}", 400)
+        title = playlist["title"]
+        urls.extend(playlist["urls"])
+        logger.info(f"Playlist {title} has {len(playlist['urls'])} videos")
+    urls = urls[:BATCH_MAX_VIDEOS]
+    if not urls:
+        raise JobError("No videos to summarize", 400)
+
+    # Queue every video at once; the stage slots decide which ones make progress
+    videos = []
+    seen = set()
+    for url in urls:
+        try:
+            video_id = validate_youtube_url(url)
+        except ValueError as ve:
+            videos.append({"url": url, "status": JOB_FAILED, "error": str(ve), "status_code": 400})
+            continue
+        if video_id in seen:
+            continue
+        seen.add(video_id)
+        child = job_manager.submit(
+            "summarize",
+            process_batch_video,
+            params={"url": url, "language": language, "languages": languages, "batch_id": job.id},
+            executor=batch_video_executor,
+            url=url,
+            video_id=video_id,
+            language=language,
+            languages=languages
+        )
+        job.children.append(child)
+        videos.append({"url": url, "video_id": video_id, "job_id": child.id, "job": child})
+
+    total = len(videos)
+    finished = total - len(job.children)
+    logger.info(f"Batch {job.id}: queued {len(job.children)} videos")
+    job.report("videos", 100 * finished / total, f"{finished}/{total} videos finished")
+    children_by_future = {child.future: child for child in job.children}
+    for future in as_completed(children_by_future):
+        child = children_by_future[future]
+        finished += 1
+        job.publish("video", video_job_id=child.id, url=child.params["url"], status=child.status)
+        job.report("videos", 100 * finished / total, f"{finished}/{total} videos finished")
+
+    for video in videos:
+        child = video.pop("job", None)
+        if child is None:
+            continue
+        video["status"] = child.status
+        if child.status == JOB_COMPLETED:
+            video["result"] = child.result
+        else:
+            video["error"] = child.error
+            video["status_code"] = child.status_code
+
+    completed = sum(1 for video in videos if video["status"] == JOB_COMPLETED)
+    logger.info(f"Batch {job.id}: {completed}/{total} videos summarized")
+    return {
+        "title": title,
+        "status": "completed" if completed == total else "partial" if completed else "failed",
+        "total": total,
+        "completed": completed,
+        "failed": total - completed,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "videos": videos
+    }
+
+async def read_json_body(request: Request, max_bytes: int = JSON_BODY_MAX_BYTES) -> bytes:
+    """
+    Read a JSON request body, giving up as soon as it passes max_bytes
+    """
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise JobError(f"JSON body is larger than {max_bytes // 1024} KB", 413)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+async def parse_json_body(request: Request, max_bytes: int = JSON_BODY_MAX_BYTES) -> Dict[str, Any]:
+    body_bytes = await read_json_body(request, max_bytes)
+    try:
+        json_body = json.loads(body_bytes)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON body: {e}")
+        raise JobError(f"Invalid JSON body: {str(e)}", 400)
+    if not isinstance(json_body, dict):
+        raise JobError("JSON body must be an object", 400)
+    logger.info(f"Parsed JSON body with keys: {sorted(json_body)}")
+    return json_body
+
+def resolve_languages(
+    language: Optional[str],
+    languages: Optional[Union[str, List[str]]]
+) -> Tuple[str, Optional[List[str]]]:
+    # Several target languages may be given as a JSON list or a comma-separated form field
+    if isinstance(languages, str):
+        languages = languages.split(",")
+    languages = [lang.strip() for lang in languages or [] if isinstance(lang, str) and lang.strip()] or None
+    if languages:
+        languages = list(dict.fromkeys(languages))
+
+    # Default language if not provided
+    if language is None:
+        language = languages[0] if languages else "English"
+    if languages and language not in languages:
+        languages.insert(0, language)
+    return language, languages
+
+def validate_languages(requested_languages: List[str]):
+    for requested in requested_languages:
+        if requested not in language_code_map:
+            logger.warning(f"Unsupported language: {requested}")
+            raise JobError(f"Unsupported language: {requested}. Supported languages are {', '.join(language_code_map.keys())}", 400)
+
+async def spool_upload(file: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES) -> Dict[str, Any]:
+    """
+    Copy an uploaded file to a temporary file in fixed-size blocks, hashing it
+    on the way, so memory use does not grow with the file size
+    """
+    suffix = os.path.splitext(file.filename or "")[1]
+    if not re.fullmatch(r"\.[A-Za-z0-9]{1,8}", suffix):
+        suffix = ".audio"
+    digest = hashlib.sha256()
+    size = 0
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    try:
+        with temp_file:
+            while True:
+                block = await file.read(UPLOAD_BLOCK_BYTES)
+                if not block:
+                    break
+                size += len(block)
+                if size > max_bytes:
+                    logger.warning(f"Upload {file.filename} exceeded the {max_bytes} byte limit")
+                    raise JobError(f"Uploaded file is larger than the {max_bytes // (1024 * 1024)} MB limit", 413)
+                digest.update(block)
+                temp_file.write(block)
+        if size == 0:
+            logger.error("Uploaded file is empty")
+            raise JobError("Uploaded file is empty", 400)
+    except BaseException:
+        os.remove(temp_file.name)
+        raise
+    finally:
+        await file.close()
+
+    return {
+        "temp_path": temp_file.name,
+        "filename": file.filename,
+        "audio_hash": digest.hexdigest(),
+        "size_bytes": size
+    }
+
+# Parse and validate a summarize request on the event loop. Uploaded files are
+# saved to a temporary file here; all heavy work is left to the job.
+async def prepare_summarize_job(
+    request: Request,
+    file: Optional[UploadFile],
+    language: Optional[str],
+    languages: Optional[Union[str, List[str]]] = None
+) -> Dict[str, Any]:
+    # Try to parse as JSON if content-type is application/json
+    url = None
 
-# Now all log messages will be stored in memory_handler.logs
+    if request.headers.get('content-type') == 'application/json':
+        # Multipart bodies have already been consumed by the form parser
+        json_body = await parse_json_body(request)
+        url = json_body.get('url')
+        if language is None:
+            language = json_body.get('language')
+        if languages is None:
+            languages = json_body.get('languages')
 
-# Validate YouTube URL and extract ID
-def validate_youtube_url(url: str) -> str:
-    if not url:
-        logger.error("YouTube URL is empty")
-        raise ValueError("YouTube URL cannot be empty")
-        
-    # First attempt: Check if it matches the standard youtube.com/watch?v= format
-    pattern1 = re.compile(r'^(https?://)?(www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})')
-    match1 = pattern1.match(url)
-    if match1:
-        return match1.group(3)
-    
-    # Second attempt: Check for youtu.be/ format
-    pattern2 = re.compile(r'^(https?://)?(www\.)?youtu\.be/([a-zA-Z0-9_-]{11})')
-    match2 = pattern2.match(url)
-    if match2:
-        return match2.group(3)
-    
-    # If no match found
-    logger.error(f"Invalid YouTube URL format: {url}")
-    raise ValueError(f"Invalid YouTube URL format. Please provide a standard YouTube URL like https://www.youtube.com/watch?v=xxxx or https://youtu.be/xxxx")
+    language, languages = resolve_languages(language, languages)
 
-@app.get("/")
-async def root():
-    logger.info("Health check endpoint called")
-    return {"message": "GlimpseGPT API is running"}
+    logger.info(f"Processing request with URL: {url}, File: {file.filename if file else None}, Language: {language}, Languages: {languages}")
+
+    if not url and not file:
+        logger.warning("Request missing both URL and file")
+        raise JobError("Either URL or file must be provided", 400)
+
+    validate_languages(languages or [language])
+
+    if url:
+        try:
+            # Validate the YouTube URL and extract the video ID
+            logger.info(f"Validating YouTube URL: {url}")
+            video_id = validate_youtube_url(url)
+            logger.info(f"Extracted YouTube video ID: {video_id}")
+        except ValueError as ve:
+            logger.error(f"Invalid YouTube URL: {str(ve)}")
+            raise JobError(f"Invalid YouTube URL: {str(ve)}", 400)
+        return {"url": url, "video_id": video_id, "language": language, "languages": languages}
+
+    # Save uploaded file to a temporary file
+    upload = await spool_upload(file)
+    logger.info(f"Received upload {file.filename}: {upload['size_bytes']} bytes")
+    return {"upload": upload, "language": language, "languages": languages}
+
+def submit_summarize_job(job_kwargs: Dict[str, Any]) -> Job:
+    params = {
+        "url": job_kwargs.get("url"),
+        "filename": job_kwargs["upload"]["filename"] if job_kwargs.get("upload") else None,
+        "language": job_kwargs["language"],
+        "languages": job_kwargs.get("languages")
+    }
+    return job_manager.submit("summarize", process_summarize_job, params=params, **job_kwargs)
 
 @app.post("/api/summarize")
 async def summarize(
     request: Request,
     file: Optional[UploadFile] = File(None),
-    language: Optional[str] = Form(None)
+    language: Optional[str] = Form(None),
+    languages: Optional[str] = Form(None)
 ):
-    # Get the raw request body for debugging
-    body_bytes = await request.body()
-    logger.info(f"Raw request body: {body_bytes}")
-    
-    # Try to parse as JSON if content-type is application/json
-    url = None
-    json_body = None
-    
     try:
-        if request.headers.get('content-type') == 'application/json':
-            try:
-                json_body = json.loads(body_bytes)
-                logger.info(f"Parsed JSON body: {json_body}")
-                url = json_body.get('url')
-                if language is None:
-                    language = json_body.get('language', 'English')
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON body: {e}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": f"Invalid JSON body: {str(e)}"}
-                )
-        
-        # Default language if not provided
-        if language is None:
-            language = "English"
-        
-        logger.info(f"Processing request with URL: {url}, File: {file.filename if file else None}, Language: {language}")
-        
-        if not url and not file:
-            logger.warning("Request missing both URL and file")
-            return JSONResponse(
-                status_code=400,
-                content={"detail": "Either URL or file must be provided"}
-            )
-        
-        # Validate language
-        if language not in language_code_map:
-            logger.warning(f"Unsupported language: {language}")
-            return JSONResponse(
-                status_code=400,
-                content={"detail": f"Unsupported language: {language}. Supported languages are {', '.join(language_code_map.keys())}"}
-            )
-        
-        # Process YouTube URL
-        if url:
-            logger.info(f"Processing request with URL: {url}, Language: {language}")
-            
-            try:
-                # Validate the YouTube URL and extract the video ID
-                logger.info(f"Validating YouTube URL: {url}")
-                video_id = validate_youtube_url(url)
-                logger.info(f"Extracted YouTube video ID: {video_id}")
-                
-                try:
-                    # Download the audio for the YouTube video
-                    logger.info(f"Downloading audio from YouTube ID: {video_id}")
-                    logger.info("Progress update: Downloading audio content")
-                    audio_file = download_audio(url)
-                    logger.info(f"Downloaded audio file: {audio_file}")
-                    logger.info("Progress update: Audio download complete")
-                except Exception as e:
-                    logger.error(f"Failed to download audio: {str(e)}")
-                    return JSONResponse(
-                        status_code=500,
-                        content={"detail": f"Failed to download audio from YouTube: {str(e)}"}
-                    )
-            except ValueError as ve:
-                logger.error(f"Invalid YouTube URL: {str(ve)}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": f"Invalid YouTube URL: {str(ve)}"}
-                )
-            except Exception as e:
-                logger.error(f"Failed to download audio: {str(e)}")
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": f"Failed to download from URL: {str(e)}"}
-                )
-            
-            try:
-                # Transcribe the audio file
-                logger.info(f"Transcribing audio from: {audio_file}")
-                logger.info("Progress update: Transcribing audio to text")
-                
-                # Add interim progress updates
-                for milestone in [25, 50, 75]:
-                    await asyncio.sleep(0.5)  # Small delay to space out logs
-                    logger.info(f"Progress update: Transcription {milestone}% complete")
-                
-                transcription_result = audio_to_text(audio_file)
-                original_text = transcription_result["full_text"]
-                transcript_segments = transcription_result["segments"]
-                
-                logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
-                logger.info("Progress update: Transcription complete")
-                
-                # If we got no transcribed text, return an error
-                if not original_text.strip():
-                    logger.error("No speech detected in the audio")
-                    return JSONResponse(
-                        status_code=400,
-                        content={"detail": "No speech detected in the audio"}
-                    )
-            except Exception as e:
-                logger.error(f"Failed to transcribe audio: {str(e)}")
-                return JSONResponse(
-                    status_code=500,
-                    content={"detail": f"Failed to transcribe audio: {str(e)}"}
-                )
-        
-        # Process uploaded file
-        elif file:
-            logger.info(f"Processing uploaded file: {file.filename}")
-            temp_path = None
-            try:
-                # Save uploaded file to a temporary file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-                    content = await file.read()
-                    if len(content) == 0:
-                        logger.error("Uploaded file is empty")
-                        return JSONResponse(
-                            status_code=400,
-                            content={"detail": "Uploaded file is empty"}
-                        )
-                    
-                    temp_file.write(content)
-                    temp_path = temp_file.name
-                
-                logger.info(f"Saved uploaded file to temp path: {temp_path}")
-                try:
-                    transcription_result = audio_to_text(temp_path)
-                    
-                    # Extract full text and segments
-                    original_text = transcription_result["full_text"]
-                    transcript_segments = transcription_result["segments"]
-                    
-                    logger.info(f"Transcribed text length: {len(original_text)} characters, with {len(transcript_segments)} segments")
-                except Exception as e:
-                    logger.error(f"Failed to transcribe audio: {str(e)}")
-                    return JSONResponse(
-                        status_code=500,
-                        content={"detail": f"Failed to transcribe audio: {str(e)}"}
-                    )
-                
-                # If we got no transcribed text, return an error
-                if not original_text.strip():
-                    logger.error("No speech detected in the uploaded audio")
-                    return JSONResponse(
-                        status_code=400,
-                        content={"detail": "No speech detected in the uploaded audio"}
-                    )
-            except Exception as e:
-                logger.error(f"Failed to process uploaded file: {str(e)}")
-                return JSONResponse(
-                    status_code=500,
-                    content={"detail": f"Failed to process file: {str(e)}"}
-                )
-            finally:
-                # Clean up temp file
-                if temp_path and os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to remove temp file: {str(e)}")
-        
-        # Generate summary in English
-        logger.info("Generating summary")
-        logger.info("Progress update: Generating summary of content")
-        try:
-            # Add interim progress updates for summarization
-            await asyncio.sleep(0.3)
-            logger.info("Progress update: Analyzing transcript content")
-            await asyncio.sleep(0.3)
-            logger.info("Progress update: Identifying key points")
-            
-            summary_en = summarize_text(original_text)
-            
-            logger.info(f"Summary generated, length: {len(summary_en)} characters")
-            logger.info("Progress update: Summary generation complete")
-            
-            # Validate summary content
-            if not summary_en or len(summary_en.strip()) == 0:
-                logger.error("Generated summary is empty")
-                return JSONResponse(
-                    status_code=500,
-                    content={"detail": "Failed to generate a meaningful summary from the content"}
-                )
-                
-            # Log summary for debugging (only in development)
-            logger.info(f"Summary content preview: {summary_en[:100]}...")
-        except Exception as e:
-            logger.error(f"Failed to summarize text: {str(e)}")
-            return JSONResponse(
-                status_code=500,
-                content={"detail": f"Failed to generate summary: {str(e)}"}
-            )
-        
-        # Translate summary if needed
-        target_language_code = language_code_map.get(language, "en")
-        if language != "English":
-            logger.info(f"Translating to {language} ({target_language_code})")
-            logger.info("Progress update: Translating summary")
-            try:
-                await asyncio.sleep(0.3)
-                logger.info("Progress update: Processing translation")
-                
-                summary_translated = translate_text(summary_en, target_language_code)
-                logger.info(f"Translation complete, length: {len(summary_translated)} characters")
-                logger.info("Progress update: Translation complete")
-            except Exception as e:
-                logger.error(f"Failed to translate summary: {str(e)}")
-                # Fall back to English summary if translation fails
-                summary_translated = summary_en
-                logger.info("Falling back to English summary")
-        else:
-            summary_translated = summary_en
-        
-        # Analyze sentiment
-        logger.info("Analyzing sentiment")
-        logger.info("Progress update: Performing sentiment analysis")
         try:
-            await asyncio.sleep(0.3)
-            logger.info("Progress update: Evaluating sentiment patterns")
-            
-            sentiment_result = sentiment_pipeline(summary_en)
-            sentiment_label = sentiment_result[0]["label"]
-            sentiment_score = sentiment_result[0]["score"]
-            logger.info(f"Sentiment analysis complete: {sentiment_label} ({sentiment_score})")
-            logger.info("Progress update: Sentiment analysis complete")
-        except Exception as e:
-            logger.error(f"Failed to analyze sentiment: {str(e)}")
-            # Provide default sentiment values if analysis fails
-            sentiment_label = "neutral"
-            sentiment_score = 0.5
-            logger.info("Using default sentiment values")
-        
-        logger.info("Progress update: Finalizing results")
-        response_data = {
-            "original_text": original_text,
-            "summary_en": summary_en,
-            "summary_translated": summary_translated,
-            "language": language,
-            "sentiment": {
-                "label": sentiment_label,
-                "score": sentiment_score
-            },
-            "transcript_segments": transcript_segments
-        }
-        
-        # Log response structure (without full content) for debugging
-        logger.info(f"Response structure: keys={list(response_data.keys())}")
-        logger.info(f"Summary length: original={len(summary_en)}, translated={len(summary_translated)}")
-        
-        # Additional metadata if available from YouTube
-        if url:
-            try:
-                # Try to extract thumbnail and title
-                with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
-                    video_info = ydl.extract_info(url, download=False)
-                    
-                    if video_info:
-                        # Get best thumbnail
-                        thumbnails = video_info.get('thumbnails', [])
-                        thumbnails.sort(key=lambda x: x.get('height', 0) * x.get('width', 0), reverse=True)
-                        
-                        if thumbnails:
-                            response_data["thumbnail_url"] = thumbnails[0]['url']
-                        
-                        # Get title
-                        if 'title' in video_info:
-                            response_data["title"] = video_info['title']
-            except Exception as e:
-                logger.warning(f"Could not extract additional metadata: {str(e)}")
-        
+            job_kwargs = await prepare_summarize_job(request, file, language, languages)
+        except JobError as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+
+        # Run the pipeline on the job executor and wait without blocking the event loop
+        job = submit_summarize_job(job_kwargs)
+        await job_manager.wait(job)
+
+        if job.status != JOB_COMPLETED:
+            logger.info("Progress update: Processing failed with error")
+            return JSONResponse(status_code=job.status_code or 500, content={"detail": job.error})
+
         logger.info("Successfully processed request, returning response")
-        logger.info("Progress update: Processing complete")
-        return JSONResponse(content=response_data)
-    
+        return JSONResponse(content=job.result)
+
     except Exception as e:
         logger.error(f"Unhandled exception in summarize endpoint: {str(e)}")
         logger.error(traceback.format_exc())
@@ -882,6 +810,141 @@ async def summarize(
             content={"detail": f"An error occurred while processing the request: {str(e)}"}
         )
 
+@app.post("/api/summarize/batch", status_code=202)
+async def summarize_batch(request: Request):
+    """
+    Queue summaries for a list of YouTube URLs and/or a playlist.
+    Returns the batch job at once; its children are the per-video jobs, and
+    /api/jobs/{job_id} reports them and, when done, the per-video results.
+    """
+    try:
+        body = await parse_json_body(request)
+        urls = body.get("urls") or []
+        playlist_url = body.get("playlist_url")
+        if isinstance(urls, str):
+            urls = [urls]
+        if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            raise JobError("urls must be a list of YouTube URLs", 400)
+
+        # A single url may be a playlist or one more video
+        if body.get("url"):
+            if PLAYLIST_PATTERN.match(body["url"]) and not playlist_url:
+                playlist_url = body["url"]
+            else:
+                urls.insert(0, body["url"])
+
+        if not urls and not playlist_url:
+            raise JobError("Provide urls or a playlist_url", 400)
+        if len(urls) > BATCH_MAX_VIDEOS:
+            raise JobError(f"A batch may contain at most {BATCH_MAX_VIDEOS} videos", 400)
+
+        language, languages = resolve_languages(body.get("language"), body.get("languages"))
+        validate_languages(languages or [language])
+    except JobError as e:
+        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+
+    params = {"urls": urls, "playlist_url": playlist_url, "language": language, "languages": languages}
+    job = job_manager.submit("batch", process_batch_job, params=params, executor=batch_executor, **params)
+    logger.info(f"Queued batch of {len(urls)} videos{' and a playlist' if playlist_url else ''}")
+    return JSONResponse(status_code=202, content=job.to_dict(include_result=False))
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    language: Optional[str] = Form(None),
+    languages: Optional[str] = Form(None)
+):
+    """
+    Queue a summarization job and return its ID immediately.
+    Accepts the same body as /api/summarize.
+    """
+    try:
+        job_kwargs = await prepare_summarize_job(request, file, language, languages)
+    except JobError as e:
+        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+
+    job = submit_summarize_job(job_kwargs)
+    return JSONResponse(status_code=202, content=job.to_dict(include_result=False))
+
+@app.get("/api/jobs")
+async def list_jobs():
+    """
+    List known jobs without their results.
+    """
+    jobs = sorted(job_manager.list(), key=lambda job: job.created_at, reverse=True)
+    return {
+        "jobs": [job.to_dict(include_result=False) for job in jobs],
+        "active": job_manager.active_count()
+    }
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Return the status of a job, including its result once completed.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request, since: int = 0):
+    """
+    Stream a job's progress as Server-Sent Events until it finishes.
+    Reconnecting clients resume after Last-Event-ID (or ?since=).
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def event_stream():
+        backlog, queue = job.subscribe(asyncio.get_running_loop(), since)
+        try:
+            for event in backlog:
+                yield format_sse(event)
+                if event["type"] in TERMINAL_STATUSES:
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+                if event["type"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            job.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancel a job that is still queued.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if not job_manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status} and cannot be cancelled")
+    return job.to_dict(include_result=False)
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}")
@@ -892,23 +955,69 @@ async def global_exception_handler(request, exc):
     )
 
 @app.get("/api/logs")
-async def get_logs():
+async def get_logs(
+    since: int = Query(0, ge=0),
+    job: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=LOG_CAPACITY)
+):
     """
-    Return the most recent logs from the application.
+    Return log records newer than the ``since`` cursor, optionally only those
+    of one job. Pass the returned cursor back as ``since`` to poll for new records.
     """
     try:
-        recent_logs = memory_handler.logs
-        progress_updates = [log for log in recent_logs if "Progress update" in log]
+        entries, cursor = log_store.query(since=since, job_id=job, limit=limit)
+        recent_logs = [format_entry(entry) for entry in entries]
+        progress_updates = [line for entry, line in zip(entries, recent_logs)
+                            if entry["message"].startswith("Progress update")]
         return {
             "logs": recent_logs,
-            "progress": progress_updates[-5:] if progress_updates else [],
+            "entries": entries,
+            "progress": progress_updates[-5:],
             "count": len(recent_logs),
+            "cursor": cursor,
             "last_updated": datetime.now().isoformat()
         }
     except Exception as e:
         logger.error(f"Error retrieving logs: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve logs: {str(e)}")
 
+# Gauges are read when /metrics is scraped, so they cost nothing on the request path
+metrics_registry.register(Gauge(
+    "glimpse_jobs_in_flight", "Summarization jobs queued or running", function=job_manager.active_count
+))
+metrics_registry.register(Gauge(
+    "glimpse_job_queue_depth", "Jobs waiting for a free pipeline worker", function=job_manager.queued_count
+))
+metrics_registry.register(Gauge(
+    "glimpse_model_memory_bytes", "Estimated memory held by each loaded model", ["model"],
+    function=lambda: {(name,): stats["size_bytes"] for name, stats in model_registry.stats().items()}
+))
+metrics_registry.register(Gauge(
+    "glimpse_batch_queue_depth", "Items waiting in each model's micro-batcher", ["batcher"],
+    function=lambda: {
+        (batcher.name,): batcher.stats()["queue_depth"]
+        for batcher in [sentiment_batcher, translation_batcher, *summarizer_batchers.values()]
+    }
+))
+metrics_registry.register(Gauge(
+    "glimpse_uploads_pending", "Audio files waiting for or in the middle of a background storage upload",
+    function=lambda: storage_uploader.stats()["pending"] if storage_uploader else 0
+))
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Pipeline metrics in the Prometheus text format.
+    """
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/translation-memory")
+async def get_translation_memory_stats():
+    """
+    Hit rate and estimated generate time saved by the translation memory.
+    """
+    return translation_memory.stats()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True)
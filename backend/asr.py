@@ -0,0 +1,138 @@
+import time
+import zlib
+import logging
+from typing import Callable, List, Optional
+
+import numpy as np
+import speech_recognition as sr
+
+logger = logging.getLogger(__name__)
+
+# All backends receive 16 kHz mono 16-bit PCM chunks
+ASR_SAMPLE_RATE = 16000
+ASR_SAMPLE_WIDTH = 2
+
+
+def pcm_to_float(chunk: bytes) -> np.ndarray:
+    """
+    Convert 16-bit PCM bytes to float32 samples in [-1, 1]
+    """
+    return np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class ASRBackend:
+    """
+    Base class for speech recognition engines.
+
+    ``batch_size`` is how many chunks are passed to one transcribe_batch call and
+    ``max_workers`` how many of those calls may run in parallel.
+    """
+
+    name = "base"
+    batch_size = 1
+    max_workers = None
+
+    @property
+    def cache_id(self) -> str:
+        """
+        The engine plus any setting that changes its output, for transcript cache keys
+        """
+        return self.name
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+
+class GoogleASRBackend(ASRBackend):
+    """
+    Google Web Speech API through SpeechRecognition, one request per chunk
+    """
+
+    name = "google"
+
+    def __init__(self, language: str = "en-US"):
+        self.language = language
+
+    @property
+    def cache_id(self) -> str:
+        return f"{self.name}:{self.language}"
+        self.recognizer = sr.Recognizer()
+
+    def transcribe_one(self, chunk: bytes) -> Optional[str]:
+        audio_data = sr.AudioData(chunk, ASR_SAMPLE_RATE, ASR_SAMPLE_WIDTH)
+        try:
+            return self.recognizer.recognize_google(audio_data, language=self.language, show_all=False) or None
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            logger.error(f"API Request Error: {e}")
+            return None
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[Optional[str]]:
+        return [self.transcribe_one(chunk) for chunk in chunks]
+
+
+class WhisperASRBackend(ASRBackend):
+    """
+    Local Whisper checkpoint run through transformers. Several chunks are padded
+    to Whisper's 30 s window and decoded in a single batched generate call.
+    """
+
+    name = "local"
+    max_workers = 1  # torch already uses all cores for one batch
+
+    def __init__(self, model_provider: Callable, batch_size: int = 8, model_name: str = ""):
+        # model_provider returns (model, processor), loading it on first use
+        self.model_provider = model_provider
+        self.batch_size = batch_size
+        self.model_name = model_name
+
+    @property
+    def cache_id(self) -> str:
+        return f"{self.name}:{self.model_name}"
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[Optional[str]]:
+        import torch
+
+        loaded = self.model_provider()
+        if loaded is None:
+            raise Exception("Local ASR model is not available")
+        model, processor = loaded
+
+        inputs = processor(
+            [pcm_to_float(chunk) for chunk in chunks],
+            sampling_rate=ASR_SAMPLE_RATE,
+            return_tensors="pt"
+        )
+        with torch.no_grad():
+            generated_ids = model.generate(inputs.input_features, max_new_tokens=220)
+        texts = processor.batch_decode(generated_ids, skip_special_tokens=True)
+        return [text.strip() or None for text in texts]
+
+
+class StubASRBackend(ASRBackend):
+    """
+    Deterministic offline backend for tests and benchmarks. Silent chunks return
+    None; other chunks return pseudo-words derived from the audio content.
+    """
+
+    name = "stub"
+
+    def __init__(self, words_per_second: float = 2.5, latency: float = 0.0, batch_size: int = 1):
+        self.words_per_second = words_per_second
+        self.latency = latency
+        self.batch_size = batch_size
+
+    def transcribe_one(self, chunk: bytes) -> Optional[str]:
+        samples = pcm_to_float(chunk)
+        if samples.size == 0 or float(np.sqrt(np.mean(samples ** 2))) < 1e-3:
+            return None
+        seconds = samples.size / ASR_SAMPLE_RATE
+        seed = zlib.crc32(chunk)
+        count = max(1, int(seconds * self.words_per_second))
+        return " ".join(f"word{(seed + i) % 1000}" for i in range(count))
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[Optional[str]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self.transcribe_one(chunk) for chunk in chunks]
@@ -0,0 +1,146 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Defaults for every batcher: flush at this many items or after this long
+BATCH_MAX_SIZE = int(os.getenv("GLIMPSE_BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("GLIMPSE_BATCH_MAX_WAIT_MS", "20"))
+MICRO_BATCHING_ENABLED = os.getenv("GLIMPSE_MICRO_BATCHING", "true").lower() not in ("0", "false", "no")
+
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads and runs them through
+    ``process_batch`` together.
+
+    A batch is flushed once it holds ``max_batch_size`` items or ``max_wait_ms``
+    after its first item arrived, which bounds the extra latency any single
+    request pays. ``process_batch`` receives a list of items and must return
+    one result per item, in order; an exception instance as a result fails
+    only that item.
+    """
+
+    def __init__(self, name: str, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS,
+                 enabled: bool = MICRO_BATCHING_ENABLED):
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.enabled = enabled
+        self.queue = queue.Queue()
+        self.worker = None
+        self.worker_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self):
+        if self.worker is not None:
+            return
+        with self.worker_lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name=f"batcher-{self.name}", daemon=True)
+                self.worker.start()
+
+    def submit_many(self, items: List[Any]) -> List[Any]:
+        """
+        Queue items and block until all of their results are ready
+        """
+        if not items:
+            return []
+        if not self.enabled:
+            results = self.process_batch(items)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            return results
+
+        self._ensure_worker()
+        futures = []
+        for item in items:
+            future = Future()
+            self.queue.put((item, future))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def submit(self, item: Any) -> Any:
+        return self.submit_many([item])[0]
+
+    def _collect(self):
+        # Block for the first item, then gather more until the batch is full or the wait expires
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+                if len(results) != len(items):
+                    raise Exception(f"Batch for {self.name} returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+            "queue_depth": self.queue.qsize(),
+        }
+
+
+def group_by_key(items: List[Any], key: Callable[[Any], Any]):
+    """
+    Indices of items grouped by key, so items that need different settings
+    (e.g. target language) can share one collection window but run separately
+    """
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append(index)
+    return groups
+
+
+def run_grouped(items: List[Any], key: Callable[[Any], Any],
+                run_group: Callable[[Any, List[Any]], List[Any]]) -> List[Optional[Any]]:
+    """
+    Run each group separately; a failing group fails only its own items
+    """
+    results = [None] * len(items)
+    for group_key, indices in group_by_key(items, key).items():
+        try:
+            group_results = run_group(group_key, [items[i] for i in indices])
+        except Exception as e:
+            group_results = [e] * len(indices)
+        for index, result in zip(indices, group_results):
+            results[index] = result
+    return results
@@ -0,0 +1,104 @@
+"""
+Measure the CPU cost of getting downloaded audio ready for ASR, old format
+against new.
+
+legacy:    bestaudio -> MP3 at 16 kHz (yt-dlp FFmpegExtractAudio) -> decode to PCM
+canonical: bestaudio -> 16 kHz mono FLAC/Opus in one pass -> decode to PCM
+
+The source is synthetic speech-like audio encoded the way YouTube usually
+serves it (48 kHz stereo Opus in WebM). CPU seconds include the ffmpeg child
+processes and are reported per hour of audio, together with the stored size.
+Requires ffmpeg with libmp3lame and libopus.
+
+Usage: python benchmarks/bench_audio_formats.py --minutes 10
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import subprocess
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCHMARK_DIR))
+
+from fixtures import SAMPLE_RATE, synthetic_pcm
+
+os.environ.setdefault("GLIMPSE_PRELOAD_MODELS", "")
+import main
+
+
+def make_source(path, minutes):
+    command = [
+        main.AudioSegment.converter, "-nostdin", "-v", "error", "-y",
+        "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "-",
+        "-ar", "48000", "-ac", "2", "-c:a", "libopus", "-b:a", "128k", path
+    ]
+    subprocess.run(command, input=synthetic_pcm(minutes), check=True)
+
+
+def legacy(source_path, work_dir):
+    # The options yt-dlp passed to ffmpeg for FFmpegExtractAudio(mp3) with -ar 16000
+    mp3_path = os.path.join(work_dir, "legacy.mp3")
+    subprocess.run([main.AudioSegment.converter, "-nostdin", "-v", "error", "-y", "-i", source_path,
+                    "-vn", "-c:a", "libmp3lame", "-q:a", "5", "-ar", "16000", mp3_path], check=True)
+    main.decode_audio_pcm(mp3_path)
+    return mp3_path
+
+
+def canonical(source_path, work_dir):
+    stored_path = main.canonicalize_audio(source_path, os.path.join(work_dir, f"canonical{main.AUDIO_EXT}"))
+    main.decode_audio_pcm(stored_path)
+    return stored_path
+
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def measure(fn, source_path, work_dir, minutes, repeat):
+    cpu, wall = [], []
+    for _ in range(repeat):
+        cpu_before, wall_before = cpu_seconds(), time.perf_counter()
+        stored_path = fn(source_path, work_dir)
+        cpu.append(cpu_seconds() - cpu_before)
+        wall.append(time.perf_counter() - wall_before)
+    per_hour = 60 / minutes
+    return {
+        "cpu_seconds": round(min(cpu), 3),
+        "cpu_seconds_per_audio_hour": round(min(cpu) * per_hour, 2),
+        "wall_seconds": round(min(wall), 3),
+        "stored_bytes": os.path.getsize(stored_path),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=10, help="length of the synthetic audio")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="glimpse_bench_")
+    try:
+        source_path = os.path.join(work_dir, "source.webm")
+        make_source(source_path, args.minutes)
+        results = {
+            "minutes": args.minutes,
+            "format": main.AUDIO_FORMAT,
+            "legacy": measure(legacy, source_path, work_dir, args.minutes, args.repeat),
+            "canonical": measure(canonical, source_path, work_dir, args.minutes, args.repeat),
+        }
+        results["cpu_seconds_saved_per_audio_hour"] = round(
+            results["legacy"]["cpu_seconds_per_audio_hour"] - results["canonical"]["cpu_seconds_per_audio_hour"], 2)
+        print(json.dumps(results, indent=2))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_cli()
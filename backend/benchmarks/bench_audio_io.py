@@ -0,0 +1,104 @@
+"""
+Compare the disk I/O and wall time of the old file-based chunking in
+audio_to_text with the in-memory PCM path. ASR itself is not called.
+
+Usage: python benchmarks/bench_audio_io.py --minutes 10
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+import speech_recognition as sr
+from pydub import AudioSegment
+from pydub.generators import Sine, WhiteNoise
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import decode_audio_pcm, ASR_SAMPLE_RATE, ASR_SAMPLE_WIDTH
+
+CHUNK_MS = 15000
+OVERLAP_MS = 1000
+
+
+def read_proc_io():
+    # Bytes passed through read()/write() by this process (Linux only)
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def make_fixture(path, minutes):
+    tone = Sine(220).to_audio_segment(duration=1000, volume=-20)
+    noise = WhiteNoise().to_audio_segment(duration=1000, volume=-35)
+    second = tone.overlay(noise).set_channels(1)
+    (second * (minutes * 60)).export(path, format="mp3")
+
+
+def chunk_starts(length_ms):
+    return list(range(0, max(length_ms - CHUNK_MS + 1, 1), CHUNK_MS - OVERLAP_MS))
+
+
+def file_based(mp3_path, work_dir):
+    # Mirrors the previous implementation: MP3 -> WAV -> reload -> per-chunk WAV files
+    recognizer = sr.Recognizer()
+    wav_file = os.path.join(work_dir, "full.wav")
+    AudioSegment.from_mp3(mp3_path).export(wav_file, format="wav")
+    audio = AudioSegment.from_wav(wav_file).set_frame_rate(ASR_SAMPLE_RATE)
+    for start in chunk_starts(len(audio)):
+        chunk_path = os.path.join(work_dir, f"chunk_{start}.wav")
+        audio[start:start + CHUNK_MS].export(chunk_path, format="wav")
+        with sr.AudioFile(chunk_path) as source:
+            recognizer.record(source)
+        os.remove(chunk_path)
+    os.remove(wav_file)
+
+
+def in_memory(mp3_path, work_dir):
+    pcm = decode_audio_pcm(mp3_path)
+    bytes_per_ms = ASR_SAMPLE_RATE * ASR_SAMPLE_WIDTH // 1000
+    for start in chunk_starts(len(pcm) // bytes_per_ms):
+        chunk = pcm[start * bytes_per_ms:(start + CHUNK_MS) * bytes_per_ms]
+        sr.AudioData(chunk, ASR_SAMPLE_RATE, ASR_SAMPLE_WIDTH)
+
+
+def measure(fn, mp3_path, work_dir):
+    read_before, written_before = read_proc_io()
+    start = time.perf_counter()
+    fn(mp3_path, work_dir)
+    elapsed = time.perf_counter() - start
+    read_after, written_after = read_proc_io()
+    return {
+        "seconds": round(elapsed, 3),
+        "bytes_read": read_after - read_before,
+        "bytes_written": written_after - written_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=int, default=10, help="length of the synthetic audio")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="glimpse_bench_")
+    try:
+        mp3_path = os.path.join(work_dir, "fixture.mp3")
+        make_fixture(mp3_path, args.minutes)
+        results = {
+            "minutes": args.minutes,
+            "file_based": measure(file_based, mp3_path, work_dir),
+            "in_memory": measure(in_memory, mp3_path, work_dir),
+        }
+        print(json.dumps(results, indent=2))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare summarizing a playlist one video at a time with the pipelined batch
+job behind /api/summarize/batch.
+
+yt_dlp, ASR and the models are stubbed (see benchmarks/stubs.py); download
+and ASR latency are simulated with sleeps so the numbers show how well the
+stages overlap, not how fast the models are.
+
+Usage: python benchmarks/bench_batch.py --videos 20 --download-seconds 1 --asr-seconds 0.5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCHMARK_DIR))
+
+
+def load_api(args):
+    import stubs
+
+    # Every run starts cold: no caches, no storage uploads, no preloaded models
+    os.environ["GLIMPSE_PRELOAD_MODELS"] = ""
+    os.environ["GLIMPSE_TRANSLATION_MEMORY"] = "false"
+    os.environ["GLIMPSE_CACHE_ENABLED"] = "false"
+    os.environ["GLIMPSE_STORAGE_BACKEND"] = "none"
+    os.environ["GLIMPSE_STREAMING"] = "false"
+    os.environ.pop("NEXT_PUBLIC_SUPABASE_URL", None)
+    os.environ["GLIMPSE_BATCH_VIDEO_WORKERS"] = str(args.video_workers)
+    os.environ["GLIMPSE_BATCH_DOWNLOAD_SLOTS"] = str(args.download_slots)
+    os.environ["GLIMPSE_BATCH_TRANSCRIPTION_SLOTS"] = str(args.transcription_slots)
+    os.environ["GLIMPSE_BATCH_SUMMARY_SLOTS"] = str(args.summary_slots)
+
+    stubs.install_module_stubs()
+    stubs.FakeYoutubeDL.download_seconds = args.download_seconds
+    stubs.FakeYoutubeDL.fixture_minutes = args.minutes
+    stubs.FakeYoutubeDL.playlist_size = args.videos
+
+    import main
+    stubs.install_model_stubs(main, asr_latency=args.asr_seconds)
+    stubs.install_decoder_stub(main)
+    import api
+    return main, api
+
+
+def run_serial(api, urls):
+    # One /api/summarize call after another
+    for url in urls:
+        job = api.Job("summarize")
+        api.process_summarize_job(job, url=url, video_id=api.validate_youtube_url(url))
+
+
+def run_batch(api, playlist_url):
+    job = api.Job("batch")
+    result = api.process_batch_job(job, playlist_url=playlist_url)
+    if result["completed"] != result["total"]:
+        failures = [video.get("error") for video in result["videos"] if video["status"] != "completed"]
+        raise Exception(f"Batch finished with failures: {failures[:3]}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--minutes", type=float, default=1, help="length of each synthetic video")
+    parser.add_argument("--download-seconds", type=float, default=1.0, help="simulated download time per video")
+    parser.add_argument("--asr-seconds", type=float, default=0.5, help="simulated ASR time per chunk batch")
+    parser.add_argument("--video-workers", type=int, default=4)
+    parser.add_argument("--download-slots", type=int, default=2)
+    parser.add_argument("--transcription-slots", type=int, default=2)
+    parser.add_argument("--summary-slots", type=int, default=1)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="glimpse_bench_"))
+    main, api = load_api(args)
+    playlist_url = "https://www.youtube.com/playlist?list=PLbenchmark"
+    urls = main.expand_playlist(playlist_url)["urls"]
+
+    start = time.perf_counter()
+    run_serial(api, urls)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    run_batch(api, playlist_url)
+    batch_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "videos": len(urls),
+        "settings": {key: value for key, value in vars(args).items() if key != "videos"},
+        "serial_seconds": round(serial_seconds, 3),
+        "batch_seconds": round(batch_seconds, 3),
+        "speedup": round(serial_seconds / batch_seconds, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,192 @@
+"""
+Compare fp32 and int8 dynamic-quantized CPU inference for each model: load
+time, mean latency over a fixed transcript corpus, resident memory and how
+closely the int8 outputs agree with fp32.
+
+Each (model, mode) pair runs in its own subprocess so RSS figures are not
+polluted by previously loaded models.
+
+Usage: python benchmarks/bench_quantization.py --models sentiment,fallback_summarizer
+       python benchmarks/bench_quantization.py --corpus transcripts/ --output results.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODELS = ["sentiment", "main_summarizer", "fallback_summarizer", "long_summarizer", "translator"]
+
+# Small fixed corpus so runs are comparable between machines and commits
+DEFAULT_CORPUS = [
+    "In this video we look at how solar panels are made, starting from raw silicon. The silicon is melted, "
+    "grown into large crystals and sliced into thin wafers. Each wafer is then treated so that it can turn "
+    "sunlight into electricity, and the finished cells are wired together into panels that are tested before shipping.",
+    "Today I want to talk about budgeting for beginners. The most important step is knowing where your money goes, "
+    "so track every expense for a month. After that, set aside savings first, pay off high interest debt, and only "
+    "then decide how much you can spend on things you enjoy.",
+    "The match was decided in the final minutes. After a slow first half, the home team pressed higher and forced "
+    "several turnovers. A late header from a corner kick gave them the win, and the coach praised the defence for "
+    "keeping the visitors to just two shots on target.",
+    "This tutorial explains how to set up a Python virtual environment. We create it with the venv module, activate it, "
+    "and install packages with pip. Keeping dependencies isolated per project avoids version conflicts and makes it "
+    "easy to reproduce the same setup on another machine.",
+]
+
+
+def read_rss_bytes():
+    # Current resident set size of this process (Linux only)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def load_corpus(path):
+    if not path:
+        return DEFAULT_CORPUS
+    files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".txt"))
+    corpus = []
+    for file_path in files:
+        with open(file_path) as f:
+            corpus.append(f.read())
+    return corpus
+
+
+def token_f1(a, b):
+    """
+    Bag-of-words F1 between two outputs, 1.0 for identical text
+    """
+    tokens_a, tokens_b = a.lower().split(), b.lower().split()
+    if not tokens_a or not tokens_b:
+        return float(tokens_a == tokens_b)
+    counts = {}
+    for token in tokens_a:
+        counts[token] = counts.get(token, 0) + 1
+    common = 0
+    for token in tokens_b:
+        if counts.get(token, 0) > 0:
+            counts[token] -= 1
+            common += 1
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(tokens_b), common / len(tokens_a)
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_model(name, loaded, text):
+    import torch
+    import main
+
+    if name == "sentiment":
+        return loaded(text, truncation=True)[0]["label"]
+    if name in ("main_summarizer", "fallback_summarizer"):
+        return loaded(text, max_length=120, min_length=20, do_sample=False, truncation=True)[0]["summary_text"]
+    if name == "long_summarizer":
+        model, tokenizer = loaded
+        inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=4096)
+        with torch.no_grad():
+            output = model.generate(inputs.input_ids, max_length=120, min_length=20, num_beams=2)
+        return tokenizer.decode(output[0], skip_special_tokens=True)
+    if name == "translator":
+        model, tokenizer = loaded
+        sentences = [s for _, line in main.split_for_translation(text) for s in line]
+        return " ".join(result["hi"] for result in main.translate_sentences(model, tokenizer, sentences, ["hi"]))
+    raise Exception(f"Unknown model: {name}")
+
+
+def worker(name, mode, corpus):
+    import torch
+    import main
+    from quantization import quantize_loaded
+
+    torch.set_num_threads(int(os.getenv("GLIMPSE_BENCH_THREADS", str(torch.get_num_threads()))))
+    loaders = {
+        "sentiment": main.load_sentiment,
+        "main_summarizer": main.load_main_summarizer,
+        "fallback_summarizer": main.load_fallback_summarizer,
+        "long_summarizer": main.load_long_summarizer,
+        "translator": main.load_translator,
+    }
+
+    rss_before = read_rss_bytes()
+    start = time.perf_counter()
+    loaded = loaders[name]()
+    if mode == "int8":
+        loaded = quantize_loaded(loaded)
+    load_seconds = time.perf_counter() - start
+
+    # One warm-up call so lazy initialisation is not timed
+    run_model(name, loaded, corpus[0])
+    latencies, outputs = [], []
+    for text in corpus:
+        start = time.perf_counter()
+        outputs.append(run_model(name, loaded, text))
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "model": name,
+        "mode": mode,
+        "load_seconds": round(load_seconds, 2),
+        "mean_latency_seconds": round(sum(latencies) / len(latencies), 3),
+        "rss_mb": round((read_rss_bytes() - rss_before) / (1024 * 1024), 1),
+        "outputs": outputs,
+    }
+
+
+def compare(fp32, int8):
+    if fp32["model"] == "sentiment":
+        agreement = sum(a == b for a, b in zip(fp32["outputs"], int8["outputs"])) / len(fp32["outputs"])
+    else:
+        agreement = sum(token_f1(a, b) for a, b in zip(fp32["outputs"], int8["outputs"])) / len(fp32["outputs"])
+    return {
+        "model": fp32["model"],
+        "speedup": round(fp32["mean_latency_seconds"] / max(int8["mean_latency_seconds"], 1e-9), 2),
+        "rss_saved_mb": round(fp32["rss_mb"] - int8["rss_mb"], 1),
+        "agreement": round(agreement, 3),
+        "fp32": {k: v for k, v in fp32.items() if k != "outputs"},
+        "int8": {k: v for k, v in int8.items() if k != "outputs"},
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", default=",".join(MODELS))
+    parser.add_argument("--corpus", help="Directory of .txt transcripts (defaults to a built-in corpus)")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("MODEL", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    corpus = load_corpus(args.corpus)
+
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], args.worker[1], corpus)))
+        return
+
+    results = []
+    for name in [m.strip() for m in args.models.split(",") if m.strip()]:
+        runs = {}
+        for mode in ("fp32", "int8"):
+            command = [sys.executable, os.path.abspath(__file__), "--worker", name, mode]
+            if args.corpus:
+                command += ["--corpus", args.corpus]
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            runs[mode] = json.loads(output.strip().splitlines()[-1])
+        results.append(compare(runs["fp32"], runs["int8"]))
+        print(json.dumps(results[-1]), file=sys.stderr)
+
+    report = json.dumps({"corpus_size": len(corpus), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,92 @@
+"""
+Measure translate_text throughput with 1, 8 and 32 concurrent requests.
+
+By default the real M2M100 model is used. --stub swaps in a fake translator
+whose generate cost grows with the padded batch shape, which is enough to
+compare batching settings without downloading the model.
+
+Usage: python benchmarks/bench_translation.py --stub --requests 64
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Every request has to reach the model; the translation memory would answer
+# repeats of the sample from SQLite (and write to the real database)
+os.environ["GLIMPSE_TRANSLATION_MEMORY"] = "false"
+
+from main import translate_text, model_registry, translation_batcher
+
+SAMPLE_SUMMARY = """Key Points:
+
+• The speaker introduces the history of renewable energy and why costs have fallen so quickly.
+• Solar panels became cheaper through manufacturing scale.
+• Wind power is now competitive in most markets. Storage remains the main open problem.
+• Policy support mattered early on, but markets now drive most new installations."""
+
+
+class StubTokenizer:
+    def __call__(self, texts, return_tensors=None, padding=False, truncation=False, max_length=None):
+        ids = [[1] * min(len(text.split()) + 2, max_length or 10**6) for text in texts]
+        if padding:
+            width = max(len(row) for row in ids)
+            ids = [row + [0] * (width - len(row)) for row in ids]
+        return {"input_ids": ids, "attention_mask": [[int(token != 0) for token in row] for row in ids]}
+
+    def get_lang_id(self, code):
+        return 0
+
+    def batch_decode(self, generated, skip_special_tokens=True):
+        return generated
+
+
+class StubModel:
+    # Costs scale with the padded batch shape; decoding dominates, as with the real model
+    def get_encoder(self):
+        def encode(input_ids, attention_mask):
+            time.sleep(0.005 + 0.00005 * len(input_ids) * len(input_ids[0]))
+            return type("EncoderOutput", (), {"last_hidden_state": input_ids})()
+        return encode
+
+    def generate(self, attention_mask, encoder_outputs, forced_bos_token_id=None, max_new_tokens=None):
+        time.sleep(0.02 + 0.0002 * len(attention_mask) * len(attention_mask[0]))
+        return [f"[translated {len(row)} tokens]" for row in attention_mask]
+
+
+def run(concurrency, total_requests, language_code):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: translate_text(SAMPLE_SUMMARY, language_code), range(total_requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total_requests / elapsed, 2),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--language", default="hi")
+    parser.add_argument("--stub", action="store_true")
+    args = parser.parse_args()
+
+    if args.stub:
+        model_registry.register("translator", lambda: (StubModel(), StubTokenizer()))
+
+    # Warm up so model loading is not counted
+    translate_text(SAMPLE_SUMMARY, args.language)
+
+    results = [run(concurrency, max(args.requests, concurrency), args.language) for concurrency in (1, 8, 32)]
+    print(json.dumps({"results": results, "batcher": translation_batcher.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
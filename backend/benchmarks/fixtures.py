@@ -0,0 +1,87 @@
+"""
+Deterministic synthetic inputs for the benchmarks: speech-like PCM audio and
+transcript text of a given length in minutes.
+"""
+import os
+import wave
+import random
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+WORDS_PER_MINUTE = 150
+
+VOCABULARY = (
+    "the video shows how we can build a simple model that learns from data and then we test it on new "
+    "examples to see whether the results hold up when conditions change over time because real systems "
+    "are noisy and people often forget to measure what actually matters for their users"
+).split()
+
+# Phrases that extract_key_information looks for, mixed in so that path does real work
+KEY_PHRASES = [
+    "The main points are these.",
+    "In summary, the approach works well.",
+    "To summarize what we covered so far.",
+    "The benefits of this method are clear.",
+    "Key takeaways include the following ideas.",
+]
+
+
+def synthetic_pcm(minutes: float, seed: int = 0) -> bytes:
+    """
+    16 kHz mono 16-bit PCM alternating voiced bursts (a few harmonics with a
+    syllable-rate envelope plus noise) and pauses of varying length
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    samples = np.zeros(total, dtype=np.float32)
+    position = 0
+    while position < total:
+        burst = int(rng.uniform(1.5, 8.0) * SAMPLE_RATE)
+        end = min(position + burst, total)
+        t = np.arange(end - position) / SAMPLE_RATE
+        pitch = rng.uniform(100, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in (1, 2, 3))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 5) * t) ** 2
+        samples[position:end] = 0.2 * voiced * envelope + 0.01 * rng.standard_normal(end - position)
+        position = end + int(rng.uniform(0.2, 1.5) * SAMPLE_RATE)
+    # Low background noise everywhere, including the pauses
+    samples += 0.002 * rng.standard_normal(total).astype(np.float32)
+    return (np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes()
+
+
+def write_wav(path: str, pcm: bytes, sample_rate: int = SAMPLE_RATE):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm)
+
+
+def audio_fixture(directory: str, minutes: float, seed: int = 0) -> str:
+    """
+    Path to a WAV fixture of the given length, generated once per directory
+    """
+    path = os.path.join(directory, f"speech_{minutes:g}min_{seed}.wav")
+    if not os.path.exists(path):
+        write_wav(path, synthetic_pcm(minutes, seed))
+    return path
+
+
+def synthetic_transcript(minutes: float, seed: int = 0) -> str:
+    """
+    Punctuated transcript text at a typical speaking rate
+    """
+    rng = random.Random(seed)
+    words_left = int(minutes * WORDS_PER_MINUTE)
+    sentences = []
+    while words_left > 0:
+        if rng.random() < 0.05:
+            sentence = rng.choice(KEY_PHRASES)
+        else:
+            length = rng.randint(6, 22)
+            words = [rng.choice(VOCABULARY) for _ in range(length)]
+            sentence = " ".join(words).capitalize() + rng.choice([".", ".", ".", "?", "!"])
+        sentences.append(sentence)
+        words_left -= len(sentence.split())
+    return " ".join(sentences)
@@ -0,0 +1,188 @@
+"""
+Per-stage benchmark suite for the summarization pipeline.
+
+Times audio_to_text, summarize_text, map_reduce_summarize,
+extract_key_information, format_summary and translate_text on synthetic
+1, 10 and 60 minute inputs. By default yt_dlp, Supabase, Google ASR and the
+Hugging Face models are replaced by the stubs in benchmarks/stubs.py, so the
+numbers measure the pipeline's own code. --real-models loads the real CPU
+models instead (slow; use --sizes 1).
+
+Results are written as JSON, one file per run, and --compare reports the
+change against an earlier file.
+
+Usage: python benchmarks/run_benchmarks.py
+       python benchmarks/run_benchmarks.py --stages summarize_text --sizes 1,10 --repeat 5
+       python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCHMARK_DIR))
+
+from fixtures import audio_fixture, synthetic_transcript
+
+STAGES = ["audio_to_text", "summarize_text", "map_reduce_summarize", "extract_key_information",
+          "format_summary", "translate_text"]
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCHMARK_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_pipeline(real_models, asr_backend):
+    """
+    Import main with the requested stubs in place and return it
+    """
+    import stubs
+
+    # Keep runs independent of local configuration and earlier runs
+    os.environ["GLIMPSE_PRELOAD_MODELS"] = ""
+    os.environ["GLIMPSE_TRANSLATION_MEMORY"] = "false"
+    os.environ["GLIMPSE_STORAGE_BACKEND"] = "none"
+    os.environ.pop("NEXT_PUBLIC_SUPABASE_URL", None)
+    os.environ["GLIMPSE_ASR_BACKEND"] = asr_backend
+
+    stubbed_modules = stubs.install_module_stubs(None if not real_models else ["yt_dlp", "supabase"])
+    import main
+
+    if not real_models:
+        stubs.install_model_stubs(main)
+    ffmpeg = shutil.which(main.AudioSegment.converter) is not None
+    if not ffmpeg:
+        stubs.install_decoder_stub(main)
+    environment = {
+        "stubbed_modules": stubbed_modules,
+        "models": "real" if real_models else "stub",
+        "asr_backend": asr_backend,
+        "decoder": "ffmpeg" if ffmpeg else "wav-stub",
+    }
+    return main, environment
+
+
+def stage_runners(main, fixture_dir):
+    """
+    Map each stage to (setup(minutes) -> input, run(input) -> output)
+    """
+    summary_cache = {}
+
+    def summary_for(minutes):
+        # translate_text and format_summary work on summaries, not transcripts
+        if minutes not in summary_cache:
+            summary_cache[minutes] = main.summarize_text(synthetic_transcript(minutes))
+        return summary_cache[minutes]
+
+    return {
+        "audio_to_text": (lambda minutes: audio_fixture(fixture_dir, minutes), main.audio_to_text),
+        "summarize_text": (synthetic_transcript, main.summarize_text),
+        "map_reduce_summarize": (synthetic_transcript, main.map_reduce_summarize),
+        "extract_key_information": (synthetic_transcript, main.extract_key_information),
+        # Unbulleted prose exercises the sentence-splitting path
+        "format_summary": (lambda minutes: summary_for(minutes).replace("• ", "").replace("\n", " "),
+                           main.format_summary),
+        "translate_text": (summary_for, lambda summary: main.translate_text(summary, "hi")),
+    }
+
+
+def measure(run, value, repeat):
+    # One untimed call so lazy model loading and warm-up are not counted
+    run(value)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(value)
+        timings.append(time.perf_counter() - start)
+    return {
+        "min_seconds": round(min(timings), 6),
+        "median_seconds": round(statistics.median(timings), 6),
+        "mean_seconds": round(statistics.mean(timings), 6),
+        "stdev_seconds": round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def compare(current, baseline_path, threshold):
+    """
+    Print the median change per stage and size; return the number of regressions
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["stage"], r["minutes"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"Compared with {baseline.get('commit')} ({baseline_path}):")
+    for result in current["results"]:
+        old = previous.get((result["stage"], result["minutes"]))
+        if not old:
+            continue
+        ratio = result["median_seconds"] / max(old["median_seconds"], 1e-9)
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"  {result['stage']:<24} {result['minutes']:>4g} min  "
+              f"{old['median_seconds']:.4f}s -> {result['median_seconds']:.4f}s  ({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--sizes", default="1,10,60", help="Input lengths in minutes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--real-models", action="store_true", help="Use the real CPU models instead of stubs")
+    parser.add_argument("--asr", default="google", help="ASR backend name; google is stubbed unless --real-models")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    main, environment = load_pipeline(args.real_models, args.asr)
+    fixture_dir = os.path.join(tempfile.gettempdir(), "glimpse-bench-fixtures")
+    os.makedirs(fixture_dir, exist_ok=True)
+    runners = stage_runners(main, fixture_dir)
+
+    results = []
+    for stage in [s.strip() for s in args.stages.split(",") if s.strip()]:
+        setup, run = runners[stage]
+        for minutes in [float(m) for m in args.sizes.split(",")]:
+            value = setup(minutes)
+            result = {"stage": stage, "minutes": minutes, **measure(run, value, args.repeat)}
+            results.append(result)
+            print(f"{stage:<24} {minutes:>4g} min  median {result['median_seconds']:.4f}s", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "environment": environment,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}-{int(report['timestamp'])}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}", file=sys.stderr)
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
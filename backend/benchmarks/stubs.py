@@ -0,0 +1,328 @@
+"""
+Lightweight stand-ins for the heavy or networked dependencies of main.py, so
+the pipeline stages can be benchmarked without model downloads, GPUs or
+network access.
+
+install_module_stubs() must run before ``import main``; it fakes only the
+modules it is asked to (or that are not installed). install_model_stubs()
+then swaps the registered models and ASR backends for deterministic fakes.
+"""
+import os
+import sys
+import time
+import zlib
+import types
+import shutil
+import threading
+import contextlib
+import importlib.util
+
+
+# --- Fake modules -----------------------------------------------------------
+
+def _torch_stub():
+    torch = types.ModuleType("torch")
+    torch.cuda = types.SimpleNamespace(is_available=lambda: False)
+    torch.no_grad = contextlib.nullcontext
+    torch.nn = types.SimpleNamespace(Module=type("Module", (), {}), Linear=type("Linear", (), {}))
+    torch.qint8 = "qint8"
+    torch.quantization = types.SimpleNamespace(quantize_dynamic=lambda module, *args, **kwargs: module)
+    torch.get_num_threads = lambda: 1
+    torch.set_num_threads = lambda n: None
+    return {"torch": torch}
+
+
+def _transformers_stub():
+    transformers = types.ModuleType("transformers")
+
+    def unavailable(*args, **kwargs):
+        raise Exception("transformers is stubbed; register a model stub instead")
+
+    loader = types.SimpleNamespace(from_pretrained=unavailable)
+    transformers.pipeline = unavailable
+    for name in ("M2M100ForConditionalGeneration", "M2M100Tokenizer", "AutoTokenizer", "AutoModelForSeq2SeqLM",
+                 "WhisperProcessor", "WhisperForConditionalGeneration"):
+        setattr(transformers, name, loader)
+
+    modeling_outputs = types.ModuleType("transformers.modeling_outputs")
+    modeling_outputs.BaseModelOutput = lambda last_hidden_state: types.SimpleNamespace(last_hidden_state=last_hidden_state)
+    transformers.modeling_outputs = modeling_outputs
+    return {"transformers": transformers, "transformers.modeling_outputs": modeling_outputs}
+
+
+def _matplotlib_stub():
+    matplotlib = types.ModuleType("matplotlib")
+    matplotlib.use = lambda backend: None
+    pyplot = types.ModuleType("matplotlib.pyplot")
+    matplotlib.pyplot = pyplot
+    return {"matplotlib": matplotlib, "matplotlib.pyplot": pyplot}
+
+
+class FakeYoutubeDL:
+    """
+    yt_dlp.YoutubeDL replacement that never touches the network. Downloads
+    write a synthetic WAV fixture after download_seconds; flat extraction
+    returns a playlist of playlist_size videos.
+    """
+
+    download_seconds = 0.0
+    fixture_minutes = 1
+    playlist_size = 20
+
+    def __init__(self, options=None):
+        self.options = options or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=True):
+        if self.options.get("extract_flat"):
+            return {"id": "PLbenchmark", "title": "Benchmark playlist",
+                    "entries": [{"id": f"bench{i:06d}", "ie_key": "Youtube"} for i in range(self.playlist_size)]}
+
+        video_id = url.split("v=")[-1][:11] if "v=" in url else "benchmark"
+        info = {"id": video_id, "title": f"Benchmark video {video_id}", "duration": self.fixture_minutes * 60,
+                "thumbnails": [{"url": "https://example.invalid/thumb.jpg", "height": 720, "width": 1280}]}
+        if download:
+            from fixtures import synthetic_pcm, write_wav
+
+            time.sleep(self.download_seconds)
+            path = self.options.get("outtmpl", "%(id)s.%(ext)s") % {"id": video_id, "ext": "wav"}
+            write_wav(path, synthetic_pcm(self.fixture_minutes, seed=zlib.crc32(video_id.encode())))
+            info["requested_downloads"] = [{"filepath": path}]
+        return info
+
+    def download(self, urls):
+        return 0
+
+
+def _yt_dlp_stub():
+    yt_dlp = types.ModuleType("yt_dlp")
+    yt_dlp.YoutubeDL = FakeYoutubeDL
+    return {"yt_dlp": yt_dlp}
+
+
+class FakeBucket:
+    """
+    Storage bucket that merges upload options over the defaults the way
+    storage3 0.5 (supabase 1.0.3) does, so a file only gets overwritten
+    when x-upsert is "true"
+    """
+
+    DEFAULT_FILE_OPTIONS = {"cache-control": "3600", "content-type": "text/plain;charset=UTF-8", "x-upsert": "false"}
+
+    def __init__(self, files, uploads=None):
+        self.files = files
+        self.uploads = uploads if uploads is not None else []
+
+    def upload(self, path, file, file_options=None):
+        headers = {**self.DEFAULT_FILE_OPTIONS, **(file_options or {})}
+        self.uploads.append({"path": path, "headers": headers})
+        if path in self.files and headers["x-upsert"] != "true":
+            raise Exception({"statusCode": 400, "error": "Duplicate", "message": "The resource already exists"})
+        self.files[path] = file.read() if hasattr(file, "read") else file
+        return {"Key": path}
+
+    def download(self, path):
+        return self.files[path]
+
+    def get_public_url(self, path):
+        return f"https://storage.invalid/{path}"
+
+
+class FakeSupabase:
+    """
+    In-memory Supabase client with just the storage calls the backend uses
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.uploads = []
+        self.storage = self
+
+    def list_buckets(self):
+        return [types.SimpleNamespace(name=name) for name in self.buckets]
+
+    def create_bucket(self, name, options=None):
+        self.buckets.setdefault(name, {})
+
+    def from_(self, name):
+        return FakeBucket(self.buckets.setdefault(name, {}), self.uploads)
+
+
+def _supabase_stub():
+    supabase = types.ModuleType("supabase")
+    supabase.Client = FakeSupabase
+    supabase.create_client = lambda url, key: FakeSupabase()
+    return {"supabase": supabase}
+
+
+MODULE_STUBS = {
+    "torch": _torch_stub,
+    "transformers": _transformers_stub,
+    "matplotlib": _matplotlib_stub,
+    "yt_dlp": _yt_dlp_stub,
+    "supabase": _supabase_stub,
+}
+
+
+def install_module_stubs(names=None):
+    """
+    Fake the given modules, or by default those that are not installed plus
+    the networked ones (yt_dlp, supabase). Returns the names that were stubbed.
+    """
+    if names is None:
+        names = [name for name in MODULE_STUBS if importlib.util.find_spec(name) is None]
+        names += [name for name in ("yt_dlp", "supabase") if name not in names]
+    for name in names:
+        sys.modules.update(MODULE_STUBS[name]())
+    return list(names)
+
+
+# --- Fake models ------------------------------------------------------------
+
+class WordTokenizer:
+    """
+    Whitespace tokenizer with a growing vocabulary, enough for token counting,
+    truncation, padding and round-trip decoding
+    """
+
+    model_max_length = 1024
+    pad_token_id = 0
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = {}
+        self.words = ["<pad>"]
+
+    def token_id(self, word):
+        with self.lock:
+            if word not in self.ids:
+                self.ids[word] = len(self.words)
+                self.words.append(word)
+            return self.ids[word]
+
+    def encode_one(self, text, truncation=False, max_length=None):
+        ids = [self.token_id(word) for word in text.split()]
+        if truncation:
+            ids = ids[:max_length or self.model_max_length]
+        return ids
+
+    def __call__(self, texts, add_special_tokens=True, return_tensors=None, padding=False,
+                 truncation=False, max_length=None):
+        single = isinstance(texts, str)
+        rows = [self.encode_one(text, truncation, max_length) for text in ([texts] if single else texts)]
+        if padding:
+            width = max(len(row) for row in rows)
+            rows = [row + [self.pad_token_id] * (width - len(row)) for row in rows]
+        masks = [[int(token != self.pad_token_id) for token in row] for row in rows]
+        if single and not return_tensors:
+            return {"input_ids": rows[0], "attention_mask": masks[0]}
+        return {"input_ids": rows, "attention_mask": masks}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(self.words[i] for i in ids if i != self.pad_token_id)
+
+    def batch_decode(self, rows, skip_special_tokens=True):
+        return [self.decode(row) for row in rows]
+
+    def get_lang_id(self, code):
+        return self.token_id(f"[{code}]")
+
+
+def leading_words(tokenizer, text, max_length):
+    # Extractive "summary": the first max_length tokens after the instruction prompt
+    body = text.split(": ", 1)[-1]
+    return tokenizer.decode(tokenizer.encode_one(body, truncation=True, max_length=max_length))
+
+
+class FakeSummarizer:
+    """
+    Callable like a transformers summarization pipeline
+    """
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer or WordTokenizer()
+        self.model = None
+
+    def __call__(self, texts, max_length=142, batch_size=None, **kwargs):
+        single = isinstance(texts, str)
+        outputs = [[{"summary_text": leading_words(self.tokenizer, text, max_length)}]
+                   for text in ([texts] if single else texts)]
+        return outputs[0] if single else outputs
+
+
+class FakeSentiment:
+    LABELS = ["LABEL_0", "LABEL_1", "LABEL_2"]
+
+    def __init__(self):
+        self.tokenizer = WordTokenizer()
+        self.model = None
+
+    def __call__(self, texts, batch_size=None, truncation=False, **kwargs):
+        results = [{"label": self.LABELS[len(text.split()) % 3], "score": 0.9}
+                   for text in ([texts] if isinstance(texts, str) else texts)]
+        return results
+
+
+class FakeSeq2Seq:
+    """
+    Encoder-decoder stand-in for LED and M2M100: "generates" the leading input tokens
+    """
+
+    def get_encoder(self):
+        return lambda input_ids, attention_mask=None: types.SimpleNamespace(last_hidden_state=input_ids)
+
+    def generate(self, input_ids=None, attention_mask=None, encoder_outputs=None, forced_bos_token_id=None,
+                 max_length=None, max_new_tokens=None, **kwargs):
+        rows = input_ids if input_ids is not None else encoder_outputs.last_hidden_state
+        limit = max_new_tokens or max_length or 200
+        prefix = [forced_bos_token_id] if forced_bos_token_id is not None else []
+        return [prefix + [token for token in row if token][:limit] for row in rows]
+
+
+def install_model_stubs(main, asr_latency=0.0):
+    """
+    Register fake models with main's model registry and use the stub ASR
+    backend in place of the Google Web Speech API
+    """
+    from asr import StubASRBackend
+
+    main.model_registry.register("main_summarizer", FakeSummarizer)
+    main.model_registry.register("fallback_summarizer", FakeSummarizer)
+    main.model_registry.register("summary_tokenizer", WordTokenizer)
+    main.model_registry.register("sentiment", FakeSentiment)
+    main.model_registry.register("long_summarizer", lambda: (FakeSeq2Seq(), WordTokenizer()))
+    main.model_registry.register("translator", lambda: (FakeSeq2Seq(), WordTokenizer()))
+
+    main.asr_backend_factories["google"] = lambda: StubASRBackend(latency=asr_latency)
+    main.asr_backends.clear()
+
+
+def read_wav_pcm(audio_file, sample_rate=16000):
+    """
+    decode_audio_pcm replacement for machines without ffmpeg; reads the WAV fixtures as-is
+    """
+    import wave
+
+    with wave.open(audio_file, "rb") as f:
+        if f.getframerate() != sample_rate or f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise Exception(f"WAV stub decoder needs 16-bit mono {sample_rate} Hz input: {audio_file}")
+        return f.readframes(f.getnframes())
+
+
+def install_decoder_stub(main):
+    """
+    Replace the ffmpeg decode and canonicalize steps. The WAV fixtures are
+    already 16 kHz mono, so canonicalizing one is a plain copy.
+    """
+    def copy_canonical(source_path, output_path=None):
+        output_path = output_path or f"{os.path.splitext(source_path)[0]}.canonical{main.AUDIO_EXT}"
+        shutil.copyfile(source_path, output_path)
+        return output_path
+
+    main.decode_audio_pcm = read_wav_pcm
+    main.canonicalize_audio = copy_canonical
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Cache configuration (overridable through the environment)
+CACHE_DIR = os.getenv("GLIMPSE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+CACHE_MEMORY_MAX_BYTES = int(os.getenv("GLIMPSE_CACHE_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_DISK_MAX_BYTES = int(os.getenv("GLIMPSE_CACHE_DISK_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+METADATA_TTL_SECONDS = float(os.getenv("GLIMPSE_METADATA_TTL_SECONDS", str(6 * 60 * 60)))
+METADATA_MAX_ENTRIES = int(os.getenv("GLIMPSE_METADATA_MAX_ENTRIES", "1024"))
+CACHE_ENABLED = os.getenv("GLIMPSE_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Read files in 1 MB blocks when hashing so large audio never sits in memory
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+# Hashing helpers used to build stage keys
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_config(config: dict) -> str:
+    return hash_text(json.dumps(config, sort_keys=True))
+
+
+def _value_size(value: Any) -> int:
+    """
+    Approximate the memory footprint of a JSON-serializable value
+    """
+    return len(json.dumps(value))
+
+
+class MemoryTier:
+    """
+    In-memory LRU tier bounded by the approximate size of the stored values
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key: str, value: Any):
+        size = _value_size(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.current_bytes += size
+            # Evict least recently used entries until we are back under budget
+            while self.current_bytes > self.max_bytes and self.entries:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def delete(self, key: str):
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+
+
+class DiskTier:
+    """
+    On-disk tier bounded by total file size, evicting least recently accessed files
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self.current_bytes = sum(size for _, size, _ in self._scan())
+
+    def _scan(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def path_for(self, stage: str, key: str, ext: str = "") -> str:
+        stage_dir = os.path.join(self.root, stage)
+        os.makedirs(stage_dir, exist_ok=True)
+        return os.path.join(stage_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ext)
+
+    def touch(self, path: str) -> bool:
+        # The modification time doubles as the last access time for eviction
+        try:
+            os.utime(path, None)
+            return True
+        except OSError:
+            return False
+
+    def added(self, path: str):
+        with self.lock:
+            self.current_bytes += os.path.getsize(path)
+            if self.current_bytes > self.max_bytes:
+                self._evict(keep=path)
+
+    def remove(self, path: str):
+        with self.lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self.current_bytes -= size
+            except OSError:
+                pass
+
+    def _evict(self, keep: str):
+        for path, size, _ in sorted(self._scan(), key=lambda entry: entry[2]):
+            if self.current_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                self.current_bytes -= size
+                logger.info(f"Evicted cached artifact: {path}")
+            except OSError as e:
+                logger.warning(f"Failed to evict cached artifact {path}: {str(e)}")
+
+
+class ExpiringCache:
+    """
+    Small in-memory LRU whose entries expire after a fixed time, for values
+    such as video metadata that can change upstream
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled and ttl_seconds > 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any):
+        if not self.enabled or value is None:
+            return
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class StageCache:
+    """
+    Two-tier cache for pipeline stage outputs.
+
+    JSON values (transcripts, summaries, translations) live in both tiers,
+    audio files live on disk only and are returned as paths.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, memory_max_bytes: int = CACHE_MEMORY_MAX_BYTES,
+                 disk_max_bytes: int = CACHE_DISK_MAX_BYTES, enabled: bool = CACHE_ENABLED):
+        self.enabled = enabled
+        self.memory = MemoryTier(memory_max_bytes)
+        self.disk = DiskTier(root, disk_max_bytes) if enabled else None
+
+    @staticmethod
+    def _key(stage: str, key: str) -> str:
+        return f"{stage}:{key}"
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        full_key = self._key(stage, key)
+        value = self.memory.get(full_key)
+        if value is not None:
+            return value
+
+        path = self.disk.path_for(stage, key, ".json")
+        if not self.disk.touch(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+            self.disk.remove(path)
+            return None
+        # Promote disk hits into the memory tier
+        self.memory.put(full_key, value)
+        return value
+
+    def put(self, stage: str, key: str, value: Any):
+        if not self.enabled or value is None:
+            return
+        self.memory.put(self._key(stage, key), value)
+
+        path = self.disk.path_for(stage, key, ".json")
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            self.disk.remove(path)
+            os.replace(tmp_path, path)
+            self.disk.added(path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry for {stage}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_file(self, stage: str, key: str, ext: str = "") -> Optional[str]:
+        if not self.enabled:
+            return None
+        path = self.disk.path_for(stage, key, ext)
+        return path if self.disk.touch(path) else None
+
+    def put_file(self, stage: str, key: str, src_path: str) -> Optional[str]:
+        """
+        Copy a file artifact into the disk tier and return its cached path
+        """
+        if not self.enabled:
+            return None
+        path = self.disk.path_for(stage, key, os.path.splitext(src_path)[1])
+        try:
+            self.disk.remove(path)
+            shutil.copyfile(src_path, path)
+            self.disk.added(path)
+            return path
+        except OSError as e:
+            logger.warning(f"Failed to cache file for {stage}: {str(e)}")
+            return None
+
+
+# Shared cache used by the API pipeline
+artifact_cache = StageCache()
+
+# Video titles and thumbnails by video ID, so repeat requests skip the extractor
+metadata_cache = ExpiringCache(METADATA_TTL_SECONDS, METADATA_MAX_ENTRIES, enabled=CACHE_ENABLED)
@@ -0,0 +1,218 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+from log_store import current_job_id
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Number of pipelines that may run at once and how long finished jobs are kept
+JOB_WORKERS = int(os.getenv("GLIMPSE_JOB_WORKERS", "2"))
+JOB_RESULT_TTL = float(os.getenv("GLIMPSE_JOB_RESULT_TTL", "3600"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+TERMINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobError(Exception):
+    """
+    Raised by job functions to fail a job with a specific HTTP status code
+    """
+
+    def __init__(self, detail: str, status_code: int = 500):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class Job:
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.params = params or {}
+        self.status = JOB_QUEUED
+        self.result = None
+        self.error = None
+        self.status_code = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.progress = 0.0
+        self.stage = None
+        self.events = []
+        self.subscribers = []
+        self.events_lock = threading.Lock()
+        # Jobs started on behalf of this one, e.g. the videos of a batch
+        self.children: List["Job"] = []
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def publish(self, event_type: str, **data):
+        """
+        Record an event for this job and push it to any live subscribers
+        """
+        with self.events_lock:
+            event = {"id": len(self.events) + 1, "type": event_type, "timestamp": time.time(), **data}
+            self.events.append(event)
+            subscribers = list(self.subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        return event
+
+    def report(self, stage: str, progress: float, message: Optional[str] = None):
+        # Progress never moves backwards, even if stages report out of order
+        self.progress = max(self.progress, min(progress, 100.0))
+        self.stage = stage
+        return self.publish("progress", stage=stage, progress=round(self.progress, 1), message=message)
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop, since: int = 0):
+        """
+        Return the events after ``since`` and a queue that receives new ones.
+        Both are taken under the same lock so no event is missed or duplicated.
+        """
+        queue = asyncio.Queue()
+        with self.events_lock:
+            backlog = self.events[since:]
+            self.subscribers.append((loop, queue))
+        return backlog, queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self.events_lock:
+            self.subscribers = [(loop, q) for loop, q in self.subscribers if q is not queue]
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 1),
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == JOB_FAILED:
+            data["error"] = {"detail": self.error, "status_code": self.status_code}
+        if include_result and self.status == JOB_COMPLETED:
+            data["result"] = self.result
+        if self.children:
+            children = list(self.children)
+            data["children"] = [child.to_dict(include_result=False) for child in children]
+            data["children_by_status"] = {
+                status: sum(1 for child in children if child.status == status)
+                for status in (JOB_QUEUED, JOB_RUNNING, *TERMINAL_STATUSES)
+            }
+        return data
+
+
+class JobManager:
+    """
+    Runs blocking pipeline functions on a dedicated executor and tracks their state
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, result_ttl: float = JOB_RESULT_TTL):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="glimpse-job")
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, params: Optional[Dict[str, Any]] = None,
+               executor: Optional[ThreadPoolExecutor] = None, **kwargs) -> Job:
+        """
+        Queue fn(job, *args, **kwargs) on the shared executor, or on ``executor``
+        for work that must not take up the shared pipeline workers
+        """
+        self.prune()
+        job = Job(kind, params)
+        with self.lock:
+            self.jobs[job.id] = job
+        job.future = (executor or self.executor).submit(self._run, job, fn, args, kwargs)
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs):
+        # Tag everything logged while the job runs with its ID
+        token = current_job_id.set(job.id)
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = JOB_COMPLETED
+        except JobError as e:
+            job.error = e.detail
+            job.status_code = e.status_code
+            job.status = JOB_FAILED
+            logger.error(f"Job {job.id} failed: {e.detail}")
+        except Exception as e:
+            job.error = f"An error occurred while processing the request: {str(e)}"
+            job.status_code = 500
+            job.status = JOB_FAILED
+            logger.exception(f"Job {job.id} failed with an unhandled exception")
+        finally:
+            job.finished_at = time.time()
+            if job.status == JOB_COMPLETED:
+                job.progress = 100.0
+            job.publish(job.status, progress=round(job.progress, 1), error=job.error)
+            current_job_id.reset(token)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not started yet. Running jobs cannot be interrupted.
+        """
+        job = self.get(job_id)
+        if job is None or job.future is None or not job.future.cancel():
+            return False
+        job.status = JOB_CANCELLED
+        job.finished_at = time.time()
+        job.publish(job.status)
+        return True
+
+    async def wait(self, job: Job) -> Job:
+        """
+        Wait for a job from the event loop without blocking it
+        """
+        return await asyncio.wrap_future(job.future)
+
+    def active_count(self) -> int:
+        return sum(1 for job in self.list() if not job.done)
+
+    def queued_count(self) -> int:
+        return sum(1 for job in self.list() if job.status == JOB_QUEUED)
+
+    def prune(self):
+        cutoff = time.time() - self.result_ttl
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job.done and job.finished_at and job.finished_at < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
+
+
+# Shared job manager used by the API
+job_manager = JobManager()
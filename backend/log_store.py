@@ -0,0 +1,95 @@
+import os
+import time
+import logging
+import itertools
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# How many records are kept and how long a single message may be
+LOG_CAPACITY = int(os.getenv("GLIMPSE_LOG_CAPACITY", "1000"))
+LOG_MESSAGE_MAX_CHARS = int(os.getenv("GLIMPSE_LOG_MESSAGE_MAX_CHARS", "500"))
+
+# ID of the job whose code is running, attached to every record it logs
+current_job_id: ContextVar[Optional[str]] = ContextVar("current_job_id", default=None)
+
+
+def truncate_message(message: str, max_chars: int = LOG_MESSAGE_MAX_CHARS) -> str:
+    if max_chars <= 0 or len(message) <= max_chars:
+        return message
+    return f"{message[:max_chars]}... [{len(message) - max_chars} chars truncated]"
+
+
+def format_entry(entry: Dict[str, Any]) -> str:
+    """
+    Render a record the way the previous in-memory handler did
+    """
+    created = entry["timestamp"]
+    asctime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+    return f"{asctime},{int(created % 1 * 1000):03d} - {entry['level']} - {entry['message']}"
+
+
+class LogStore(logging.Handler):
+    """
+    Bounded ring buffer of recent log records.
+
+    Each record gets a sequence number that clients pass back as a cursor to
+    fetch only newer records, and the ID of the job that logged it. Long
+    messages are truncated so a stray payload cannot fill the buffer.
+    """
+
+    def __init__(self, capacity: int = LOG_CAPACITY, max_message_chars: int = LOG_MESSAGE_MAX_CHARS):
+        super().__init__()
+        self.capacity = capacity
+        self.max_message_chars = max_message_chars
+        self.records = deque(maxlen=capacity)
+        self.last_id = 0
+        self.records_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            message = truncate_message(record.getMessage(), self.max_message_chars)
+        except Exception:
+            self.handleError(record)
+            return
+        entry = {
+            "timestamp": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": message,
+            "job_id": getattr(record, "job_id", None) or current_job_id.get(),
+        }
+        with self.records_lock:
+            self.last_id += 1
+            entry["id"] = self.last_id
+            self.records.append(entry)
+
+    def query(self, since: int = 0, job_id: Optional[str] = None,
+              limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Up to ``limit`` records after the ``since`` cursor, oldest first, and
+        the cursor to pass next time. The cursor only moves past records that
+        were returned or filtered out, so paging never skips any.
+        """
+        with self.records_lock:
+            cursor = min(since, self.last_id)
+            # IDs are contiguous, so the new records are the last (last_id - since) in the buffer
+            new_count = min(max(self.last_id - since, 0), len(self.records))
+            new_records = list(itertools.islice(reversed(self.records), new_count))[::-1]
+
+        entries = []
+        for entry in new_records:
+            if limit and len(entries) == limit:
+                break
+            cursor = entry["id"]
+            if not job_id or entry["job_id"] == job_id:
+                entries.append(entry)
+        return entries, cursor
+
+
+# Shared store that collects every log record of the backend
+log_store = LogStore()
@@ -3,9 +3,15 @@ import os
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 import re
+import math
+import hashlib
+import time
+import subprocess
+import threading
+import contextvars
 import yt_dlp
-import speech_recognition as sr
-from transformers import pipeline, M2M100ForConditionalGeneration, M2M100Tokenizer, AutoTokenizer, AutoModelForSeq2SeqLM
+from transformers.modeling_outputs import BaseModelOutput
+from transformers import pipeline, M2M100ForConditionalGeneration, M2M100Tokenizer, AutoTokenizer, AutoModelForSeq2SeqLM, WhisperProcessor, WhisperForConditionalGeneration
 import torch
 from pydub import AudioSegment
 from concurrent.futures import ThreadPoolExecutor
@@ -17,6 +23,16 @@ import uuid
 import tempfile
 from supabase import create_client, Client
 from io import BytesIO
+from model_registry import ModelRegistry
+from quantization import quantized_loader
+from onnx_engine import load_onnx_pipeline
+from planner import CostModel, Deadline
+from storage import BackgroundUploader, LocalStorage, create_storage
+from metrics import stage_duration, summary_strategy_duration, summary_strategy_total
+from batching import MicroBatcher, run_grouped
+from translation_memory import TranslationMemory, normalize_sentence
+from vad import segment_speech, stream_speech_chunks
+from asr import ASR_SAMPLE_RATE, ASR_SAMPLE_WIDTH, GoogleASRBackend, WhisperASRBackend, StubASRBackend
 matplotlib.use('Agg')  # Force non-interactive backend
 import matplotlib.pyplot as plt
 
@@ -55,10 +71,19 @@ except Exception as e:
     logger.error(f"Failed to initialize Supabase client: {str(e)}")
     supabase = None
 
-# Initialize translation model and tokenizer
-translator_model_name = "facebook/m2m100_418M"
-translator_model = M2M100ForConditionalGeneration.from_pretrained(translator_model_name)
-translator_tokenizer = M2M100Tokenizer.from_pretrained(translator_model_name)
+# Audio storage; uploads run in the background and fall back to local files if Supabase keeps failing
+storage = create_storage(supabase, bucket_name)
+storage_uploader = None
+if storage:
+    storage_uploader = BackgroundUploader(storage, fallback=LocalStorage() if storage.name != "local" else None)
+    logger.info(f"Audio storage backend: {storage.name}")
+
+# Model names
+TRANSLATOR_MODEL_NAME = "facebook/m2m100_418M"
+SENTIMENT_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
+MAIN_SUMMARIZER_NAME = "facebook/bart-large-cnn"
+LONG_SUMMARIZER_NAME = "pszemraj/led-large-book-summary"
+FALLBACK_SUMMARIZER_NAME = "sshleifer/distilbart-cnn-12-6"
 
 # Mapping of languages to codes for translation
 language_code_map = {
@@ -68,48 +93,187 @@ language_code_map = {
     'Marathi': 'mr',
 }
 
-# Initialize sentiment analysis pipeline using a model that returns labels and confidence scores.
-sentiment_pipeline = pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment")
+pipeline_device = 0 if torch.cuda.is_available() else -1
+
+# Models are loaded on first use and released when idle or over the RAM budget
+# (0 disables the corresponding policy)
+model_registry = ModelRegistry(
+    memory_budget_bytes=int(os.getenv("GLIMPSE_MODEL_MEMORY_BUDGET_MB", "0")) * 1024 * 1024,
+    idle_timeout=float(os.getenv("GLIMPSE_MODEL_IDLE_TIMEOUT", "0"))
+)
+
+# Opt-in int8 dynamic quantization for CPU inference, e.g. GLIMPSE_QUANTIZE=all
+# or GLIMPSE_QUANTIZE=translator,sentiment. Ignored when running on CUDA.
+QUANTIZED_MODELS = {name.strip() for name in os.getenv("GLIMPSE_QUANTIZE", "").split(",") if name.strip()}
+
+# Inference engine: "torch" (default) or "onnx" to run the models that support it
+# through ONNX Runtime (needs optimum[onnxruntime]); GLIMPSE_ONNX_MODELS narrows the set
+INFERENCE_ENGINE = os.getenv("GLIMPSE_INFERENCE_ENGINE", "torch").lower()
+ONNX_MODELS = {
+    name.strip()
+    for name in os.getenv("GLIMPSE_ONNX_MODELS", "sentiment,main_summarizer,fallback_summarizer").split(",")
+    if name.strip()
+}
+
+def use_onnx(name):
+    return INFERENCE_ENGINE == "onnx" and name in ONNX_MODELS
+
+def load_pipeline(name, task, model_name, **kwargs):
+    if use_onnx(name):
+        try:
+            return load_onnx_pipeline(task, model_name)
+        except Exception as e:
+            logger.warning(f"ONNX Runtime not available for {name}, using PyTorch: {str(e)}")
+    return pipeline(task, model=model_name, **kwargs)
+
+def register_model(name, loader):
+    # ONNX models are not quantized with torch
+    if pipeline_device == -1 and not use_onnx(name) and (name in QUANTIZED_MODELS or "all" in QUANTIZED_MODELS):
+        loader = quantized_loader(name, loader)
+    model_registry.register(name, loader)
 
-# Initialize best summarization models from HuggingFace
-logger.info("Loading summarization models...")
+# Translation model and tokenizer
+def load_translator():
+    model = M2M100ForConditionalGeneration.from_pretrained(TRANSLATOR_MODEL_NAME)
+    # Source language is fixed at load time so the shared tokenizer is never mutated per request
+    tokenizer = M2M100Tokenizer.from_pretrained(TRANSLATOR_MODEL_NAME, src_lang="en")
+    return model, tokenizer
+
+# Sentiment analysis pipeline using a model that returns labels and confidence scores
+def load_sentiment():
+    return load_pipeline("sentiment", "sentiment-analysis", SENTIMENT_MODEL_NAME)
 
 # Primary model for high-quality summarization
-try:
-    MAIN_SUMMARIZER_NAME = "facebook/bart-large-cnn"
-    main_summarizer = pipeline(
-        "summarization", 
-        model=MAIN_SUMMARIZER_NAME, 
-        device=0 if torch.cuda.is_available() else -1
-    )
-    logger.info(f"Loaded primary summarization model: {MAIN_SUMMARIZER_NAME}")
-except Exception as e:
-    logger.warning(f"Could not load primary summarization model: {str(e)}")
-    main_summarizer = None
+def load_main_summarizer():
+    return load_pipeline("main_summarizer", "summarization", MAIN_SUMMARIZER_NAME, device=pipeline_device)
 
 # Secondary model for long contexts
-try:
-    LONG_SUMMARIZER_NAME = "pszemraj/led-large-book-summary"
-    long_summarizer_tokenizer = AutoTokenizer.from_pretrained(LONG_SUMMARIZER_NAME)
-    long_summarizer_model = AutoModelForSeq2SeqLM.from_pretrained(LONG_SUMMARIZER_NAME)
-    logger.info(f"Loaded long-context summarization model: {LONG_SUMMARIZER_NAME}")
-except Exception as e:
-    logger.warning(f"Could not load long-context summarization model: {str(e)}")
-    long_summarizer_tokenizer = None
-    long_summarizer_model = None
+def load_long_summarizer():
+    tokenizer = AutoTokenizer.from_pretrained(LONG_SUMMARIZER_NAME)
+    model = AutoModelForSeq2SeqLM.from_pretrained(LONG_SUMMARIZER_NAME)
+    return model, tokenizer
+
+# Tokenizer shared by the BART summarizers, so the planner can count tokens
+# without loading any model weights
+def load_summary_tokenizer():
+    return AutoTokenizer.from_pretrained(MAIN_SUMMARIZER_NAME)
 
 # Fallback model for reliability
-try:
-    FALLBACK_SUMMARIZER_NAME = "sshleifer/distilbart-cnn-12-6"
-    fallback_summarizer = pipeline(
-        "summarization", 
-        model=FALLBACK_SUMMARIZER_NAME, 
-        device=0 if torch.cuda.is_available() else -1
-    )
-    logger.info(f"Loaded fallback summarization model: {FALLBACK_SUMMARIZER_NAME}")
-except Exception as e:
-    logger.warning(f"Could not load fallback summarization model: {str(e)}")
-    fallback_summarizer = None
+def load_fallback_summarizer():
+    return load_pipeline("fallback_summarizer", "summarization", FALLBACK_SUMMARIZER_NAME, device=pipeline_device)
+
+register_model("translator", load_translator)
+register_model("sentiment", load_sentiment)
+register_model("main_summarizer", load_main_summarizer)
+register_model("long_summarizer", load_long_summarizer)
+register_model("fallback_summarizer", load_fallback_summarizer)
+model_registry.register("summary_tokenizer", load_summary_tokenizer)
+
+# Optionally warm up models at startup, e.g. GLIMPSE_PRELOAD_MODELS=main_summarizer,sentiment
+preload_models = [name.strip() for name in os.getenv("GLIMPSE_PRELOAD_MODELS", "").split(",") if name.strip()]
+if preload_models:
+    model_registry.preload(preload_models)
+
+def get_loaded_model(name):
+    model = model_registry.get(name)
+    if model is None:
+        raise Exception(f"Model {name} is not available")
+    return model
+
+# Each model sits behind a micro-batcher so concurrent requests share padded batches
+def run_sentiment_batch(texts):
+    classifier = get_loaded_model("sentiment")
+    return [[result] for result in classifier(texts, batch_size=len(texts), truncation=True)]
+
+def run_summarizer_batch(model_name):
+    # Items are (text, generation kwargs); only items with equal kwargs can share a batch
+    def run_group(generation_kwargs, items):
+        summarizer = get_loaded_model(model_name)
+        outputs = summarizer(
+            [text for text, _ in items],
+            batch_size=SUMMARY_BATCH_SIZE,
+            **dict(generation_kwargs)
+        )
+        # A single input may come back unwrapped
+        if isinstance(outputs, dict):
+            outputs = [outputs]
+        return [(o[0] if isinstance(o, list) else o)["summary_text"] for o in outputs]
+
+    def process(items):
+        return run_grouped(items, key=lambda item: item[1], run_group=run_group)
+    return process
+
+# Translation batching: sentences are sorted by length and generated in buckets
+# so short sentences are not padded up to the longest one in the batch
+TRANSLATION_BATCH_SIZE = int(os.getenv("GLIMPSE_TRANSLATION_BATCH_SIZE", "16"))
+TRANSLATION_MAX_INPUT_TOKENS = 256
+TRANSLATION_LENGTH_RATIO = 2.0  # Target scripts often need more tokens than English
+TRANSLATION_MAX_NEW_TOKENS = 512
+
+def translate_sentences(translator_model, translator_tokenizer, sentences, target_language_codes):
+    """
+    Translate sentences into every target language. Each length bucket is run
+    through the encoder once and its outputs are reused to decode each language.
+    Returns one {language code: translation} dict per sentence.
+    """
+    lengths = [len(ids) for ids in translator_tokenizer(sentences)["input_ids"]]
+    order = sorted(range(len(sentences)), key=lambda i: lengths[i])
+    results = [{} for _ in sentences]
+    for start in range(0, len(order), TRANSLATION_BATCH_SIZE):
+        bucket = order[start:start + TRANSLATION_BATCH_SIZE]
+        longest = min(max(lengths[i] for i in bucket), TRANSLATION_MAX_INPUT_TOKENS)
+        encoded_text = translator_tokenizer(
+            [sentences[i] for i in bucket],
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=TRANSLATION_MAX_INPUT_TOKENS
+        )
+        with torch.no_grad():
+            encoder_outputs = translator_model.get_encoder()(**encoded_text)
+            for target_language_code in target_language_codes:
+                # generate expands encoder outputs for beam search in place, so each language gets its own wrapper
+                generated_tokens = translator_model.generate(
+                    attention_mask=encoded_text["attention_mask"],
+                    encoder_outputs=BaseModelOutput(last_hidden_state=encoder_outputs.last_hidden_state),
+                    forced_bos_token_id=translator_tokenizer.get_lang_id(target_language_code),
+                    max_new_tokens=min(int(longest * TRANSLATION_LENGTH_RATIO) + 10, TRANSLATION_MAX_NEW_TOKENS)
+                )
+                decoded = translator_tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+                for index, translation in zip(bucket, decoded):
+                    results[index][target_language_code] = translation
+    return results
+
+def run_translation_batch(items):
+    # Items are (sentence, tuple of target language codes); sentences needing the
+    # same languages share encoder passes
+    def run_group(target_language_codes, group):
+        translator_model, translator_tokenizer = get_loaded_model("translator")
+        return translate_sentences(translator_model, translator_tokenizer, [text for text, _ in group], target_language_codes)
+    return run_grouped(items, key=lambda item: item[1], run_group=run_group)
+
+SUMMARY_BATCH_SIZE = int(os.getenv("GLIMPSE_SUMMARY_BATCH_SIZE", "4"))
+
+sentiment_batcher = MicroBatcher("sentiment", run_sentiment_batch)
+# Collect several buckets' worth of sentences so length bucketing has something to sort
+translation_batcher = MicroBatcher("translator", run_translation_batch, max_batch_size=TRANSLATION_BATCH_SIZE * 4)
+summarizer_batchers = {
+    name: MicroBatcher(name, run_summarizer_batch(name))
+    for name in ("main_summarizer", "fallback_summarizer")
+}
+
+def sentiment_pipeline(text, **kwargs):
+    if kwargs or not isinstance(text, str):
+        return get_loaded_model("sentiment")(text, **kwargs)
+    return sentiment_batcher.submit(text)
+
+# Fingerprint of the summarization setup, used to key cached summaries
+summarizer_config = {
+    "main": MAIN_SUMMARIZER_NAME,
+    "long": LONG_SUMMARIZER_NAME,
+    "fallback": FALLBACK_SUMMARIZER_NAME,
+    "chunking": "token-map-reduce",
+}
 
 # Helper function to clean up temporary files
 def cleanup_temp_files(file_path):
@@ -127,8 +291,84 @@ def cleanup_temp_files(file_path):
     return False
 
 # Function to download YouTube audio and store in Supabase
-def download_audio(url, output_path="audio"):
+# Canonical format for stored audio: 16 kHz mono, as flac (lossless) or opus (smaller)
+AUDIO_FORMATS = {
+    "flac": {"ext": ".flac", "codec": ["-c:a", "flac", "-compression_level", "5"], "content_type": "audio/flac"},
+    "opus": {"ext": ".ogg", "codec": ["-c:a", "libopus", "-b:a", "24k", "-application", "voip"], "content_type": "audio/ogg"},
+}
+AUDIO_FORMAT = os.getenv("GLIMPSE_AUDIO_FORMAT", "flac")
+if AUDIO_FORMAT not in AUDIO_FORMATS:
+    raise Exception(f"Unknown audio format: {AUDIO_FORMAT}. Available formats are {', '.join(AUDIO_FORMATS)}")
+AUDIO_EXT = AUDIO_FORMATS[AUDIO_FORMAT]["ext"]
+AUDIO_CONTENT_TYPE = AUDIO_FORMATS[AUDIO_FORMAT]["content_type"]
+
+def canonicalize_audio(source_path, output_path=None):
+    """
+    Convert any FFmpeg-readable file to the canonical stored format in a single
+    pass (decode, downmix, resample to 16 kHz, encode). Returns the new path.
+    """
+    output_path = output_path or f"{os.path.splitext(source_path)[0]}{AUDIO_EXT}"
+    if os.path.abspath(output_path) == os.path.abspath(source_path):
+        output_path = f"{os.path.splitext(source_path)[0]}.canonical{AUDIO_EXT}"
+    command = [
+        AudioSegment.converter, "-nostdin", "-v", "error", "-y",
+        "-i", source_path,
+        "-vn", "-ac", "1", "-ar", str(ASR_SAMPLE_RATE),
+        *AUDIO_FORMATS[AUDIO_FORMAT]["codec"],
+        output_path
+    ]
+    with stage_duration.time(stage="canonicalize"):
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        cleanup_temp_files(output_path)
+        raise Exception(f"Failed to convert {source_path}: {result.stderr.decode(errors='ignore').strip()}")
+    return output_path
+
+def video_metadata(info_dict):
+    """
+    Title, best thumbnail and duration from a yt_dlp info dict
+    """
+    thumbnails = sorted(info_dict.get('thumbnails') or [],
+                        key=lambda x: (x.get('height') or 0) * (x.get('width') or 0), reverse=True)
+    metadata = {"video_id": info_dict.get('id')}
+    if thumbnails:
+        metadata["thumbnail_url"] = thumbnails[0]['url']
+    elif info_dict.get('thumbnail'):
+        metadata["thumbnail_url"] = info_dict['thumbnail']
+    if info_dict.get('title'):
+        metadata["title"] = info_dict['title']
+    if info_dict.get('duration'):
+        metadata["duration"] = info_dict['duration']
+    return metadata
+
+def fetch_video_metadata(url):
+    """
+    Resolve video metadata without downloading anything
+    """
+    with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+        return video_metadata(ydl.extract_info(url, download=False))
+
+def expand_playlist(url, max_videos=None):
+    """
+    Title and video URLs of a playlist, listed with flat extraction so the
+    individual videos are not resolved
+    """
+    ydl_opts = {'extract_flat': 'in_playlist', 'quiet': True}
+    if max_videos:
+        ydl_opts['playlistend'] = max_videos
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info_dict = ydl.extract_info(url, download=False)
+
+    video_urls = []
+    for entry in info_dict.get('entries') or []:
+        # Skip deleted or private entries, which come back without an ID
+        if entry and entry.get('id') and entry.get('ie_key', 'Youtube') == 'Youtube':
+            video_urls.append(f"https://www.youtube.com/watch?v={entry['id']}")
+    return {"title": info_dict.get('title'), "urls": video_urls[:max_videos] if max_videos else video_urls}
+
+def download_audio(url):
     temp_audio_file = None
+    source_file = None
     try:
         # Generate a unique ID for the audio file
         video_id = None
@@ -137,14 +377,10 @@ def download_audio(url, output_path="audio"):
         temp_dir = os.path.join(tempfile.gettempdir(), "audio_temp")
         os.makedirs(temp_dir, exist_ok=True)
         
+        # Keep the stream as served; canonicalize_audio does the only transcode
         ydl_opts = {
             'format': 'bestaudio/best',
-            'outtmpl': os.path.join(temp_dir, '%(id)s.%(ext)s'),
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-            }],
-            'postprocessor_args': ['-ar', '16000'],
+            'outtmpl': os.path.join(temp_dir, '%(id)s.source.%(ext)s'),
         }
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -154,71 +390,165 @@ def download_audio(url, output_path="audio"):
             if not video_id:
                 video_id = str(uuid.uuid4())
                 
-            temp_audio_file = os.path.join(temp_dir, f"{video_id}.mp3")
+            downloads = info_dict.get('requested_downloads') or [{}]
+            source_file = downloads[0].get('filepath') or ydl.prepare_filename(info_dict)
             
             # Check if the file exists
-            if not os.path.exists(temp_audio_file):
-                logger.error(f"Downloaded audio file not found at {temp_audio_file}")
-                raise Exception(f"Downloaded audio file not found at {temp_audio_file}")
+            if not os.path.exists(source_file):
+                logger.error(f"Downloaded audio file not found at {source_file}")
+                raise Exception(f"Downloaded audio file not found at {source_file}")
             
-            # If Supabase is configured, upload to Supabase
-            if supabase:
-                try:
-                    # Read the file content
-                    with open(temp_audio_file, 'rb') as f:
-                        file_content = f.read()
-                    
-                    # Upload to Supabase storage
-                    supabase_path = f"{video_id}.mp3"
-                    result = supabase.storage.from_(bucket_name).upload(
-                        path=supabase_path,
-                        file=file_content,
-                        file_options={"content-type": "audio/mpeg"},
-                        is_upsert=True
-                    )
-                    
-                    # Get the public URL
-                    public_url = supabase.storage.from_(bucket_name).get_public_url(supabase_path)
-                    logger.info(f"Audio uploaded to Supabase: {public_url}")
-                    
-                    # Return the Supabase URL and video ID
-                    return {
-                        "local_path": temp_audio_file,  # Temporary local path
-                        "supabase_path": supabase_path,  # Path in Supabase
-                        "public_url": public_url,        # Public URL
-                        "video_id": video_id             # Video ID
-                    }
-                except Exception as e:
-                    logger.error(f"Failed to upload to Supabase: {str(e)}")
-                    # If upload to Supabase fails, save locally as fallback
-                    os.makedirs(os.path.abspath(output_path), exist_ok=True)
-                    local_path = os.path.join(output_path, f"{video_id}.mp3")
-                    import shutil
-                    shutil.copy(temp_audio_file, local_path)
-                    logger.info(f"Audio saved locally as fallback: {local_path}")
-                    return {
-                        "local_path": local_path,
-                        "video_id": video_id
-                    }
-            else:
-                # If Supabase is not configured, save locally
-                os.makedirs(os.path.abspath(output_path), exist_ok=True)
-                local_path = os.path.join(output_path, f"{video_id}.mp3")
-                import shutil
-                shutil.copy(temp_audio_file, local_path)
-                logger.info(f"Audio saved locally (Supabase not configured): {local_path}")
-                return {
-                    "local_path": local_path,
-                    "video_id": video_id
-                }
+            temp_audio_file = canonicalize_audio(source_file, os.path.join(temp_dir, f"{video_id}{AUDIO_EXT}"))
+            cleanup_temp_files(source_file)
+            metadata = video_metadata(info_dict)
+            
+            # Storage upload runs in the background so transcription can start right away
+            storage_path = f"{video_id}{AUDIO_EXT}"
+            if storage_uploader:
+                storage_uploader.submit(temp_audio_file, storage_path, AUDIO_CONTENT_TYPE)
+
+            return {
+                "local_path": temp_audio_file,  # Temporary local path
+                "storage_path": storage_path,    # Path in the storage backend
+                "video_id": video_id,            # Video ID
+                "metadata": metadata             # Title, thumbnail and duration
+            }
     except Exception as e:
         # Clean up any temp files before raising the exception
         if temp_audio_file:
             cleanup_temp_files(temp_audio_file)
+        if source_file:
+            cleanup_temp_files(source_file)
         raise Exception(f"Failed to download audio: {str(e)}")
 
-# Function to convert audio to text with improved accuracy
-def audio_to_text(audio_file_or_info, chunk_duration=15):
+# Speech recognition backend: google (default), local (Whisper on CPU) or stub
+ASR_BACKEND_NAME = os.getenv("GLIMPSE_ASR_BACKEND", "google")
+LOCAL_ASR_MODEL_NAME = os.getenv("GLIMPSE_LOCAL_ASR_MODEL", "openai/whisper-tiny.en")
+
+def load_local_asr():
+    processor = WhisperProcessor.from_pretrained(LOCAL_ASR_MODEL_NAME)
+    model = WhisperForConditionalGeneration.from_pretrained(LOCAL_ASR_MODEL_NAME)
+    return model, processor
+
+register_model("local_asr", load_local_asr)
+
+asr_backend_factories = {
+    "google": lambda: GoogleASRBackend(language="en-US"),
+    "local": lambda: WhisperASRBackend(
+        lambda: model_registry.get("local_asr"),
+        batch_size=int(os.getenv("GLIMPSE_ASR_BATCH_SIZE", "8")),
+        model_name=LOCAL_ASR_MODEL_NAME
+    ),
+    "stub": lambda: StubASRBackend(latency=float(os.getenv("GLIMPSE_ASR_STUB_LATENCY", "0"))),
+}
+asr_backends = {}
+
+# How audio is cut into chunks before ASR: "vad" or "fixed"
+CHUNKING_MODE = os.getenv("GLIMPSE_CHUNKING", "vad")
+
+def get_asr_backend(name=None):
+    name = name or ASR_BACKEND_NAME
+    if name not in asr_backend_factories:
+        raise Exception(f"Unknown ASR backend: {name}. Available backends are {', '.join(asr_backend_factories)}")
+    if name not in asr_backends:
+        asr_backends[name] = asr_backend_factories[name]()
+    return asr_backends[name]
+
+def decode_audio_pcm(audio_file, sample_rate=ASR_SAMPLE_RATE):
+    """
+    Decode any FFmpeg-readable audio file to raw mono 16-bit PCM in memory,
+    resampling in the same pass so nothing is written back to disk
+    """
+    command = [
+        AudioSegment.converter, "-nostdin", "-v", "error",
+        "-i", audio_file,
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(sample_rate),
+        "-"
+    ]
+    with stage_duration.time(stage="decode"):
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise Exception(f"Failed to decode {audio_file}: {result.stderr.decode(errors='ignore').strip()}")
+    return result.stdout
+
+def transcribe_chunks(chunks_with_positions, asr, progress_callback=None, expected_total=None):
+    """
+    Transcribe (pcm, start_ms) chunks in backend-sized batches on a thread pool.
+
+    chunks_with_positions may be a generator: batches are dispatched as soon as
+    they fill up, so transcription can start before all audio is available.
+    expected_total is the estimated chunk count for progress when it is not yet known.
+    """
+    bytes_per_ms = ASR_SAMPLE_RATE * ASR_SAMPLE_WIDTH // 1000
+    started = time.perf_counter()
+    progress = {"completed": 0, "dispatched": 0, "first_segment": False}
+    progress_lock = threading.Lock()
+
+    def transcribe_batch(batch):
+        batch_start = time.perf_counter()
+        texts = asr.transcribe_batch([chunk for chunk, _ in batch])
+        # Batched backends decode chunks together, so record the per-chunk share of the batch
+        chunk_seconds = (time.perf_counter() - batch_start) / len(batch)
+        for _ in batch:
+            stage_duration.observe(chunk_seconds, stage="asr_chunk")
+        segments = []
+        for (chunk, start_time), text in zip(batch, texts):
+            if text:
+                # Create segment with timestamp
+                segments.append({
+                    "text": text,
+                    "start": start_time / 1000,  # convert to seconds
+                    "end": (start_time + len(chunk) // bytes_per_ms) / 1000  # convert to seconds
+                })
+
+        with progress_lock:
+            progress["completed"] += len(batch)
+            completed, dispatched = progress["completed"], progress["dispatched"]
+            first_segment = segments and not progress["first_segment"]
+            if first_segment:
+                progress["first_segment"] = True
+        if first_segment:
+            stage_duration.observe(time.perf_counter() - started, stage="first_segment")
+        if progress_callback:
+            progress_callback(completed, max(dispatched, expected_total or 0))
+        return segments
+
+    # Group chunks into backend-sized batches and dispatch each one as soon as it is full.
+    # Each batch runs in a copy of the caller's context so its log records keep the job ID.
+    futures = []
+    with ThreadPoolExecutor(max_workers=asr.max_workers) as executor:
+        batch = []
+        for chunk in chunks_with_positions:
+            batch.append(chunk)
+            if len(batch) == asr.batch_size:
+                with progress_lock:
+                    progress["dispatched"] += len(batch)
+                futures.append(executor.submit(contextvars.copy_context().run, transcribe_batch, batch))
+                batch = []
+        if batch:
+            with progress_lock:
+                progress["dispatched"] += len(batch)
+            futures.append(executor.submit(contextvars.copy_context().run, transcribe_batch, batch))
+        transcript_segments = [segment for future in futures for segment in future.result()]
+
+    # Sort segments by start time and drop words repeated across overlapping chunks
+    transcript_segments.sort(key=lambda x: x["start"])
+    transcript_segments = stitch_segments(transcript_segments)
+
+    # Combine the text
+    full_transcript = " ".join([segment["text"] for segment in transcript_segments])
+    return {
+        "full_text": full_transcript.strip(),
+        "segments": transcript_segments
+    }
+
+# Function to convert audio to text with improved accuracy.
+# progress_callback, if given, is called as progress_callback(completed, total)
+# each time a chunk finishes transcribing. asr_backend defaults to the configured backend.
+# chunking is "vad" (cut at pauses, drop silence) or "fixed" (overlapping windows);
+# chunk_duration is the target chunk length in seconds for both.
+def audio_to_text(audio_file_or_info, chunk_duration=15, progress_callback=None, asr_backend=None, chunking=None):
     temp_file = None
     try:
         # Handle both string paths and dictionaries with file info
@@ -226,26 +556,19 @@ def audio_to_text(audio_file_or_info, chunk_duration=15):
             # Use local_path from the dictionary
             audio_file = audio_file_or_info.get("local_path")
             if not audio_file:
-                # If no local_path, try to download from Supabase
-                if supabase and "supabase_path" in audio_file_or_info:
+                # If no local_path, try to fetch it from storage
+                if storage and "storage_path" in audio_file_or_info:
                     try:
-                        supabase_path = audio_file_or_info["supabase_path"]
-                        # Download from Supabase to a temporary file
-                        temp_file = os.path.join(tempfile.gettempdir(), f"temp_{uuid.uuid4()}.mp3")
-                        
-                        # Get the file from Supabase
-                        file_data = supabase.storage.from_(bucket_name).download(supabase_path)
-                        
-                        # Save to temporary file
-                        with open(temp_file, 'wb') as f:
-                            f.write(file_data)
-                        
+                        storage_path = audio_file_or_info["storage_path"]
+                        temp_file = os.path.join(tempfile.gettempdir(), f"temp_{uuid.uuid4()}{os.path.splitext(storage_path)[1]}")
+                        storage.download_file(storage_path, temp_file)
+
                         audio_file = temp_file
-                        logger.info(f"Downloaded audio from Supabase to {audio_file}")
+                        logger.info(f"Downloaded audio from {storage.name} storage to {audio_file}")
                     except Exception as e:
                         if temp_file:
                             cleanup_temp_files(temp_file)
-                        raise Exception(f"Failed to download audio from Supabase: {str(e)}")
+                        raise Exception(f"Failed to download audio from storage: {str(e)}")
                 else:
                     raise Exception("No valid audio file information provided")
         else:
@@ -255,106 +578,47 @@ def audio_to_text(audio_file_or_info, chunk_duration=15):
         if not os.path.exists(audio_file):
             raise Exception(f"Audio file not found: {audio_file}")
             
-        # Create temp dir
-        temp_dir = "temp_audio_chunks"
-        os.makedirs(temp_dir, exist_ok=True)
-            
-        recognizer = sr.Recognizer()
-        
-        # Convert MP3 to WAV if necessary
-        if audio_file.lower().endswith('.mp3'):
-            audio = AudioSegment.from_mp3(audio_file)
-            wav_file = audio_file.replace('.mp3', '.wav')
-            audio.export(wav_file, format="wav")
-        else:
-            wav_file = audio_file
+        asr = asr_backend or get_asr_backend()
+
+        # Decode once to 16 kHz mono PCM in memory; chunks are slices of this buffer
+        pcm = decode_audio_pcm(audio_file)
+        bytes_per_ms = ASR_SAMPLE_RATE * ASR_SAMPLE_WIDTH // 1000
 
-        # Process audio with smaller chunks for better accuracy
-        audio = AudioSegment.from_wav(wav_file).set_frame_rate(16000)
-        
-        # Calculate chunk size with overlap for smoother transitions
         chunk_size = chunk_duration * 1000  # convert to milliseconds
-        overlap = 1000  # 1 second overlap
-        
-        # Create overlapping chunks for better context
-        audio_length = len(audio)
-        transcript_segments = []
-        
-        def transcribe_chunk(chunk, start_time):
-            temp_chunk = os.path.join(temp_dir, f"chunk_{start_time}.wav")
-            chunk.export(temp_chunk, format="wav")
-            
-            with sr.AudioFile(temp_chunk) as source:
-                audio_data = recognizer.record(source)
-                try:
-                    text = recognizer.recognize_google(audio_data, language="en-US", show_all=False)
-                    if text:
-                        # Create segment with timestamp
-                        return {
-                            "text": text,
-                            "start": start_time / 1000,  # convert to seconds
-                            "end": (start_time + len(chunk)) / 1000  # convert to seconds
-                        }
-                    return None
-                except sr.UnknownValueError:
-                    return None
-                except sr.RequestError as e:
-                    logger.error(f"API Request Error: {e}")
-                    return None
-                finally:
-                    if os.path.exists(temp_chunk):
-                        try:
-                            os.remove(temp_chunk)
-                        except:
-                            pass
-        
-        # Process chunks with ThreadPoolExecutor
-        chunk_positions = list(range(0, audio_length - chunk_size + 1, chunk_size - overlap))
-        if chunk_positions:
-            chunks_with_positions = [(audio[pos:pos + chunk_size], pos) for pos in chunk_positions]
-            
-            # Add the last chunk if needed
-            if chunk_positions[-1] + chunk_size < audio_length:
-                last_pos = audio_length - chunk_size
-                chunks_with_positions.append((audio[last_pos:], last_pos))
-            
-            with ThreadPoolExecutor() as executor:
-                results = list(executor.map(lambda x: transcribe_chunk(*x), chunks_with_positions))
-                
-            # Filter out None results and combine
-            transcript_segments = [r for r in results if r]
-            
-            # Sort segments by start time
-            transcript_segments.sort(key=lambda x: x["start"])
-            
-            # Combine the text
-            full_transcript = " ".join([segment["text"] for segment in transcript_segments])
+        audio_length = len(pcm) // bytes_per_ms  # in milliseconds
+
+        def pcm_slice(start_ms, end_ms=None):
+            end = len(pcm) if end_ms is None else end_ms * bytes_per_ms
+            return pcm[start_ms * bytes_per_ms:end]
+
+        if (chunking or CHUNKING_MODE) == "vad":
+            # Cut at pauses and skip silence, so chunks need no overlap
+            regions = segment_speech(pcm, ASR_SAMPLE_RATE, target_ms=chunk_size, max_ms=chunk_size * 5 // 3)
+            chunks_with_positions = [(pcm_slice(start, end), start) for start, end in regions]
+            speech_ms = sum(end - start for start, end in regions)
+            logger.info(f"Voice activity chunking: {len(regions)} chunks, {speech_ms / 1000:.1f}s of speech in {audio_length / 1000:.1f}s of audio")
         else:
-            # Handle short audio
-            result = transcribe_chunk(audio, 0)
-            if result:
-                transcript_segments = [result]
-                full_transcript = result["text"]
+            # Create overlapping chunks for better context
+            overlap = 1000  # 1 second overlap
+            chunk_positions = list(range(0, audio_length - chunk_size + 1, chunk_size - overlap))
+            if chunk_positions:
+                chunks_with_positions = [(pcm_slice(pos, pos + chunk_size), pos) for pos in chunk_positions]
+
+                # Add the last chunk if needed
+                if chunk_positions[-1] + chunk_size < audio_length:
+                    last_pos = audio_length - chunk_size
+                    chunks_with_positions.append((pcm_slice(last_pos), last_pos))
             else:
-                full_transcript = ""
-                transcript_segments = []
+                # Handle short audio as a single chunk
+                chunks_with_positions = [(pcm, 0)]
+
+        transcription_result = transcribe_chunks(chunks_with_positions, asr, progress_callback)
 
-        # Cleanup
-        if audio_file.lower().endswith('.mp3') and os.path.exists(wav_file):
-            try:
-                os.remove(wav_file)
-            except:
-                pass
-            
         # Cleanup temporary files at the end
         if temp_file:
             cleanup_temp_files(temp_file)
         
-        # Return transcription result
-        return {
-            "full_text": full_transcript.strip(),
-            "segments": transcript_segments
-        }
+        return transcription_result
     except Exception as e:
         # Clean up temp file if there's an error
         if temp_file:
@@ -362,173 +626,467 @@ def audio_to_text(audio_file_or_info, chunk_duration=15):
         logger.error(f"Transcription error: {str(e)}")
         raise Exception(f"Failed to convert audio to text: {str(e)}")
 
-# Function to summarize text using advanced Hugging Face models
-def summarize_text(text):
+# Streaming mode for YouTube URLs: yt_dlp only resolves the audio URL, FFmpeg
+# reads it over HTTP and pipes 16 kHz PCM to us, and chunks go to ASR as soon as
+# enough audio has arrived, so download and transcription overlap
+STREAMING_ENABLED = os.getenv("GLIMPSE_STREAMING", "false").lower() in ("1", "true", "yes")
+STREAM_READ_BYTES = 64 * 1024
+
+def resolve_audio_stream(url):
+    """
+    Look up the direct URL and HTTP headers of the best audio-only format
+    """
+    with yt_dlp.YoutubeDL({'format': 'bestaudio/best', 'quiet': True}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    stream_url = info.get("url")
+    if not stream_url:
+        raise Exception("No direct audio stream available for this video")
+    return info, stream_url, info.get("http_headers") or {}
+
+def stream_pcm_blocks(stream_url, headers=None, sample_rate=ASR_SAMPLE_RATE, read_size=STREAM_READ_BYTES):
+    """
+    Yield raw mono 16-bit PCM blocks while FFmpeg is still reading the stream
+    """
+    command = [AudioSegment.converter, "-nostdin", "-v", "error"]
+    if headers:
+        command += ["-headers", "".join(f"{name}: {value}\r\n" for name, value in headers.items())]
+    command += [
+        "-i", stream_url,
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(sample_rate),
+        "-"
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            block = process.stdout.read(read_size)
+            if not block:
+                break
+            yield block
+        if process.wait() != 0:
+            raise Exception(f"FFmpeg failed while streaming audio: {process.stderr.read().decode(errors='ignore').strip()}")
+    finally:
+        # Stop FFmpeg if the consumer gave up early
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+def stream_fixed_chunks(blocks, chunk_ms, overlap_ms=1000):
+    """
+    Overlapping fixed-length (pcm, start_ms) windows over PCM arriving in blocks
+    """
+    bytes_per_ms = ASR_SAMPLE_RATE * ASR_SAMPLE_WIDTH // 1000
+    chunk_bytes, step_bytes = chunk_ms * bytes_per_ms, (chunk_ms - overlap_ms) * bytes_per_ms
+    buffer = bytearray()
+    offset_ms = 0
+    emitted = False
+    for block in blocks:
+        buffer.extend(block)
+        while len(buffer) >= chunk_bytes:
+            yield bytes(buffer[:chunk_bytes]), offset_ms
+            del buffer[:step_bytes]
+            offset_ms += chunk_ms - overlap_ms
+            emitted = True
+    # The tail is only new audio if it extends past the previous window's overlap
+    if len(buffer) > overlap_ms * bytes_per_ms or (buffer and not emitted):
+        yield bytes(buffer), offset_ms
+
+def stream_audio_to_text(url, chunk_duration=15, progress_callback=None, asr_backend=None, chunking=None,
+                         metadata_callback=None):
+    """
+    Transcribe a YouTube video while it is still downloading.
+
+    Returns (transcription_result, audio_hash), where audio_hash is a hash of
+    the decoded PCM that can key the transcript cache. metadata_callback, if
+    given, receives the video metadata as soon as the stream is resolved.
+    """
+    try:
+        asr = asr_backend or get_asr_backend()
+        info, stream_url, headers = resolve_audio_stream(url)
+        if metadata_callback:
+            metadata_callback(video_metadata(info))
+        logger.info(f"Streaming audio for {info.get('id')} into {asr.name} transcription")
+
+        digest = hashlib.sha256()
+        def hashed(blocks):
+            for block in blocks:
+                digest.update(block)
+                yield block
+        blocks = hashed(stream_pcm_blocks(stream_url, headers))
+
+        chunk_size = chunk_duration * 1000
+        if (chunking or CHUNKING_MODE) == "vad":
+            chunks = stream_speech_chunks(blocks, ASR_SAMPLE_RATE, target_ms=chunk_size, max_ms=chunk_size * 5 // 3)
+        else:
+            chunks = stream_fixed_chunks(blocks, chunk_size)
+
+        # The video duration gives a chunk estimate for progress before the stream ends
+        expected_total = int((info.get("duration") or 0) * 1000 / chunk_size)
+        transcription_result = transcribe_chunks(chunks, asr, progress_callback, expected_total)
+        return transcription_result, f"pcm-{digest.hexdigest()}"
+    except Exception as e:
+        logger.error(f"Streaming transcription error: {str(e)}")
+        raise Exception(f"Failed to stream audio to text: {str(e)}")
+
+# Longest run of words compared when aligning two overlapping segments
+STITCH_MAX_OVERLAP_WORDS = 12
+# Upper bound on speech rate, used to cap how many words an overlap can hold
+STITCH_MAX_WORDS_PER_SECOND = 4
+
+def normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def find_overlap(tail, head, max_words=None):
+    """
+    Number of leading words of head that repeat the end of tail, at most max_words.
+    A match has to end at the last word of tail, or one word earlier for matches
+    of two words or more, to allow for a word cut at the chunk boundary.
+    """
+    limit = min(len(tail), len(head), max_words if max_words is not None else len(head))
+    for k in range(limit, 0, -1):
+        prefix = head[:k]
+        if tail[-k:] == prefix:
+            return k
+        if k > 1 and len(tail) > k and tail[-k - 1:-1] == prefix:
+            return k
+    return 0
+
+# Helper function to stitch transcript segments from overlapping chunks
+def stitch_segments(segments, max_overlap_words=STITCH_MAX_OVERLAP_WORDS):
+    """
+    Remove words duplicated where consecutive segments overlap in time and move
+    the start of a trimmed segment to the end of the overlap. Each boundary only
+    compares a bounded window of words, so the pass is linear in the segment count.
+    """
+    stitched = []
+    for segment in segments:
+        if not stitched or segment["start"] >= stitched[-1]["end"]:
+            stitched.append(dict(segment))
+            continue
+
+        previous = stitched[-1]
+        words = segment["text"].split()
+        tail = [normalize_word(w) for w in previous["text"].split()[-max_overlap_words:]]
+        head = [normalize_word(w) for w in words[:max_overlap_words]]
+        # Plus one for a word cut at the boundary and heard by both chunks
+        overlap_seconds = previous["end"] - segment["start"]
+        max_words = math.ceil(overlap_seconds * STITCH_MAX_WORDS_PER_SECOND) + 1
+        overlap = find_overlap(tail, head, max_words)
+
+        if overlap >= len(words):
+            # Everything in this segment was already transcribed
+            previous["end"] = max(previous["end"], segment["end"])
+            continue
+
+        # The removed words lie inside the overlap, so the kept ones start after it
+        stitched.append({
+            **segment,
+            "text": " ".join(words[overlap:]),
+            "start": previous["end"] if overlap else segment["start"]
+        })
+    return stitched
+
+# Map-reduce summarization settings
+MAP_REDUCE_MAX_LEVELS = 4
+SINGLE_PASS_PROMPT = "Summarize this video transcript highlighting key points, main ideas, and important takeaways: "
+MAP_PROMPT = "Summarize the main content from this video transcript: "
+REDUCE_PROMPT = "Combine these partial summaries of a video into one summary highlighting the key points: "
+FALLBACK_PROMPT = "Create a concise summary of this video content highlighting the most important points: "
+
+def count_tokens(tokenizer, text):
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+def token_budget(tokenizer, prompt):
+    """
+    Tokens left for content once the prompt and special tokens are accounted for
+    """
+    return tokenizer.model_max_length - count_tokens(tokenizer, prompt) - 8
+
+def split_by_tokens(text, tokenizer, max_tokens):
+    """
+    Split text into chunks of at most max_tokens, breaking between sentences where
+    possible. Sentences longer than the budget (e.g. unpunctuated ASR output) are
+    split on token boundaries.
+    """
+    sentences = [s for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s]
+    if not sentences:
+        return []
+    lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+
+    chunks, current, current_length = [], [], 0
+    for sentence, length in zip(sentences, lengths):
+        if length > max_tokens:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_length = [], 0
+            ids = tokenizer(sentence, add_special_tokens=False)["input_ids"]
+            chunks.extend(tokenizer.decode(ids[i:i + max_tokens]) for i in range(0, len(ids), max_tokens))
+            continue
+        if current and current_length + length > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_length = [], 0
+        current.append(sentence)
+        current_length += length
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def summarize_batch(model_name, texts, prompt, max_length, min_length, num_beams=None):
+    """
+    Summarize several texts with the named summarizer. The texts go through its
+    micro-batcher, so they are padded into batches together with other requests.
+    """
+    tokenizer = get_loaded_model(model_name).tokenizer
+    # Keep min_length below the shortest input so short chunks are not padded out
+    shortest = min(count_tokens(tokenizer, t) for t in texts)
+    generation_kwargs = {
+        "max_length": max_length,
+        "min_length": max(1, min(min_length, shortest // 2)),
+        "do_sample": False,
+        "truncation": True,
+    }
+    if num_beams:
+        generation_kwargs["num_beams"] = num_beams
+    key = tuple(sorted(generation_kwargs.items()))
+    return summarizer_batchers[model_name].submit_many([(f"{prompt}{t}", key) for t in texts])
+
+def map_reduce_summarize(text, model_name="main_summarizer", deadline=None):
+    """
+    Summarize token-sized chunks of the whole text in batches, then summarize the
+    joined partial summaries again until they fit in one final pass.
+
+    Returns (summary, complete). If the deadline expires between levels, the
+    joined partial summaries so far are returned with complete=False.
+    """
+    tokenizer = get_loaded_model(model_name).tokenizer
+    budget = token_budget(tokenizer, MAP_PROMPT)
+    chunks = split_by_tokens(text, tokenizer, budget)
+
+    level = 0
+    while len(chunks) > 1 and level < MAP_REDUCE_MAX_LEVELS:
+        if deadline is not None and deadline.expired:
+            logger.warning(f"Deadline reached at map-reduce level {level}, returning partial summary")
+            return (" ".join(chunks) if level else ""), False
+        logger.info(f"Map-reduce level {level}: summarizing {len(chunks)} chunks")
+        partial_summaries = summarize_batch(
+            model_name, chunks, MAP_PROMPT,
+            max_length=150, min_length=30, num_beams=3
+        )
+        text = " ".join(partial_summaries)
+        chunks = split_by_tokens(text, tokenizer, budget)
+        level += 1
+
+    if not chunks:
+        return "", True
+    if level and deadline is not None and deadline.expired:
+        logger.warning("Deadline reached before the final reduce, returning partial summary")
+        return " ".join(chunks), False
+    prompt = REDUCE_PROMPT if level else SINGLE_PASS_PROMPT
+    return summarize_batch(model_name, [" ".join(chunks)], prompt, max_length=200, min_length=80, num_beams=4)[0], True
+
+def record_strategy(strategy, outcome, start):
+    summary_strategy_duration.observe(time.perf_counter() - start, strategy=strategy)
+    summary_strategy_total.inc(strategy=strategy, outcome=outcome)
+
+# Per-request latency budget for summarization in seconds (0 disables the deadline).
+# Strategies whose predicted cost does not fit in the remaining time are skipped.
+SUMMARY_BUDGET_SECONDS = float(os.getenv("GLIMPSE_SUMMARY_BUDGET_SECONDS", "0"))
+
+# Starting cost estimates on CPU as (overhead seconds, seconds per input token);
+# they are refined from observed timings as requests complete
+summary_cost_model = CostModel({
+    "led": (5.0, 0.02),
+    "bart": (2.0, 0.006),
+    "bart_map_reduce": (3.0, 0.008),
+    "distilbart": (1.0, 0.004),
+})
+
+# LED's input window in tokens; the tokens left over hold the prompt
+LONG_SUMMARIZER_MAX_TOKENS = 16384
+LONG_SUMMARIZER_PROMPT_TOKENS = 64
+LONG_SUMMARIZER_PROMPT = "Below is a transcript from a video. Please provide a concise summary highlighting the key points, main ideas, and essential information so someone doesn't need to watch the full video:\n\n"
+
+def summarize_with_long_model(text):
+    """
+    Strategy 1: the long-context LED summarizer. Returns None if the model is unavailable.
+    """
+    long_summarizer = model_registry.get("long_summarizer")
+    if long_summarizer is None:
+        return None
+    long_summarizer_model, long_summarizer_tokenizer = long_summarizer
+    logger.info("Using high-quality long-context summarizer")
+
+    # The whole transcript is passed; the planner only picks LED when it fits the window
+    inputs = long_summarizer_tokenizer(
+        f"{LONG_SUMMARIZER_PROMPT}{text}",
+        max_length=LONG_SUMMARIZER_MAX_TOKENS,
+        return_tensors="pt",
+        truncation=True
+    )
+    with torch.no_grad():
+        summary_ids = long_summarizer_model.generate(
+            inputs["input_ids"],
+            max_length=300,
+            min_length=100,
+            length_penalty=2.0,
+            num_beams=4,
+            early_stopping=True
+        )
+    summary = long_summarizer_tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+    logger.info(f"Long-context summary generated, length: {len(summary)} characters")
+
+    # Improve summary formatting by adding section headers
+    return format_summary(summary)
+
+def summarize_with_plan(text, budget_seconds=None):
+    """
+    Summarize text with the best strategy that fits the latency budget.
+
+    The text is tokenized once and each strategy's cost is predicted from that
+    count. Strategies are tried in quality order (LED for texts that fit its
+    window, bart single pass or map-reduce, distilbart), each only if it is
+    available and its predicted cost fits the remaining time; later ones only
+    run if earlier ones fail or return an inadequate result. The cheap extractive fallbacks always run last.
+
+    Returns {"summary", "strategy", "degraded", "elapsed_seconds"}. degraded is
+    True when the deadline skipped or cut short a strategy, so callers can
+    avoid caching the result.
+    """
+    started = time.perf_counter()
+    outcome = {"summary": text, "strategy": "none", "degraded": False}
+
+    def finish(summary, strategy):
+        outcome.update(summary=summary, strategy=strategy, elapsed_seconds=round(time.perf_counter() - started, 3))
+        logger.info(f"Summary strategy: {strategy}{' (degraded by deadline)' if outcome['degraded'] else ''}")
+        return outcome
+
     try:
         logger.info(f"Summarizing text of length {len(text)} characters")
         text = text.strip()
-        
+
         # Skip summarization if text is too short or empty
         if len(text) < 100:
             logger.warning("Text too short for summarization")
-            return text
-            
+            return finish(text, "passthrough")
+
         max_input_length = 1024
-        
-        # Attempt to improve summarization by extracting key information first
-        # This helps focus the summary on important content
-        key_information = extract_key_information(text)
-        
-        # Strategy 1: Try the long-context summarizer for best quality
-        if len(text) > 2000 and long_summarizer_model is not None and long_summarizer_tokenizer is not None:
+        deadline = Deadline(SUMMARY_BUDGET_SECONDS if budget_seconds is None else budget_seconds)
+
+        # Tokenize once with the tokenizer alone, so planning never loads a model
+        # the plan does not use; strategies that see only a prefix scale the count
+        # by the share of characters they read
+        tokenizer = model_registry.get("summary_tokenizer")
+        if tokenizer is not None:
+            token_count = count_tokens(tokenizer, text)
+            single_pass_budget = token_budget(tokenizer, SINGLE_PASS_PROMPT)
+        else:
+            token_count = len(text.split()) * 4 // 3
+            single_pass_budget = max_input_length - 64
+        def prefix_tokens(max_chars):
+            return int(token_count * min(1.0, max_chars / len(text)))
+
+        best_partial = None
+
+        def attempt(strategy, tokens, run, min_length=0):
+            """
+            Run one strategy if its predicted cost fits the deadline. Returns the
+            summary if it is adequate, otherwise None.
+            """
+            nonlocal best_partial
+            predicted = summary_cost_model.predict(strategy, tokens)
+            if not deadline.allows(predicted):
+                logger.info(f"Skipping {strategy}: predicted {predicted:.1f}s with {deadline.remaining():.1f}s left")
+                summary_strategy_total.inc(strategy=strategy, outcome="skipped")
+                outcome["degraded"] = True
+                return None
+
+            start = time.perf_counter()
             try:
-                logger.info("Using high-quality long-context summarizer")
-                # Limit text to prevent overflow but ensure enough context
-                truncated_text = text[:10000] if len(text) > 10000 else text
-                
-                # Add instructions to the model to get a better summary
-                enhanced_prompt = f"Below is a transcript from a video. Please provide a concise summary highlighting the key points, main ideas, and essential information so someone doesn't need to watch the full video:\n\n{truncated_text}"
-                
-                inputs = long_summarizer_tokenizer(
-                    enhanced_prompt,
-                    max_length=16384,
-                    return_tensors="pt",
-                    truncation=True
-                )
-                
-                with torch.no_grad():
-                    summary_ids = long_summarizer_model.generate(
-                        inputs["input_ids"],
-                        max_length=300,
-                        min_length=100,
-                        length_penalty=2.0,
-                        num_beams=4,
-                        early_stopping=True
-                    )
-                
-                summary = long_summarizer_tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-                logger.info(f"Long-context summary generated, length: {len(summary)} characters")
-                
-                # Improve summary formatting by adding section headers
-                formatted_summary = format_summary(summary)
-                
-                if len(formatted_summary.strip()) > 100:
-                    return formatted_summary
-                logger.warning("Long-context summarizer returned inadequate result, trying alternatives.")
+                result = run()
             except Exception as e:
-                logger.warning(f"Long-context summarizer failed: {str(e)}. Trying alternatives.")
-        
-        # Strategy 2: For shorter texts, use the main summarizer
-        if main_summarizer is not None:
-            try:
+                record_strategy(strategy, "failed", start)
+                logger.warning(f"Summarization strategy {strategy} failed: {str(e)}. Trying alternatives.")
+                return None
+            if result is None:
+                summary_strategy_total.inc(strategy=strategy, outcome="unavailable")
+                return None
+
+            summary_cost_model.observe(strategy, tokens, time.perf_counter() - start)
+            if len(result.strip()) > min_length:
+                record_strategy(strategy, "success", start)
+                return result
+            record_strategy(strategy, "inadequate", start)
+            logger.warning(f"Summarization strategy {strategy} returned an inadequate result, trying alternatives.")
+            # Keep the longest inadequate result in case nothing better finishes in time
+            if result.strip() and (best_partial is None or len(result) > len(best_partial)):
+                best_partial = result
+            return None
+
+        # Strategy 1: the long-context summarizer for best quality on long transcripts.
+        # It reads the whole text, so longer ones go to map-reduce rather than
+        # being summarized from their beginning only.
+        if len(text) > 2000 and token_count <= LONG_SUMMARIZER_MAX_TOKENS - LONG_SUMMARIZER_PROMPT_TOKENS:
+            result = attempt("led", token_count,
+                             lambda: summarize_with_long_model(text), min_length=100)
+            if result:
+                return finish(result, "led")
+
+        # Strategy 2: the main summarizer, in a single pass if the transcript fits
+        # its context window and with token-aware map-reduce otherwise. A text that
+        # fits would map-reduce to the same single call, so it never gets both.
+        if token_count <= single_pass_budget:
+            def single_pass():
+                if model_registry.get("main_summarizer") is None:
+                    return None
                 logger.info("Using main summarizer with improved prompt")
-                # Add summary instruction to the beginning
-                if len(text) > 10000:
-                    text = text[:10000]
-                    logger.info("Text truncated to 10,000 characters for better processing")
-                
-                # Create an enhanced prompt for better summary quality
-                enhanced_prompt = f"Summarize this video transcript highlighting key points, main ideas, and important takeaways: {text[:max_input_length-100]}"
-                
-                summary = main_summarizer(
-                    enhanced_prompt,
-                    max_length=200, 
-                    min_length=80, 
-                    do_sample=False,
-                    num_beams=4
-                )
-                
-                result = summary[0]['summary_text']
-                formatted_result = format_summary(result)
-                logger.info(f"Enhanced summary generated, length: {len(formatted_result)} characters")
-                
-                if len(formatted_result.strip()) > 80:
-                    return formatted_result
-                
-                # If the result isn't good enough, try another approach
-                logger.warning("Main summarizer returned inadequate result, trying chunked approach.")
-                
-                # Handle long texts by splitting into chunks and focusing on important parts
-                summaries = []
-                
-                # Process text in chunks, focusing on beginning, middle and end
-                if len(text) > max_input_length * 3:
-                    chunks = [
-                        text[:max_input_length],  # Beginning
-                        text[len(text)//2 - max_input_length//2:len(text)//2 + max_input_length//2],  # Middle
-                        text[-max_input_length:]  # End
-                    ]
-                else:
-                    # Process in chunks with minimal overlap
-                    chunks = [text[i:i + max_input_length] for i in range(0, len(text), max_input_length - 100)]
-                
-                for i, chunk in enumerate(chunks):
-                    if len(chunk) < 100:  # Skip very small chunks
-                        continue
-                    
-                    # Add contextual prompts based on chunk position
-                    if i == 0:
-                        prompt = f"Summarize the introduction and initial points from this video transcript: {chunk}"
-                    elif i == len(chunks) - 1:
-                        prompt = f"Summarize the conclusion and final points from this video transcript: {chunk}"
-                    else:
-                        prompt = f"Summarize the main content from this video transcript: {chunk}"
-                    
-                    summary = main_summarizer(
-                        prompt,
-                        max_length=150, 
-                        min_length=30, 
-                        do_sample=False,
-                        num_beams=3
-                    )
-                    summaries.append(summary[0]['summary_text'])
-                
-                # If we have multiple summaries, process them better
-                if len(summaries) > 1:
-                    # Create a structured summary from the parts
-                    if len(summaries) >= 3:
-                        final_summary = "Key Points:\n"
-                        for i, part in enumerate(summaries):
-                            section = "Introduction" if i == 0 else "Conclusion" if i == len(summaries)-1 else f"Main Content {i}"
-                            final_summary += f"• {part}\n"
-                    else:
-                        final_summary = " ".join(summaries)
-                    
-                    logger.info(f"Structured summary from {len(summaries)} chunks, length: {len(final_summary)} characters")
-                    return format_summary(final_summary)
-                elif len(summaries) == 1:
-                    logger.info(f"Single chunk summary generated, length: {len(summaries[0])} characters")
-                    return format_summary(summaries[0])
-                else:
-                    raise Exception("No valid summarization chunks generated")
-            except Exception as e:
-                logger.warning(f"Main summarizer failed: {str(e)}. Using fallback approach.")
-        
-        # Strategy 3: Use the fallback summarizer as last resort
-        if fallback_summarizer is not None:
-            try:
-                logger.info("Using fallback summarizer with enhanced prompt")
-                enhanced_prompt = f"Create a concise summary of this video content highlighting the most important points: {text[:max_input_length-100]}"
-                
-                summary = fallback_summarizer(
-                    enhanced_prompt, 
-                    max_length=200, 
-                    min_length=50, 
-                    do_sample=False
-                )
-                result = summary[0]['summary_text']
-                logger.info(f"Fallback summary generated, length: {len(result)} characters")
-                return format_summary(result)
-            except Exception as e:
-                logger.warning(f"Fallback summarizer failed: {str(e)}. Using basic approach.")
-                
-        # Create a basic summary based on key information extraction
+                return format_summary(summarize_batch(
+                    "main_summarizer", [text], SINGLE_PASS_PROMPT,
+                    max_length=200, min_length=80, num_beams=4
+                )[0])
+            result = attempt("bart", token_count, single_pass, min_length=80)
+            if result:
+                return finish(result, "bart")
+        else:
+            def map_reduce():
+                if model_registry.get("main_summarizer") is None:
+                    return None
+                logger.info(f"Using map-reduce summarization over {token_count} tokens")
+                summary, complete = map_reduce_summarize(text, "main_summarizer", deadline=deadline)
+                if not complete:
+                    outcome["degraded"] = True
+                return format_summary(summary) if summary.strip() else ""
+            result = attempt("bart_map_reduce", token_count, map_reduce, min_length=80)
+            if result:
+                return finish(result, "bart_map_reduce")
+
+        # Strategy 3: the fallback summarizer on the beginning of the transcript
+        def fallback():
+            if model_registry.get("fallback_summarizer") is None:
+                return None
+            logger.info("Using fallback summarizer with enhanced prompt")
+            return format_summary(summarize_batch(
+                "fallback_summarizer", [text[:max_input_length-100]], FALLBACK_PROMPT,
+                max_length=200, min_length=50
+            )[0])
+        result = attempt("distilbart", prefix_tokens(max_input_length - 100), fallback)
+        if result:
+            return finish(result, "distilbart")
+
+        # Key information is only extracted once the model strategies are exhausted
+        key_information = extract_key_information(text)
         if key_information:
             logger.info("Creating summary from extracted key information")
-            return key_information
-                
+            summary_strategy_total.inc(strategy="key_information", outcome="success")
+            return finish(key_information, "key_information")
+
+        if best_partial:
+            logger.info("Using the best partial model summary")
+            outcome["degraded"] = True
+            return finish(best_partial, "partial")
+
         # If all strategies fail, create a basic summary from key sections
         logger.warning("All ML summarizers failed! Creating basic structured summary.")
+        summary_strategy_total.inc(strategy="extractive", outcome="success")
         if len(text) > 1000:
             # Extract meaningful parts from beginning, middle and end
             beginning = extract_sentences(text[:800], 3)
@@ -541,18 +1099,24 @@ def summarize_text(text):
             summary += f"• Conclusion: {end}"
             
             logger.info(f"Created structured summary of length {len(summary)} characters")
-            return summary
+            return finish(summary, "extractive")
         else:
             sentences = text.split('. ')
             basic_summary = '. '.join(sentences[:5]) + '.'
-            return basic_summary
+            return finish(basic_summary, "extractive")
         
     except Exception as e:
         logger.error(f"Summarization error: {str(e)}")
         # Final emergency fallback - just return the beginning of the text
+        summary_strategy_total.inc(strategy="emergency", outcome="success")
+        outcome["degraded"] = True
         if len(text) > 500:
-            return "Summary could not be generated properly. Here's the beginning of the transcript:\n\n" + text[:500] + "..."
-        return text
+            return finish("Summary could not be generated properly. Here's the beginning of the transcript:\n\n" + text[:500] + "...", "emergency")
+        return finish(text, "emergency")
+
+# Function to summarize text using advanced Hugging Face models
+def summarize_text(text, budget_seconds=None):
+    return summarize_with_plan(text, budget_seconds)["summary"]
 
 # Helper function to extract key information from text
 def extract_key_information(text):
@@ -631,17 +1195,71 @@ def extract_sentences(text, count=3):
     selected = meaningful_sentences[:count] if len(meaningful_sentences) > count else meaningful_sentences
     return ' '.join(selected)
 
+# Sentence-level translation memory shared across requests
+translation_memory = TranslationMemory(model_name=TRANSLATOR_MODEL_NAME)
+
+# Bullet markers produced by format_summary and common list styles
+BULLET_PATTERN = re.compile(r'^(\s*(?:[•\-*]|\d+[.)])\s+)(.*)$')
+
+def split_for_translation(text):
+    """
+    Split text into lines of (prefix, sentences). The prefix keeps bullet
+    markers and indentation untranslated so the layout can be rebuilt.
+    """
+    layout = []
+    for line in text.split('\n'):
+        match = BULLET_PATTERN.match(line)
+        if match:
+            prefix, body = match.group(1), match.group(2)
+        else:
+            body = line.strip()
+            prefix = line[:len(line) - len(line.lstrip())] if body else ""
+        sentences = [s for s in re.split(r'(?<=[.!?])\s+', body.strip()) if s]
+        layout.append((prefix, sentences))
+    return layout
+
+def translate_text_multi(text, target_language_codes):
+    """
+    Translate text into several languages at once, returning {language code: text}.
+    Sentences are encoded once and decoded for each language still missing from
+    the translation memory.
+    """
+    target_language_codes = list(dict.fromkeys(target_language_codes))
+    layout = split_for_translation(text)
+    sentences = [sentence for _, line_sentences in layout for sentence in line_sentences]
+
+    # Only sentence/language pairs missing from the translation memory go to the model
+    known = {code: translation_memory.get_many(sentences, code) for code in target_language_codes}
+    missing = {}
+    for sentence in sentences:
+        codes = tuple(code for code in target_language_codes if normalize_sentence(sentence) not in known[code])
+        if codes:
+            missing[sentence] = codes
+
+    if missing:
+        start = time.perf_counter()
+        generated = translation_batcher.submit_many(list(missing.items()))
+        elapsed = time.perf_counter() - start
+        pairs_total = sum(len(codes) for codes in missing.values())
+        for code in target_language_codes:
+            pairs = [(source, translations[code]) for source, translations in zip(missing, generated) if code in translations]
+            translation_memory.put_many(pairs, code, elapsed * len(pairs) / pairs_total)
+            known[code].update((normalize_sentence(source), translation) for source, translation in pairs)
+
+    # Rebuild the original lines, bullets and blank lines around the translations
+    results = {}
+    for code in target_language_codes:
+        translations = iter(known[code][normalize_sentence(sentence)] for sentence in sentences)
+        lines = []
+        for prefix, line_sentences in layout:
+            lines.append(prefix + " ".join(next(translations) for _ in line_sentences))
+        results[code] = "\n".join(lines)
+    return results
+
 # Function to translate text using the M2M100 model
 def translate_text(text, target_language_code):
     try:
-        translator_tokenizer.src_lang = "en"
-        encoded_text = translator_tokenizer(text, return_tensors="pt")
-        generated_tokens = translator_model.generate(
-            **encoded_text, 
-            forced_bos_token_id=translator_tokenizer.get_lang_id(target_language_code)
-        )
-        translated_text = translator_tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
-        return translated_text
+        return translate_text_multi(text, [target_language_code])[target_language_code]
     except Exception as e:
         raise Exception(f"Failed to translate text: {str(e)}")
 
@@ -0,0 +1,202 @@
+import gc
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_model_bytes(obj: Any) -> int:
+    """
+    Estimate the memory held by a loaded model from its parameters and buffers.
+    Works with bare torch modules, transformers pipelines and tuples of them.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_model_bytes(item) for item in obj)
+    # Pipelines keep the underlying module on .model
+    module = getattr(obj, "model", obj)
+    if not hasattr(module, "parameters"):
+        return onnx_model_bytes(module)
+    total = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    # Dynamically quantized Linear layers keep their packed weights outside parameters()
+    for submodule in module.modules():
+        packed = getattr(submodule, "_packed_params", None)
+        if packed is not None and hasattr(submodule, "weight") and callable(submodule.weight):
+            weight = submodule.weight()
+            bias = submodule.bias()
+            total += weight.numel() * weight.element_size()
+            total += bias.numel() * bias.element_size() if bias is not None else 0
+    return total
+
+
+def onnx_model_bytes(module: Any) -> int:
+    """
+    ONNX Runtime sessions do not expose their weights, so use the size of the
+    graph files an optimum model was loaded from
+    """
+    model_dir = str(getattr(module, "model_save_dir", "") or "")
+    if not model_dir or not os.path.isdir(model_dir):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(model_dir, name))
+        for name in os.listdir(model_dir)
+        if name.endswith((".onnx", ".onnx_data"))
+    )
+
+
+class ModelEntry:
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self.model = None
+        self.size_bytes = 0
+        self.last_used = 0.0
+        self.failed = False
+        self.load_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Loads models on first use and evicts idle ones.
+
+    Models are evicted least recently used first whenever the estimated total
+    footprint exceeds ``memory_budget_bytes``, and any model that has not been
+    used for ``idle_timeout`` seconds is released by a background check every
+    ``idle_check_seconds`` (by default a quarter of the timeout), so models are
+    freed even when no requests arrive. A budget or timeout of 0 disables that policy.
+    """
+
+    def __init__(self, memory_budget_bytes: int = 0, idle_timeout: float = 0,
+                 idle_check_seconds: Optional[float] = None):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_timeout = idle_timeout
+        self.entries: Dict[str, ModelEntry] = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.idle_thread = None
+        if idle_timeout:
+            self.start_idle_eviction(idle_check_seconds or max(idle_timeout / 4, 1.0))
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self.lock:
+            self.entries[name] = ModelEntry(name, loader)
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Return the loaded model, loading it if needed. Returns None if the model
+        failed to load, matching the previous behaviour of the module globals.
+        """
+        entry = self.entries[name]
+        self.evict_idle()
+
+        if entry.model is None and not entry.failed:
+            with entry.load_lock:
+                # Another thread may have finished loading while we waited
+                if entry.model is None and not entry.failed:
+                    self._load(entry)
+
+        entry.last_used = time.monotonic()
+        return entry.model
+
+    def _load(self, entry: ModelEntry):
+        logger.info(f"Loading model: {entry.name}")
+        start = time.monotonic()
+        try:
+            model = entry.loader()
+        except Exception as e:
+            logger.warning(f"Could not load model {entry.name}: {str(e)}")
+            entry.failed = True
+            return
+
+        entry.size_bytes = estimate_model_bytes(model)
+        entry.last_used = time.monotonic()
+        with self.lock:
+            entry.model = model
+        logger.info(
+            f"Loaded model {entry.name} in {time.monotonic() - start:.1f}s "
+            f"({entry.size_bytes / (1024 * 1024):.0f} MB)"
+        )
+        self.enforce_budget(keep=entry.name)
+
+    def loaded_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self.entries.values() if entry.model is not None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "loaded": entry.model is not None,
+                "size_bytes": entry.size_bytes if entry.model is not None else 0,
+                "failed": entry.failed,
+            }
+            for name, entry in self.entries.items()
+        }
+
+    def evict(self, name: str):
+        entry = self.entries[name]
+        with self.lock:
+            if entry.model is None:
+                return
+            entry.model = None
+        logger.info(f"Evicted model {name} ({entry.size_bytes / (1024 * 1024):.0f} MB)")
+        # Callers may still hold a reference; memory is returned once they are done
+        gc.collect()
+
+    def evict_idle(self):
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        for entry in list(self.entries.values()):
+            if entry.model is not None and now - entry.last_used > self.idle_timeout:
+                self.evict(entry.name)
+
+    def start_idle_eviction(self, interval: float):
+        if self.idle_thread is not None:
+            return
+        self.stop_event.clear()
+        self.idle_thread = threading.Thread(
+            target=self._evict_idle_loop, args=(interval,), name="model-idle-eviction", daemon=True
+        )
+        self.idle_thread.start()
+
+    def _evict_idle_loop(self, interval: float):
+        while not self.stop_event.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.warning(f"Idle model eviction failed: {str(e)}")
+
+    def shutdown(self):
+        """
+        Stop the idle eviction thread and release every loaded model
+        """
+        self.stop_event.set()
+        if self.idle_thread is not None:
+            self.idle_thread.join()
+            self.idle_thread = None
+        for name in list(self.entries):
+            self.evict(name)
+
+    def enforce_budget(self, keep: Optional[str] = None):
+        if not self.memory_budget_bytes:
+            return
+        loaded = sorted(
+            (entry for entry in self.entries.values() if entry.model is not None and entry.name != keep),
+            key=lambda entry: entry.last_used
+        )
+        for entry in loaded:
+            if self.loaded_bytes() <= self.memory_budget_bytes:
+                break
+            self.evict(entry.name)
+
+    def preload(self, names):
+        for name in names:
+            if name in self.entries:
+                self.get(name)
+            else:
+                logger.warning(f"Unknown model in preload list: {name}")
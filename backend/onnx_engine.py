@@ -0,0 +1,63 @@
+import os
+import shutil
+import logging
+import tempfile
+from typing import Any
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Exported graphs are written here once and reused on later loads. This must stay
+# outside the artifact cache directory, whose size-bounded eviction would delete them.
+ONNX_CACHE_DIR = os.getenv("GLIMPSE_ONNX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".onnx"))
+
+
+def export_dir_for(model_name: str, cache_dir: str = ONNX_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, model_name.replace("/", "--"))
+
+
+def load_onnx_pipeline(task: str, model_name: str, cache_dir: str = ONNX_CACHE_DIR) -> Any:
+    """
+    Build a transformers pipeline backed by ONNX Runtime through optimum.
+
+    The model is exported on first use and saved under ``cache_dir``; later loads
+    read the saved graphs directly. Seq2seq models are exported with a decoder
+    that takes past key values, so generation does not recompute earlier steps.
+    Requires ``optimum[onnxruntime]``.
+    """
+    from transformers import AutoTokenizer, pipeline
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTModelForSeq2SeqLM
+
+    if task == "summarization":
+        model_class, model_kwargs = ORTModelForSeq2SeqLM, {"use_cache": True}
+    elif task in ("sentiment-analysis", "text-classification"):
+        model_class, model_kwargs = ORTModelForSequenceClassification, {}
+    else:
+        raise Exception(f"Unsupported task for ONNX Runtime: {task}")
+
+    export_dir = export_dir_for(model_name, cache_dir)
+    if os.path.isfile(os.path.join(export_dir, "config.json")):
+        logger.info(f"Loading ONNX graphs for {model_name} from {export_dir}")
+        model = model_class.from_pretrained(export_dir, **model_kwargs)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        logger.info(f"Exporting {model_name} to ONNX")
+        model = model_class.from_pretrained(model_name, export=True, **model_kwargs)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+        # Save into a scratch directory first so a crash never leaves a half-written export
+        os.makedirs(cache_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=cache_dir)
+        try:
+            model.save_pretrained(staging_dir)
+            tokenizer.save_pretrained(staging_dir)
+            os.replace(staging_dir, export_dir)
+            logger.info(f"Saved ONNX graphs for {model_name} to {export_dir}")
+        except OSError as e:
+            logger.warning(f"Could not cache ONNX export for {model_name}: {str(e)}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return pipeline(task, model=model, tokenizer=tokenizer)
+
@@ -0,0 +1,65 @@
+import math
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class Deadline:
+    """
+    A per-request time budget. A budget of 0 or None never expires.
+    """
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget_seconds = budget_seconds or None
+        self.end = time.monotonic() + budget_seconds if budget_seconds else None
+
+    def remaining(self) -> float:
+        if self.end is None:
+            return math.inf
+        return max(self.end - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, predicted_seconds: float) -> bool:
+        return predicted_seconds <= self.remaining()
+
+
+class CostModel:
+    """
+    Predicts how long each strategy takes as overhead + seconds_per_token * tokens.
+
+    Starts from per-strategy priors and updates seconds_per_token from observed
+    timings with an exponential moving average, so predictions follow the
+    hardware the service actually runs on.
+    """
+
+    def __init__(self, priors: Dict[str, Tuple[float, float]], alpha: float = 0.3):
+        # priors: {strategy: (overhead_seconds, seconds_per_token)}
+        self.overheads = {name: overhead for name, (overhead, _) in priors.items()}
+        self.rates = {name: rate for name, (_, rate) in priors.items()}
+        self.samples = {name: 0 for name in priors}
+        self.alpha = alpha
+        self.lock = threading.Lock()
+
+    def predict(self, strategy: str, tokens: int) -> float:
+        return self.overheads.get(strategy, 0.0) + self.rates.get(strategy, 0.0) * tokens
+
+    def observe(self, strategy: str, tokens: int, seconds: float):
+        if tokens <= 0 or strategy not in self.rates:
+            return
+        observed_rate = max(seconds - self.overheads[strategy], 0.0) / tokens
+        with self.lock:
+            self.rates[strategy] = (1 - self.alpha) * self.rates[strategy] + self.alpha * observed_rate
+            self.samples[strategy] += 1
+
+    def stats(self):
+        return {
+            name: {
+                "overhead_seconds": self.overheads[name],
+                "seconds_per_token": round(self.rates[name], 6),
+                "samples": self.samples[name],
+            }
+            for name in self.rates
+        }
@@ -0,0 +1,43 @@
+import logging
+from typing import Any, Callable
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def quantize_module(module: torch.nn.Module) -> torch.nn.Module:
+    """
+    Replace the Linear layers of a module with dynamically quantized int8 versions.
+    Weights are stored as int8 and activations are quantized per batch at run time.
+    """
+    module.eval()
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def quantize_loaded(obj: Any) -> Any:
+    """
+    Quantize whatever a model loader returned: a bare module, a transformers
+    pipeline (its .model is swapped) or a (model, tokenizer/processor) tuple.
+    """
+    if isinstance(obj, tuple):
+        return (quantize_loaded(obj[0]),) + obj[1:]
+    if isinstance(obj, torch.nn.Module):
+        return quantize_module(obj)
+    if isinstance(getattr(obj, "model", None), torch.nn.Module):
+        obj.model = quantize_module(obj.model)
+        return obj
+    raise Exception(f"Cannot quantize object of type {type(obj).__name__}")
+
+
+def quantized_loader(name: str, loader: Callable[[], Any]) -> Callable[[], Any]:
+    def load():
+        loaded = loader()
+        try:
+            loaded = quantize_loaded(loaded)
+            logger.info(f"Applied int8 dynamic quantization to {name}")
+        except Exception as e:
+            # Fall back to the fp32 model rather than failing the load
+            logger.warning(f"Could not quantize {name}, using fp32: {str(e)}")
+        return loaded
+    return load
@@ -0,0 +1,231 @@
+import os
+import time
+import uuid
+import shutil
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from dotenv import load_dotenv
+
+from metrics import stage_duration
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Storage configuration (overridable through the environment)
+# GLIMPSE_STORAGE_BACKEND is supabase, local or none; by default supabase when it is configured, otherwise local
+STORAGE_BACKEND = os.getenv("GLIMPSE_STORAGE_BACKEND", "")
+LOCAL_STORAGE_DIR = os.getenv("GLIMPSE_LOCAL_STORAGE_DIR", "audio")
+UPLOAD_WORKERS = int(os.getenv("GLIMPSE_UPLOAD_WORKERS", "2"))
+UPLOAD_MAX_ATTEMPTS = int(os.getenv("GLIMPSE_UPLOAD_MAX_ATTEMPTS", "4"))
+UPLOAD_RETRY_SECONDS = float(os.getenv("GLIMPSE_UPLOAD_RETRY_SECONDS", "1"))
+UPLOAD_STAGING_DIR = os.path.join(tempfile.gettempdir(), "glimpse_uploads")
+
+# Files are copied in 1 MB blocks so large audio never sits in memory
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether an upload error is worth retrying: network failures, timeouts,
+    rate limiting and server errors
+    """
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status is None and error.args and isinstance(error.args[0], dict):
+        status = error.args[0].get("statusCode")
+    if status is not None:
+        try:
+            status = int(status)
+        except (TypeError, ValueError):
+            return False
+        return status == 429 or status >= 500
+    if isinstance(error, (FileNotFoundError, PermissionError, IsADirectoryError)):
+        return False
+    if isinstance(error, (OSError, TimeoutError, ConnectionError)):
+        return True
+    return type(error).__module__.split(".")[0] in ("httpx", "httpcore")
+
+
+class StorageBackend:
+    """
+    Where audio files are kept once processed
+    """
+
+    name = "base"
+
+    def upload_file(self, local_path: str, remote_path: str, content_type: str):
+        raise NotImplementedError
+
+    def download_file(self, remote_path: str, local_path: str):
+        raise NotImplementedError
+
+    def public_url(self, remote_path: str) -> Optional[str]:
+        return None
+
+
+class SupabaseStorage(StorageBackend):
+    name = "supabase"
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+
+    def upload_file(self, local_path: str, remote_path: str, content_type: str):
+        # An open file is sent as a streamed multipart body rather than read into memory
+        with open(local_path, "rb") as f:
+            self.client.storage.from_(self.bucket_name).upload(
+                path=remote_path,
+                file=f,
+                # storage3 sends x-upsert: false unless overridden, which rejects re-uploads
+                file_options={"content-type": content_type, "x-upsert": "true"}
+            )
+
+    def download_file(self, remote_path: str, local_path: str):
+        data = self.client.storage.from_(self.bucket_name).download(remote_path)
+        with open(local_path, "wb") as f:
+            f.write(data)
+
+    def public_url(self, remote_path: str) -> Optional[str]:
+        return self.client.storage.from_(self.bucket_name).get_public_url(remote_path)
+
+
+class LocalStorage(StorageBackend):
+    """
+    Files under a local directory. Also the stand-in for Supabase in
+    development and benchmarks.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str = LOCAL_STORAGE_DIR):
+        self.root = os.path.abspath(root)
+
+    def path_for(self, remote_path: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, remote_path))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise Exception(f"Storage path escapes the storage directory: {remote_path}")
+        return path
+
+    @staticmethod
+    def _copy(src_path: str, dest_path: str):
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        tmp_path = f"{dest_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(src_path, "rb") as src, open(tmp_path, "wb") as dest:
+                shutil.copyfileobj(src, dest, COPY_BLOCK_SIZE)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def upload_file(self, local_path: str, remote_path: str, content_type: str):
+        self._copy(local_path, self.path_for(remote_path))
+
+    def download_file(self, remote_path: str, local_path: str):
+        self._copy(self.path_for(remote_path), local_path)
+
+    def public_url(self, remote_path: str) -> Optional[str]:
+        return Path(self.path_for(remote_path)).as_uri()
+
+
+def create_storage(supabase_client=None, bucket_name: Optional[str] = None,
+                   backend: str = STORAGE_BACKEND) -> Optional[StorageBackend]:
+    backend = backend or ("supabase" if supabase_client else "local")
+    if backend == "supabase":
+        if not supabase_client:
+            raise Exception("Supabase storage selected but Supabase is not configured")
+        return SupabaseStorage(supabase_client, bucket_name)
+    if backend == "local":
+        return LocalStorage(LOCAL_STORAGE_DIR)
+    if backend == "none":
+        return None
+    raise Exception(f"Unknown storage backend: {backend}. Available backends are supabase, local, none")
+
+
+class BackgroundUploader:
+    """
+    Uploads files on worker threads so storage never sits on the request's
+    critical path. Transient failures are retried with exponential backoff;
+    when they persist, the file goes to the fallback backend if there is one.
+
+    Files are staged as hard links (or copies) first, so callers can delete
+    their own copy as soon as submit() returns.
+    """
+
+    def __init__(self, backend: StorageBackend, fallback: Optional[StorageBackend] = None,
+                 max_workers: int = UPLOAD_WORKERS, max_attempts: int = UPLOAD_MAX_ATTEMPTS,
+                 retry_seconds: float = UPLOAD_RETRY_SECONDS, staging_dir: str = UPLOAD_STAGING_DIR):
+        self.backend = backend
+        self.fallback = fallback
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_seconds = retry_seconds
+        self.staging_dir = staging_dir
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload")
+        self.lock = threading.Lock()
+        self.counts = {"pending": 0, "succeeded": 0, "failed": 0, "retries": 0, "fallbacks": 0}
+
+    def _stage(self, local_path: str) -> str:
+        os.makedirs(self.staging_dir, exist_ok=True)
+        staged_path = os.path.join(self.staging_dir, f"{uuid.uuid4().hex}{os.path.splitext(local_path)[1]}")
+        try:
+            os.link(local_path, staged_path)
+        except OSError:
+            shutil.copyfile(local_path, staged_path)
+        return staged_path
+
+    def _count(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def submit(self, local_path: str, remote_path: str, content_type: str) -> Future:
+        """
+        Queue an upload; the future resolves to the file's public URL, or None
+        """
+        staged_path = self._stage(local_path)
+        self._count("pending")
+        return self.executor.submit(self._upload, staged_path, remote_path, content_type)
+
+    def _upload(self, staged_path: str, remote_path: str, content_type: str) -> Optional[str]:
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    with stage_duration.time(stage="upload"):
+                        self.backend.upload_file(staged_path, remote_path, content_type)
+                    public_url = self.backend.public_url(remote_path)
+                    logger.info(f"Audio uploaded to {self.backend.name} storage: {public_url or remote_path}")
+                    self._count("succeeded")
+                    return public_url
+                except Exception as e:
+                    if attempt == self.max_attempts or not is_transient(e):
+                        logger.error(f"Failed to upload {remote_path} to {self.backend.name} storage: {str(e)}")
+                        break
+                    delay = self.retry_seconds * 2 ** (attempt - 1)
+                    logger.warning(f"Upload of {remote_path} failed (attempt {attempt}/{self.max_attempts}), "
+                                   f"retrying in {delay:g}s: {str(e)}")
+                    self._count("retries")
+                    time.sleep(delay)
+
+            if self.fallback:
+                try:
+                    self.fallback.upload_file(staged_path, remote_path, content_type)
+                    logger.info(f"Audio saved to {self.fallback.name} storage as fallback: {remote_path}")
+                    self._count("fallbacks")
+                    return self.fallback.public_url(remote_path)
+                except Exception as e:
+                    logger.error(f"Fallback upload of {remote_path} failed: {str(e)}")
+            self._count("failed")
+            return None
+        finally:
+            self._count("pending", -1)
+            try:
+                os.remove(staged_path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
@@ -0,0 +1,34 @@
+"""
+Tests run against the stand-ins from benchmarks/stubs.py, so they need no
+model downloads, GPUs, ffmpeg or network access.
+
+Run from backend/: python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, "benchmarks")]
+
+# Keep every run away from the real caches, storage and Supabase project
+os.environ["GLIMPSE_PRELOAD_MODELS"] = ""
+os.environ["GLIMPSE_TRANSLATION_MEMORY"] = "false"
+os.environ["GLIMPSE_CACHE_DIR"] = tempfile.mkdtemp(prefix="glimpse_test_cache_")
+os.environ["GLIMPSE_STORAGE_BACKEND"] = "none"
+os.environ.pop("NEXT_PUBLIC_SUPABASE_URL", None)
+
+import stubs
+
+stubs.install_module_stubs()
+
+
+@pytest.fixture
+def main():
+    import main as main_module
+
+    # Registering the stubs again also drops models loaded by earlier tests
+    stubs.install_model_stubs(main_module)
+    return main_module
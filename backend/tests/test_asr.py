@@ -0,0 +1,23 @@
+from asr import GoogleASRBackend, WhisperASRBackend
+
+
+def test_cache_id_includes_the_whisper_checkpoint():
+    tiny = WhisperASRBackend(lambda: None, model_name="openai/whisper-tiny.en")
+    base = WhisperASRBackend(lambda: None, model_name="openai/whisper-base.en")
+
+    assert tiny.cache_id != base.cache_id
+
+
+def test_cache_id_includes_the_google_language():
+    assert GoogleASRBackend(language="en-US").cache_id != GoogleASRBackend(language="en-GB").cache_id
+
+
+def test_transcript_cache_key_follows_the_local_model(main, monkeypatch):
+    import api
+
+    monkeypatch.setitem(main.asr_backends, "local", WhisperASRBackend(lambda: None, model_name="openai/whisper-tiny.en"))
+    monkeypatch.setattr(api, "get_asr_backend", lambda: main.get_asr_backend("local"))
+    tiny_key = api.transcript_cache_key("abc")
+    monkeypatch.setitem(main.asr_backends, "local", WhisperASRBackend(lambda: None, model_name="openai/whisper-base.en"))
+
+    assert api.transcript_cache_key("abc") != tiny_key
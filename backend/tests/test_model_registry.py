@@ -0,0 +1,41 @@
+import time
+
+from model_registry import ModelRegistry
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_idle_models_are_evicted_without_get():
+    registry = ModelRegistry(idle_timeout=0.1, idle_check_seconds=0.02)
+    try:
+        registry.register("model", object)
+        registry.get("model")
+        assert registry.stats()["model"]["loaded"]
+
+        # No further get() calls; only the background check can release it
+        assert wait_for(lambda: not registry.stats()["model"]["loaded"])
+    finally:
+        registry.shutdown()
+
+
+def test_shutdown_stops_the_thread_and_releases_models():
+    registry = ModelRegistry(idle_timeout=60, idle_check_seconds=0.02)
+    registry.register("model", object)
+    registry.get("model")
+    thread = registry.idle_thread
+
+    registry.shutdown()
+
+    assert not thread.is_alive()
+    assert not registry.stats()["model"]["loaded"]
+
+
+def test_no_thread_without_idle_timeout():
+    assert ModelRegistry().idle_thread is None
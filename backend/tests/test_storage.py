@@ -0,0 +1,31 @@
+import stubs
+from storage import BackgroundUploader, LocalStorage, SupabaseStorage
+
+
+def test_supabase_upload_overwrites_existing_file(tmp_path):
+    client = stubs.FakeSupabase()
+    storage = SupabaseStorage(client, "audio-files")
+    audio_path = tmp_path / "abc.flac"
+    audio_path.write_bytes(b"first")
+    storage.upload_file(str(audio_path), "abc.flac", "audio/flac")
+    audio_path.write_bytes(b"second")
+    storage.upload_file(str(audio_path), "abc.flac", "audio/flac")
+
+    assert client.buckets["audio-files"]["abc.flac"] == b"second"
+    for upload in client.uploads:
+        assert upload["headers"]["x-upsert"] == "true"
+        assert upload["headers"]["content-type"] == "audio/flac"
+
+
+def test_background_reupload_does_not_fall_back(tmp_path):
+    client = stubs.FakeSupabase()
+    uploader = BackgroundUploader(SupabaseStorage(client, "audio-files"),
+                                  fallback=LocalStorage(str(tmp_path / "fallback")),
+                                  staging_dir=str(tmp_path / "staging"))
+    audio_path = tmp_path / "abc.flac"
+    audio_path.write_bytes(b"audio")
+    for _ in range(2):
+        uploader.submit(str(audio_path), "abc.flac", "audio/flac").result()
+
+    assert uploader.stats()["succeeded"] == 2
+    assert uploader.stats()["fallbacks"] == 0
@@ -0,0 +1,61 @@
+import stubs
+
+TAIL_SENTENCE = "In closing the speaker thanks the volunteers from Zanzibar."
+
+
+class RecordingTokenizer(stubs.WordTokenizer):
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    def __call__(self, texts, **kwargs):
+        self.texts.extend([texts] if isinstance(texts, str) else texts)
+        return super().__call__(texts, **kwargs)
+
+
+class RecordingSummarizer(stubs.FakeSummarizer):
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    def __call__(self, texts, **kwargs):
+        self.texts.extend([texts] if isinstance(texts, str) else texts)
+        return super().__call__(texts, **kwargs)
+
+
+def transcript(words):
+    sentences = [f"Point number {i} covers the budget of the project in some detail." for i in range(words // 12)]
+    return " ".join(sentences + [TAIL_SENTENCE])
+
+
+def test_led_reads_the_whole_transcript(main):
+    tokenizer = RecordingTokenizer()
+    main.model_registry.register("long_summarizer", lambda: (stubs.FakeSeq2Seq(), tokenizer))
+    text = transcript(3000)
+    assert len(text) > 10000
+
+    result = main.summarize_with_plan(text)
+
+    assert result["strategy"] == "led"
+    assert any(TAIL_SENTENCE in t for t in tokenizer.texts)
+
+
+def test_transcript_longer_than_led_window_uses_map_reduce(main):
+    summarizer = RecordingSummarizer()
+    main.model_registry.register("main_summarizer", lambda: summarizer)
+    text = transcript(main.LONG_SUMMARIZER_MAX_TOKENS + 1000)
+
+    result = main.summarize_with_plan(text)
+
+    assert result["strategy"] == "bart_map_reduce"
+    assert any("Zanzibar" in t for t in summarizer.texts)
+
+
+def test_planning_loads_only_the_tokenizer(main):
+    result = main.summarize_with_plan(transcript(3000))
+
+    models = main.model_registry.stats()
+    assert result["strategy"] == "led"
+    assert models["summary_tokenizer"]["loaded"]
+    assert not models["main_summarizer"]["loaded"]
+    assert not models["fallback_summarizer"]["loaded"]
@@ -0,0 +1,127 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+import unicodedata
+from typing import Dict, List, Tuple
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Kept outside the artifact cache directory, whose eviction would delete the live
+# database and its WAL files
+TRANSLATION_MEMORY_PATH = os.getenv(
+    "GLIMPSE_TRANSLATION_MEMORY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".translation_memory", "translation_memory.sqlite3")
+)
+TRANSLATION_MEMORY_ENABLED = os.getenv("GLIMPSE_TRANSLATION_MEMORY", "true").lower() not in ("0", "false", "no")
+
+
+def normalize_sentence(sentence: str) -> str:
+    """
+    Key form of a source sentence: NFC with whitespace collapsed. Case and
+    punctuation are kept because they change the translation.
+    """
+    return " ".join(unicodedata.normalize("NFC", sentence).split())
+
+
+class TranslationMemory:
+    """
+    Persistent sentence-level store of translations in a SQLite file.
+
+    Entries are keyed by normalized source sentence, target language code and
+    model name, so switching the translator model never serves stale output.
+    Counters track hits, misses and the generate time saved by hits, estimated
+    from the average time per translated miss.
+    """
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH, model_name: str = "", enabled: bool = TRANSLATION_MEMORY_ENABLED):
+        self.path = path
+        self.model_name = model_name
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.connection = None
+        self.hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+        self.miss_sentences = 0
+
+    def _connect(self):
+        # Opened lazily so importing the module never touches the disk
+        if self.connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "source TEXT NOT NULL, target_lang TEXT NOT NULL, model TEXT NOT NULL, "
+                "translation TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (source, target_lang, model))"
+            )
+            self.connection.commit()
+        return self.connection
+
+    def get_many(self, sentences: List[str], target_lang: str) -> Dict[str, str]:
+        """
+        Look up sentences and return {normalized source: translation} for the hits
+        """
+        if not self.enabled or not sentences:
+            return {}
+        keys = list({normalize_sentence(sentence) for sentence in sentences})
+        found = {}
+        try:
+            with self.lock:
+                connection = self._connect()
+                # Stay well under SQLite's bound parameter limit
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    rows = connection.execute(
+                        f"SELECT source, translation FROM translations WHERE target_lang = ? AND model = ? "
+                        f"AND source IN ({','.join('?' * len(batch))})",
+                        [target_lang, self.model_name, *batch]
+                    ).fetchall()
+                    found.update(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory lookup failed: {str(e)}")
+            return {}
+
+        hits = sum(1 for sentence in sentences if normalize_sentence(sentence) in found)
+        self.hits += hits
+        self.misses += len(sentences) - hits
+        return found
+
+    def put_many(self, pairs: List[Tuple[str, str]], target_lang: str, seconds: float = 0.0):
+        """
+        Store (source, translation) pairs; ``seconds`` is how long generating them took
+        """
+        if not self.enabled or not pairs:
+            return
+        self.miss_seconds += seconds
+        self.miss_sentences += len(pairs)
+        now = time.time()
+        try:
+            with self.lock:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO translations (source, target_lang, model, translation, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(normalize_sentence(source), target_lang, self.model_name, translation, now)
+                     for source, translation in pairs]
+                )
+                connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory write failed: {str(e)}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        seconds_per_sentence = self.miss_seconds / self.miss_sentences if self.miss_sentences else 0.0
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "latency_saved_seconds": round(self.hits * seconds_per_sentence, 3),
+        }
@@ -0,0 +1,189 @@
+import logging
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frame length used for energy analysis
+FRAME_MS = 30
+# Frames converted to float at a time, so memory stays flat however long the audio
+ENERGY_BLOCK_FRAMES = 4096
+
+
+def frame_energy_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """
+    RMS energy of each frame of 16-bit samples in dBFS. A trailing partial frame
+    counts as zero-padded to frame_len.
+    """
+    n_frames = -(-samples.size // frame_len)
+    full_frames = samples.size // frame_len
+    sum_squares = np.empty(n_frames, dtype=np.float64)
+    frames = samples[:full_frames * frame_len].reshape(full_frames, frame_len)
+    for start in range(0, full_frames, ENERGY_BLOCK_FRAMES):
+        block = frames[start:start + ENERGY_BLOCK_FRAMES].astype(np.float32)
+        sum_squares[start:start + block.shape[0]] = np.einsum("ij,ij->i", block, block)
+    if n_frames > full_frames:
+        rest = samples[full_frames * frame_len:].astype(np.float32)
+        sum_squares[-1] = np.dot(rest, rest)
+    rms = np.sqrt(sum_squares / frame_len) / 32768.0
+    return 20 * np.log10(np.maximum(rms, 1e-6))
+
+
+def runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Start (inclusive) and end (exclusive) indices of each run of True values
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def speech_mask(energy_db: np.ndarray, margin_db: float, floor_db: float,
+                hangover_frames: int, min_silence_frames: int) -> np.ndarray:
+    # Adaptive threshold: a margin above the estimated noise floor, but never so
+    # close to the loud frames that continuous speech without pauses is dropped
+    noise_floor, loud_level = np.percentile(energy_db, [10, 90])
+    threshold = max(min(noise_floor + margin_db, loud_level - margin_db), floor_db)
+    mask = energy_db > threshold
+
+    # Extend speech by the hangover on both sides so word onsets/tails are kept
+    if hangover_frames and mask.any():
+        kernel = np.ones(2 * hangover_frames + 1)
+        mask = np.convolve(mask.astype(np.float32), kernel, mode="same") > 0
+
+    # Close pauses that are too short to be worth cutting out
+    starts, ends = runs(~mask)
+    for start, end in zip(starts, ends):
+        if end - start < min_silence_frames and start > 0 and end < mask.size:
+            mask[start:end] = True
+    return mask
+
+
+def split_long_region(start: int, end: int, energy_db: np.ndarray, target: int, max_len: int) -> List[Tuple[int, int]]:
+    """
+    Split a continuous speech region longer than max_len at its quietest frames,
+    searching around each target-length boundary
+    """
+    pieces = []
+    offsets = np.arange(target // 2, max_len)
+    # Slight preference for cuts near the target when no clear pause exists
+    distance_penalty = np.abs(offsets - target) * (3.0 / offsets.size)
+    while end - start > max_len:
+        window = energy_db[start + offsets] + distance_penalty
+        cut = start + int(offsets[np.argmin(window)])
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def segment_speech(
+    pcm: bytes,
+    sample_rate: int = 16000,
+    target_ms: int = 15000,
+    max_ms: int = 25000,
+    max_gap_ms: int = 1500,
+    min_silence_ms: int = 300,
+    hangover_ms: int = 150,
+    margin_db: float = 12.0,
+    floor_db: float = -55.0
+) -> List[Tuple[int, int]]:
+    """
+    Find speech in 16-bit mono PCM and group it into chunks of about target_ms.
+
+    Returns (start_ms, end_ms) pairs. Silence longer than max_gap_ms between
+    chunks is dropped, and cut points fall in pauses wherever possible.
+    """
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    if samples.size == 0:
+        return []
+
+    frame_len = sample_rate * FRAME_MS // 1000
+    energy_db = frame_energy_db(samples, frame_len)
+    mask = speech_mask(
+        energy_db, margin_db, floor_db,
+        hangover_frames=hangover_ms // FRAME_MS,
+        min_silence_frames=min_silence_ms // FRAME_MS
+    )
+    region_starts, region_ends = runs(mask)
+
+    target = max(1, target_ms // FRAME_MS)
+    max_len = max(target, max_ms // FRAME_MS)
+    max_gap = max_gap_ms // FRAME_MS
+
+    # Pack consecutive regions into chunks while they stay under the target length
+    chunks = []
+    current = None
+    for start, end in zip(region_starts.tolist(), region_ends.tolist()):
+        if current and start - current[1] <= max_gap and end - current[0] <= target:
+            current = (current[0], end)
+            continue
+        if current:
+            chunks.append(current)
+        current = (start, end)
+    if current:
+        chunks.append(current)
+
+    frames = []
+    for start, end in chunks:
+        frames.extend(split_long_region(start, end, energy_db, target, max_len))
+
+    total_ms = samples.size * 1000 // sample_rate
+    return [(start * FRAME_MS, min(end * FRAME_MS, total_ms)) for start, end in frames]
+
+
+def stream_speech_chunks(
+    blocks: Iterable[bytes],
+    sample_rate: int = 16000,
+    target_ms: int = 15000,
+    max_ms: int = 25000,
+    max_gap_ms: int = 1500,
+    **options
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    Incremental segment_speech for PCM that arrives in blocks, e.g. from a pipe.
+
+    Audio is analysed once about two maximum-length chunks are buffered. Chunks
+    that cannot grow any further are yielded as (pcm, start_ms) right away; a
+    chunk that ends close to the buffered edge is held until more audio arrives.
+    """
+    bytes_per_ms = sample_rate * 2 // 1000
+    window_ms = max_ms * 2
+    # A chunk ending this close to the buffered edge may continue in the next block
+    hold_ms = max_gap_ms + 500
+    buffer = bytearray()
+    offset_ms = 0
+
+    def take(final):
+        nonlocal offset_ms
+        buffered_ms = len(buffer) // bytes_per_ms
+        regions = segment_speech(bytes(buffer[:buffered_ms * bytes_per_ms]), sample_rate,
+                                 target_ms=target_ms, max_ms=max_ms, max_gap_ms=max_gap_ms, **options)
+        held = None
+        if not final and regions and regions[-1][1] > buffered_ms - hold_ms:
+            held = regions.pop()
+
+        if final:
+            cut = buffered_ms
+        elif regions:
+            cut = regions[-1][1]
+        elif held:
+            cut = held[0]
+        else:
+            # Nothing but silence so far; keep a little in case speech starts at the edge
+            cut = max(buffered_ms - hold_ms, 0)
+        if cut == 0 and held:
+            # Guard against a held chunk filling the whole window
+            regions, cut = [held], held[1]
+
+        chunks = [(bytes(buffer[start * bytes_per_ms:end * bytes_per_ms]), offset_ms + start) for start, end in regions]
+        del buffer[:cut * bytes_per_ms]
+        offset_ms += cut
+        return chunks
+
+    for block in blocks:
+        buffer.extend(block)
+        while len(buffer) >= window_ms * bytes_per_ms:
+            yield from take(final=False)
+    if buffer:
+        yield from take(final=True)